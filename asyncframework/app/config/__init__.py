@@ -1,3 +1,5 @@
 # -*- coding: utf-8 -*-
 from .base import *
 from .config import *
+from .index import *
+from .watcher import *
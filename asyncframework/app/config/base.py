@@ -1,14 +1,174 @@
 # -*- coding:utf-8 -*-
-from typing import Optional, Union, TypeVar, Self, Dict, Type, Generic, Any, overload
+from typing import Optional, Union, TypeVar, Self, Dict, Type, Generic, Any, Tuple, List, Mapping, AbstractSet, Iterable, overload
+import os
+import sys
 import types
+import typing
+import pickle
+import hashlib
+import stat
+import inspect
+import tempfile
+from copy import deepcopy
 from packets import Packet, TablePacket, PacketBase, Field
 from packets._packetbase import PacketMeta
 from packets import json
 from ...log import log
 from ...util.dict_merge import merge_dicts
+from ...util.diff import diff_keys, DiffKeys
+from ...util.shared_snapshot import SharedSnapshot, active_snapshot
+from .index import TableIndexProtocol
 
 
-__all__ = ['ConfigReader', 'TableConfigReader', 'configReader']
+__all__ = ['ConfigReader', 'TableConfigReader', 'configReader', 'clear_config_cache', 'publish_config_snapshot']
+
+
+# path: (mtime, size, parsed data)
+_parsed_files: Dict[str, Tuple[int, int, dict]] = {}
+
+
+def _parse_file(filename: str) -> dict:
+    """Parse the config file or get it from the cache if the file is not changed.
+    The returned data is shared between all the loads and must not be modified.
+
+    Args:
+        filename (str): the config file name
+
+    Returns:
+        dict: parsed file data
+    """
+    path = os.path.abspath(filename)
+    st = os.stat(path)
+    cached = _parsed_files.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    with open(path, 'r') as f:
+        data = json.load(f)
+    _parsed_files[path] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+
+def clear_config_cache():
+    """Drop all the parsed config files"""
+    _parsed_files.clear()
+
+
+def _files_meta(filenames: List[str]) -> Optional[Tuple[Tuple[str, int, int], ...]]:
+    result = []
+    for fn in filenames:
+        path = os.path.abspath(fn)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        result.append((path, st.st_mtime_ns, st.st_size))
+    return tuple(result)
+
+
+def _snapshot_key(cls: type) -> str:
+    return f'{cls.__module__}.{cls.__qualname__}'
+
+
+def publish_config_snapshot(config_cls: 'Type[ConfigBase]', filename: Optional[str] = None, name: Optional[str] = None) -> SharedSnapshot:
+    """Load the data of the config and all its readers and publish it in the shared memory.
+    The processes which attach the snapshot and activate it (see `SharedSnapshot.activate`) load
+    the config from the snapshot instead of parsing the files, unless the files are changed since.
+    The snapshot saves the parsing only: every process still builds its own instance of the config.
+    The rows of the `__lazy__` tables are built on access, so only they save the memory of the processes.
+
+    Args:
+        config_cls (Type[ConfigBase]): the config class
+        filename (Optional[str], optional): additional config file name (see `ConfigBase.load_cfg`). Defaults to None.
+        name (Optional[str], optional): shared memory block name. Defaults to a random one.
+
+    Returns:
+        SharedSnapshot: the published snapshot, the publisher is responsible to `unlink` it
+    """
+    entries: Dict[str, Tuple[Any, Mapping[str, Any]]] = {}
+    pending: List[Tuple[Type[ConfigBase], Optional[str]]] = [(config_cls, filename)]
+    while pending:
+        cls, fn = pending.pop()
+        key = _snapshot_key(cls)
+        if key in entries:
+            continue
+        data = cls._load_data(fn)
+        entries[key] = (_files_meta(cls.__filename__), data)  # type: ignore
+        pending.extend((proto, None) for proto in cls.__config_readers__.values())
+    return SharedSnapshot.create(entries, name)
+
+
+def _packet_types(tp: Any, found: Dict[type, None]):
+    """Collect the packet types used by the type annotation"""
+    if isinstance(tp, type) and issubclass(tp, PacketBase):
+        if tp in found:
+            return
+        found[tp] = None
+        for klass in tp.__mro__:
+            for annotation in getattr(klass, '__annotations__', {}).values():
+                _packet_types(annotation, found)
+        row_type = getattr(tp, '_row_type', None)
+        if row_type is not None:
+            try:
+                _packet_types(row_type(), found)
+            except TypeError:
+                pass
+        return
+    for arg in typing.get_args(tp):
+        _packet_types(arg, found)
+
+
+def _schema_fingerprint(cls: type) -> bytes:
+    """Identity of the config class layout: the paths, fields and source files state
+    of the class and all the packet types it contains (e.g. the table rows)"""
+    found: Dict[type, None] = {}
+    _packet_types(cls, found)
+    parts = [sys.version]
+    for tp in found:
+        parts.append(_snapshot_key(tp))
+        parts.append(repr(sorted(tp.field_names())))  # type: ignore
+        try:
+            st = os.stat(inspect.getfile(tp))
+            parts.append(f'{st.st_mtime_ns}:{st.st_size}')
+        except (TypeError, OSError):
+            pass
+    return '\n'.join(parts).encode()
+
+
+def _default_cache_dir() -> str:
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'asyncframework', 'config')
+
+
+def _private_dir(path: str) -> str:
+    """Create the directory accessible by the current user only or check the existing one
+
+    Raises:
+        PermissionError: if the directory belongs to other user or is accessible by others
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode):
+        raise PermissionError(f'{path} is not a directory')
+    if hasattr(os, 'getuid') and (st.st_uid != os.getuid() or st.st_mode & 0o077):
+        raise PermissionError(f'{path} must belong to the current user and be inaccessible by others')
+    return path
+
+
+def _open_private(path: str):
+    """Open the file for reading if it belongs to the current user and is not writable by others
+
+    Raises:
+        PermissionError: if the file might be written by other user
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_NOFOLLOW', 0))
+    try:
+        st = os.fstat(fd)
+        if hasattr(os, 'getuid') and (st.st_uid != os.getuid() or st.st_mode & 0o022):
+            raise PermissionError(f'{path} must belong to the current user and be writable by the owner only')
+        return os.fdopen(fd, 'rb')
+    except BaseException:
+        os.close(fd)
+        raise
 
 
 class ConfigProtocolMeta(PacketMeta):
@@ -35,6 +195,11 @@ class ConfigProtocolMeta(PacketMeta):
                 config_readers.update(base.__config_readers__)
 
         namespace['__config_readers__'] = config_readers
+        table_indexes = {}
+        for base in bases:
+            if hasattr(base, '__table_indexes__'):
+                table_indexes.update(base.__table_indexes__)
+        namespace['__table_indexes__'] = table_indexes
         namespace['__filename__'] = list(filenames.keys())
         return super(ConfigProtocolMeta, cls).__new__(cls, name, bases, namespace, **kwargs)
 
@@ -42,7 +207,11 @@ class ConfigProtocolMeta(PacketMeta):
 class ConfigBase(PacketBase, metaclass=ConfigProtocolMeta):
     __log = log.get_logger('config')
     __config_readers__: 'Dict[str, Type[ConfigBase]]' = {}
+    __table_indexes__: 'Dict[str, TableIndexProtocol]' = {}
     __filename__: Optional[Union[str, list]] = None
+    __compiled_cache__: bool = False
+    # the private directory of `__compiled_cache__` files, None for `$XDG_CACHE_HOME/asyncframework/config`
+    __compiled_cache_dir__: Optional[str] = None
     
     @property
     def log(self):
@@ -50,38 +219,182 @@ class ConfigBase(PacketBase, metaclass=ConfigProtocolMeta):
     
     @classmethod
     def load_cfg(cls, filename: Optional[str] = None) -> Self:
-        data = cls._load_data(filename)
-        module = cls.load(data)
+        cls.set_ro(False)
+        module = cls._load_module(filename)
         module._reload_complete()
         module.__class__.set_ro(True)
         return module
 
+    @classmethod
+    def reload_cfg(cls, previous: Self, changed: AbstractSet[str]) -> Self:
+        """Load the new config instance reusing the readers of the `previous` one
+        which files are not changed.
+
+        Args:
+            previous (Self): the previously loaded config
+            changed (AbstractSet[str]): absolute paths of the changed files
+
+        Returns:
+            Self: the new config instance
+        """
+        cls.set_ro(False)
+        module = cls._load_module()
+        module._reload_complete(previous, changed)
+        module.__class__.set_ro(True)
+        return module
+
+    @classmethod
+    def config_files(cls) -> List[str]:
+        """Absolute paths of all the files of the config and its readers
+
+        Returns:
+            List[str]: list of files
+        """
+        files = [os.path.abspath(fn) for fn in cls.__filename__ or ()]
+        for proto in cls.__config_readers__.values():
+            files.extend(fn for fn in proto.config_files() if fn not in files)
+        return files
+
+    @classmethod
+    def _load_module(cls, filename: Optional[str] = None) -> Self:
+        """Load the config instance without the readers.
+        If `__compiled_cache__` is on, the validated instance is stored in the binary file in the private
+        `__compiled_cache_dir__` and the next loads take it from there while the files and the classes are the same.
+        The cache is unpickled, so it is used only if the directory and the file belong to the current user
+        and are not writable by others.
+        """
+        if not cls.__compiled_cache__:
+            data = cls._load_data(filename)
+            module = cls.load(data)
+            module._build_indexes(data)
+            return module
+        cls._add_filename(filename)
+        if not cls.__filename__:
+            raise RuntimeError(f'No config file for {cls.__name__}')
+        digest = hashlib.sha256(_schema_fingerprint(cls))
+        for fn in cls.__filename__:
+            with open(fn, 'rb') as f:
+                digest.update(f.read())
+        key = digest.digest()
+        first = os.path.abspath(cls.__filename__[0])
+        cache_file: Optional[str] = None
+        try:
+            cache_dir = _private_dir(cls.__compiled_cache_dir__ or _default_cache_dir())
+            name_digest = hashlib.sha256(f'{_snapshot_key(cls)}:{first}'.encode()).hexdigest()[:32]
+            cache_file = os.path.join(cache_dir, f'{os.path.basename(first)}.{cls.__qualname__}.{name_digest}.cache')
+            with _open_private(cache_file) as f:
+                cached_key, row_keys, module = pickle.load(f)
+            if cached_key == key:
+                module._build_indexes(row_keys)
+                return module
+        except FileNotFoundError:
+            pass
+        except PermissionError as e:
+            cls.__log.warning('Config cache is not used: %s', e)
+            cache_file = None
+        except Exception as e:
+            cls.__log.warning('Config cache %s is broken, rebuilding: %s', cache_file, e)
+        data = cls._load_data()
+        module = cls.load(data)
+        module._build_indexes(data)
+        if cache_file is None:
+            return module
+        try:
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cache_file), prefix=os.path.basename(cache_file))
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump((key, list(data), module), f, pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, cache_file)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except Exception as e:
+            cls.__log.warning('Config cache %s is not written: %s', cache_file, e)
+        return module
+
+    @classmethod
+    def _add_filename(cls, filename: Optional[str]):
+        """Add the config file once, the repeated loads with the same file (e.g. `load_cfg` in the worker forked
+        after `publish_config_snapshot`) must keep the files list matching the published one"""
+        if not filename:
+            return
+        files = cls.__filename__ if isinstance(cls.__filename__, list) else [cls.__filename__] if cls.__filename__ else []
+        path = os.path.abspath(filename)
+        if all(os.path.abspath(fn) != path for fn in files):
+            files.append(filename)
+        cls.__filename__ = files
+
     @classmethod
     def _load_data(cls, filename: Optional[str] = None) -> dict:
-        if filename:
-            if isinstance(cls.__filename__, list):
-                cls.__filename__.append(filename)
-            else:
-                cls.__filename__ = [cls.__filename__, filename]
-        cfg_data = {}
+        """Load the config data as the dict to build the instance from.
+        The snapshot values are unpickled into the new dict which is dropped once the instance is loaded,
+        the snapshot mapping does not keep them, so the process holds the loaded instance only.
+        """
+        data = cls._load_raw_data(filename)
+        return data if isinstance(data, dict) else dict(data)
+
+    @classmethod
+    def _load_raw_data(cls, filename: Optional[str] = None) -> Mapping[str, Any]:
+        """Load the config data as is: the active shared snapshot entry (its values are unpickled on every access,
+        see `SnapshotMapping`) or the merged parsed files. The result must not be modified.
+        """
+        cls._add_filename(filename)
         if not cls.__filename__:
             raise RuntimeError(f'No config file for {cls.__name__}')
+        snapshot = active_snapshot()
+        if snapshot is not None:
+            entry = snapshot.get(_snapshot_key(cls))
+            if entry is not None and entry[0] is not None and entry[0] == _files_meta(cls.__filename__):
+                return entry[1]
+        cfg_data = {}
         for fn in cls.__filename__:
-            with open(fn, 'r') as f:
-                rd = json.load(f)
-                merge_dicts(cfg_data, rd)
+            rd = _parse_file(fn)
+            # merge_dicts modifies the nested mappings of origin which might be shared with the cache
+            for key, value in rd.items():
+                if isinstance(value, Mapping) and isinstance(cfg_data.get(key), Mapping):
+                    cfg_data[key] = deepcopy(cfg_data[key])
+            merge_dicts(cfg_data, rd)
         return cfg_data
 
-    def _reload_complete(self):
+    def _reload_complete(self, previous: Optional[Self] = None, changed: Optional[AbstractSet[str]] = None):
         self.__loading__ = True
         try:
             for name, proto in self.__config_readers__.items():
-                module = proto.load_cfg()
+                if previous is None or changed is None:
+                    module = proto.load_cfg()
+                elif changed.isdisjoint(proto.config_files()):
+                    module = getattr(previous, name)
+                else:
+                    module = proto.reload_cfg(getattr(previous, name), changed)
                 setattr(self, name, module)
         finally:
             self.__loading__ = False
         self.on_config_loaded()
 
+    def _build_indexes(self, data: Iterable[str]):
+        """Build the declared table indexes (see `tableIndex`) over the loaded rows
+
+        Args:
+            data (Iterable[str]): keys of the loaded data, the keys which are not the fields are the table rows
+        """
+        if not self.__table_indexes__:
+            return
+        fields = set(self.field_names())
+        rows = [(key, getattr(self, key)) for key in data if key not in fields]
+        for proto in self.__table_indexes__.values():
+            setattr(self, proto._instance_name, proto.create(self, rows))
+
+    def config_diff_keys(self, new: Self) -> DiffKeys:
+        """The difference with the reloaded config (see `ConfigWatcher`)
+
+        Args:
+            new (Self): the reloaded config
+
+        Returns:
+            DiffKeys: map of touched fields in `util.diff.diff_keys` format
+        """
+        return diff_keys(self, new)
+
     def on_config_loaded(self):
         """On config loaded callback"""
         pass
@@ -123,7 +436,101 @@ _T = TypeVar('_T', bound=PacketBase)
 
 
 class TableConfigReader(TablePacket[_T], ConfigBase):
-    pass
+    """Table config: the rows of the `_T` type by their keys.
+    With `__lazy__` on, the rows are kept as the raw data and loaded on the first access (then memoized).
+    The lazy rows are accessible as attributes, via `get` and `in`, but not via the packet fields API,
+    so `config_diff_keys` compares their raw data instead of the loaded rows.
+    The lazy tables can't have the indexes (see `tableIndex`): building them loads all the rows.
+    """
+    __lazy__: bool = False
+    __row_type: Optional[type] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.__lazy__ and cls.__table_indexes__:
+            raise TypeError(f'{cls.__name__} is __lazy__ and can\'t have the indexes {", ".join(cls.__table_indexes__)}, they would load all the rows')
+
+    @classmethod
+    def _row_type(cls) -> type:
+        row_type = cls.__dict__.get('_TableConfigReader__row_type')
+        if row_type is None:
+            for klass in cls.__mro__:
+                for base in getattr(klass, '__orig_bases__', ()):
+                    args = typing.get_args(base)
+                    if args and isinstance(args[0], type) and issubclass(typing.get_origin(base) or object, TablePacket):
+                        row_type = args[0]
+                        break
+                if row_type is not None:
+                    break
+            else:
+                raise TypeError(f'No row type for {cls.__name__}')
+            cls.__row_type = row_type
+        return row_type
+
+    @classmethod
+    def _load_module(cls, filename: Optional[str] = None) -> Self:
+        if not cls.__lazy__:
+            return super()._load_module(filename)
+        raw = cls._load_raw_data(filename)
+        fields = set(cls.field_names())
+        module = cls.load({key: raw[key] for key in fields if key in raw})
+        module.__rows = raw
+        module.__fields = fields
+        module.__loaded = {}
+        module.__count = sum(1 for key in raw if key not in fields)
+        return module
+
+    def config_diff_keys(self, new: Self) -> DiffKeys:
+        rows = self.__dict__.get('_TableConfigReader__rows')
+        new_rows = new.__dict__.get('_TableConfigReader__rows')
+        if rows is None or new_rows is None or self is new:
+            return super().config_diff_keys(new)
+        result = diff_keys(self, new)
+        fields = self.__fields
+        for name in new_rows:
+            if name not in fields and name not in rows:
+                result[name] = '1'
+        for name in rows:
+            if name in fields:
+                continue
+            if name not in new_rows:
+                result[name] = '1'
+                continue
+            # the snapshot rows are unpickled on access, the loaded rows are not touched
+            row, new_row = rows[name], new_rows[name]
+            if row == new_row:
+                continue
+            nested = diff_keys(row, new_row) if isinstance(row, dict) and isinstance(new_row, dict) else None
+            result[name] = nested or '1'
+        return result
+
+    def __getattr__(self, name: str) -> _T:
+        rows = self.__dict__.get('_TableConfigReader__rows')
+        if rows is None or name in self.__fields or name not in rows:
+            raise AttributeError(f'{self.__class__.__name__} has no row {name}')
+        row = self.__loaded.get(name)
+        if row is None:
+            row = self.__loaded[name] = self._row_type().load(rows[name])
+        return row
+
+    def get(self, name: str, default: Any = None) -> Any:
+        if '_TableConfigReader__rows' in self.__dict__ and name not in self.__fields:
+            return getattr(self, name) if name in self.__rows else default
+        value = super().get(name)
+        return default if value is None else value
+
+    def __contains__(self, name: object) -> bool:
+        if '_TableConfigReader__rows' in self.__dict__ and name not in self.__fields:
+            return name in self.__rows
+        contains = getattr(super(), '__contains__', None)
+        if contains is not None:
+            return contains(name)
+        return isinstance(name, str) and self.get(name) is not None
+
+    def __len__(self) -> int:
+        if '_TableConfigReader__rows' in self.__dict__:
+            return self.__count
+        return super().__len__()
 
 
 _CP = TypeVar('_CP', bound=ConfigReader)
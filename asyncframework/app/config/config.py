@@ -31,6 +31,8 @@ class Config(ConfigReader):
     log_format_rsyslog: str = makeField(string_t, default=node() + ' %(name)s:<%(levelname).1s> %(module)s:%(lineno)d] %(tags)s %(message)s')
     log_date_format: str = makeField(string_t, default='%Y-%m-%d %H:%M:%S')     
     log_rotated_amount: int = makeField(int_t, default=1)
+    log_flood_limits: Dict[str, int] = makeField(Hash(string_t, int_t), default={})
+    log_flood_period: int = makeField(int_t, default=60)
 
     def init_logging(self):
         """Initialize logging using the parameters from config file or defaults
@@ -45,5 +47,7 @@ class Config(ConfigReader):
             log_level=self.log_level,
             log_levels=self.log_levels,
             log_rotated_amount=self.log_rotated_amount,
-            formatter=LogFormatter(self.log_format if not self.syslog else self.log_format_rsyslog, self.log_date_format)
+            formatter=LogFormatter(self.log_format if not self.syslog else self.log_format_rsyslog, self.log_date_format),
+            log_flood_limits=self.log_flood_limits,
+            log_flood_period=self.log_flood_period
         )
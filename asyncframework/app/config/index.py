@@ -0,0 +1,184 @@
+# -*- coding:utf-8 -*-
+from typing import Any, Dict, Generic, Hashable, Iterator, List, Optional, Sequence, Tuple, TypeVar, TYPE_CHECKING
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+if TYPE_CHECKING:
+    from .base import ConfigBase
+
+
+__all__ = ['TableIndex', 'UniqueIndex', 'MultiIndex', 'SortedIndex', 'tableIndex']
+
+
+_T = TypeVar('_T')
+
+
+class TableIndex(Generic[_T]):
+    """Secondary index over the table config rows by the row field value.
+    Indexes keep the row keys and resolve the rows from the table on lookup.
+    The rows with None field value are not indexed.
+    """
+    def __init__(self, table: 'ConfigBase', field: str) -> None:
+        self._table = table
+        self._field = field
+
+    def build(self, rows: Sequence[Tuple[str, Any]]):
+        """Fill the index
+
+        Args:
+            rows (Sequence[Tuple[str, Any]]): pairs of (row key, row)
+        """
+        raise NotImplementedError()
+
+    def _row(self, key: str) -> _T:
+        return getattr(self._table, key)
+
+
+class UniqueIndex(TableIndex[_T]):
+    """Index of the field with the unique values: value -> row"""
+    _keys: Dict[Hashable, str]
+
+    def build(self, rows: Sequence[Tuple[str, Any]]):
+        self._keys = {}
+        for key, row in rows:
+            value = getattr(row, self._field)
+            if value is None:
+                continue
+            if value in self._keys:
+                raise ValueError(f'Duplicate {self._field} value {value!r} in {self._table.__class__.__name__} rows {self._keys[value]}, {key}')
+            self._keys[value] = key
+
+    def get(self, value: Hashable, default: Optional[_T] = None) -> Optional[_T]:
+        """Get the row by the field value
+
+        Args:
+            value (Hashable): the field value
+            default (Optional[_T], optional): the result if there is no such row. Defaults to None.
+
+        Returns:
+            Optional[_T]: the row
+        """
+        key = self._keys.get(value)
+        return default if key is None else self._row(key)
+
+    def __getitem__(self, value: Hashable) -> _T:
+        return self._row(self._keys[value])
+
+    def __contains__(self, value: Hashable) -> bool:
+        return value in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class MultiIndex(TableIndex[_T]):
+    """Index of the field with the repeated values: value -> rows"""
+    _keys: Dict[Hashable, List[str]]
+
+    def build(self, rows: Sequence[Tuple[str, Any]]):
+        self._keys = {}
+        for key, row in rows:
+            value = getattr(row, self._field)
+            if value is not None:
+                self._keys.setdefault(value, []).append(key)
+
+    def get(self, value: Hashable) -> Tuple[_T, ...]:
+        """Get the rows by the field value
+
+        Args:
+            value (Hashable): the field value
+
+        Returns:
+            Tuple[_T, ...]: the rows in the table order, empty if there are none
+        """
+        return tuple(self._row(key) for key in self._keys.get(value, ()))
+
+    def __getitem__(self, value: Hashable) -> Tuple[_T, ...]:
+        return self.get(value)
+
+    def __contains__(self, value: Hashable) -> bool:
+        return value in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class SortedIndex(TableIndex[_T]):
+    """Index of the rows ordered by the field value for the range lookups"""
+    _values: List[Any]
+    _keys: List[str]
+
+    def build(self, rows: Sequence[Tuple[str, Any]]):
+        pairs = [(getattr(row, self._field), key) for key, row in rows]
+        ordered = sorted((pair for pair in pairs if pair[0] is not None), key=itemgetter(0))
+        self._values = [value for value, _ in ordered]
+        self._keys = [key for _, key in ordered]
+
+    def range(self, lo: Any = None, hi: Any = None, include_hi: bool = True) -> Tuple[_T, ...]:
+        """Get the rows with the field value in the range
+
+        Args:
+            lo (Any, optional): the lower bound (inclusive), None for unbounded. Defaults to None.
+            hi (Any, optional): the upper bound, None for unbounded. Defaults to None.
+            include_hi (bool, optional): include the rows equal to the upper bound. Defaults to True.
+
+        Returns:
+            Tuple[_T, ...]: the rows ordered by the field value
+        """
+        start = 0 if lo is None else bisect_left(self._values, lo)
+        if hi is None:
+            stop = len(self._values)
+        else:
+            stop = bisect_right(self._values, hi) if include_hi else bisect_left(self._values, hi)
+        return tuple(self._row(key) for key in self._keys[start:stop])
+
+    def __iter__(self) -> Iterator[_T]:
+        return (self._row(key) for key in self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class TableIndexProtocol(Generic[_T]):
+    def __init__(self, field: str, index_cls: type) -> None:
+        self.field = field
+        self.index_cls = index_cls
+        self._instance_name = ''
+
+    def create(self, table: 'ConfigBase', rows: Sequence[Tuple[str, Any]]) -> TableIndex:
+        index = self.index_cls(table, self.field)
+        index.build(rows)
+        return index
+
+    def __set__(self, instance: 'ConfigBase', value: Any):
+        raise RuntimeError(f'Config is readonly!')
+
+    def __get__(self, instance: Optional['ConfigBase'], owner=None) -> Any:
+        if instance is None:
+            return self
+        return getattr(instance, self._instance_name)
+
+    def __delete__(self, instance):
+        raise RuntimeError(f'Config is readonly!')
+
+    def __set_name__(self, owner: 'type[ConfigBase]', name):
+        if name in owner.__table_indexes__:
+            raise AttributeError(f'Redefinition of a table index {owner.__name__}::{name}')
+        self._instance_name = f'_{name}'
+        owner.__table_indexes__[name] = self
+
+
+def tableIndex(field: str, unique: bool = False, sorted: bool = False) -> Any:
+    """Declare the secondary index of the table config rows.
+    Indexes are built on the config load and rebuilt on reload, the `__lazy__` tables can't have them.
+
+    Args:
+        field (str): the row field name
+        unique (bool, optional): the field values are unique, the lookup returns a single row (`UniqueIndex`). Defaults to False.
+        sorted (bool, optional): the index supports the range lookups (`SortedIndex`). Defaults to False.
+
+    Returns:
+        Any: the index descriptor
+    """
+    if unique and sorted:
+        raise ValueError('Index can be either unique or sorted')
+    return TableIndexProtocol(field, UniqueIndex if unique else SortedIndex if sorted else MultiIndex)
@@ -0,0 +1,156 @@
+# -*- coding:utf-8 -*-
+from typing import Optional, Dict, List, Tuple, Callable, Type, TypeVar, Generic
+import os
+import asyncio
+from ..service import Service
+from ...aio.is_async import await_result_if_async
+from ...log.log import get_logger
+from ...util.diff import DiffKeys
+from .base import ConfigBase
+
+
+__all__ = ['ConfigWatcher', 'inotify_imported']
+
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+    inotify_imported = True
+except ImportError:
+    inotify_imported = False
+
+
+_C = TypeVar('_C', bound=ConfigBase)
+_FileStat = Optional[Tuple[int, int]]
+
+
+class ConfigWatcher(Service, Generic[_C]):
+    """Service reloading the config when its files are changed.
+    The changes are detected with inotify (if `inotify_simple` is installed) or by polling files mtime.
+    On change the new config instance is loaded (the readers with unchanged files are reused)
+    and replaces the current one, then the callbacks are called with the difference.
+    """
+    log = get_logger('ConfigWatcher')
+    _config: Optional[_C]
+    _callbacks: Dict[Optional[str], List[Callable]]
+    _stats: Dict[str, _FileStat]
+    _wakeup: Optional[asyncio.Event]
+
+    @property
+    def config(self) -> _C:
+        if self._config is None:
+            raise RuntimeError('Config is not loaded')
+        return self._config
+
+    def __init__(self, config_cls: Type[_C], filename: Optional[str] = None, poll_interval: float = 1.0, use_inotify: bool = True) -> None:
+        """Constructor
+
+        Args:
+            config_cls (Type[_C]): the config class to load and watch.
+            filename (Optional[str], optional): additional config file name (see `ConfigBase.load_cfg`). Defaults to None.
+            poll_interval (float, optional): files check interval in seconds. Defaults to 1.0.
+            use_inotify (bool, optional): use inotify if available to react on changes immediately. Defaults to True.
+        """
+        super().__init__()
+        self._config_cls = config_cls
+        self._filename = filename
+        self._poll_interval = poll_interval
+        self._use_inotify = use_inotify and inotify_imported
+        self._config = None
+        self._callbacks = {}
+        self._stats = {}
+        self._wakeup = None
+        self.__inotify = None
+
+    def add_callback(self, callback: Callable, reader: Optional[str] = None):
+        """Add callback to call on config change.
+        Callback is called as `callback(diff, config)` where diff is in `util.diff.diff_keys` format.
+
+        Args:
+            callback (Callable): sync or async callback.
+            reader (Optional[str], optional): the config reader name to watch, None for the config own fields. Defaults to None.
+        """
+        self._callbacks.setdefault(reader, []).append(callback)
+
+    async def __start__(self, *args, **kwargs):
+        self._config = self._config_cls.load_cfg(self._filename)
+        self._stats = self._file_stats()
+        self._wakeup = asyncio.Event()
+        if self._use_inotify:
+            self.__inotify = INotify()
+            mask = inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO | inotify_flags.CREATE
+            for path in {os.path.dirname(fn) for fn in self._stats}:
+                self.__inotify.add_watch(path, mask)
+            self.ioloop.add_reader(self.__inotify.fileno(), self.__on_inotify)
+
+    async def __body__(self, *args, **kwargs):
+        assert self._wakeup is not None
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if not self._stopping:
+                await self.check()
+
+    async def __stop__(self):
+        if self.__inotify is not None:
+            self.ioloop.remove_reader(self.__inotify.fileno())
+            self.__inotify.close()
+            self.__inotify = None
+        if self._wakeup:
+            self._wakeup.set()
+
+    async def check(self) -> bool:
+        """Check the files and reload the config if any of them is changed
+
+        Returns:
+            bool: True if the config is reloaded
+        """
+        stats = self._file_stats()
+        changed = {fn for fn, st in stats.items() if self._stats.get(fn) != st}
+        if not changed:
+            return False
+        self._stats = stats
+        self.log.info('Config files changed: %s', ', '.join(sorted(changed)))
+        old = self.config
+        try:
+            new = self._config_cls.reload_cfg(old, changed)
+        except Exception as e:
+            self.log.error('Config reload failed: %s', e, exc_info=True)
+            return False
+        self._config = new
+        await self._notify(old, new)
+        return True
+
+    async def _notify(self, old: _C, new: _C):
+        for reader, callbacks in self._callbacks.items():
+            try:
+                if reader is None:
+                    diff: DiffKeys = old.config_diff_keys(new)
+                else:
+                    diff = getattr(old, reader).config_diff_keys(getattr(new, reader))
+            except Exception as e:
+                self.log.error('Config diff failed for %s: %s', reader, e, exc_info=True)
+                continue
+            if not diff:
+                continue
+            for callback in callbacks:
+                try:
+                    await await_result_if_async(callback(diff, new))
+                except Exception as e:
+                    self.log.error('Config change callback failed: %s', e, exc_info=True)
+
+    def _file_stats(self) -> Dict[str, _FileStat]:
+        stats: Dict[str, _FileStat] = {}
+        for fn in self._config_cls.config_files():
+            try:
+                st = os.stat(fn)
+                stats[fn] = (st.st_mtime_ns, st.st_size)
+            except FileNotFoundError:
+                stats[fn] = None
+        return stats
+
+    def __on_inotify(self):
+        if self.__inotify is not None and self.__inotify.read(timeout=0) and self._wakeup:
+            self._wakeup.set()
@@ -3,13 +3,16 @@ import asyncio
 from typing import Dict, List, Optional, Any
 from enum import Enum
 from abc import abstractmethod
-from multiprocessing import Process, current_process
+from multiprocessing import Process, Queue, current_process
 from signal import SIGINT, SIGTERM, SIG_IGN, signal
 from .proctitle import set_process_name
 from .try_uvloop import *
 from .service import Service
 from ..aio.maybefuture import mayBeFuture
 from ..log.log import get_logger
+from ..log.aggregator import LogAggregator, forward_logging
+from ..util.shared_snapshot import SharedSnapshot, active_snapshot
+from ..util.random import fast_random_enabled, use_fast_random
 
 
 __all__ = ['ManagerTypes', 'Manager', 'Worker']
@@ -28,6 +31,11 @@ class ManagerTypes(Enum):
 
 class Worker(Service):
     """Worker parent class."""
+    log_queue: Optional[Queue] = None
+    config_snapshot_name: Optional[str] = None
+    # the manager process setting of `use_fast_random`, the spawned processes don't inherit it
+    fast_random: bool = False
+
     def __init__(self, *args, linear=False, **kwargs):
         super().__init__(*args, linear=linear, **kwargs)
 
@@ -35,6 +43,12 @@ class Worker(Service):
         name = current_process().name
         if name:
             set_process_name(name)
+        if self.log_queue is not None:
+            forward_logging(self.log_queue)
+        if self.config_snapshot_name is not None:
+            self.__attach_config_snapshot(self.config_snapshot_name)
+        if self.fast_random:
+            use_fast_random()
         ioloop = new_event_loop()
         signal(SIGINT, SIG_IGN)  # worker'ы убиваются из основного процесса STGTERM'ом
         ioloop.add_signal_handler(SIGTERM, self._fire_stop_waiter)
@@ -47,6 +61,16 @@ class Worker(Service):
         await self.run(*args, **kwargs)
         await self._stop()
 
+    def __attach_config_snapshot(self, name: str):
+        active = active_snapshot()
+        if active is not None and active.name == name:
+            # forked from the manager which has it already
+            return
+        try:
+            SharedSnapshot.attach(name).activate()
+        except (OSError, ValueError) as e:
+            get_logger('Worker').warning('Config snapshot %s is unavailable, loading config files: %s', name, e)
+
 
 class Manager(Service):
     """Multiprocess manager class"""
@@ -57,17 +81,20 @@ class Manager(Service):
     _manager_type: ManagerTypes = ManagerTypes.RESTART
     _workers_list: List[Process] = []
     _manager_run_future: Optional[asyncio.Future] = None
+    _log_aggregator: Optional[LogAggregator] = None
+    config_snapshot: Optional[SharedSnapshot] = None
     wargs: List[Any] = []
     wkwargs: Dict[Any, Any] = {}
     __workers_run_future: Optional[asyncio.Future] = None
 
-    def __init__(self, workers_count: int, sleep_time: Optional[float] = None, manager_type: ManagerTypes = ManagerTypes.RESTART) -> None:
+    def __init__(self, workers_count: int, sleep_time: Optional[float] = None, manager_type: ManagerTypes = ManagerTypes.RESTART, aggregate_logs: bool = False) -> None:
         """Constructor
 
         Args:
             workers_count (int): maximum workers amount.
             sleep_time (float, optional): time to sleep between worker live checks. Defaults to None.
             manager_type (ManagerTypes, optional): type of workers starting/restarting. Defaults to `ManagerTypes.RESTART`.
+            aggregate_logs (bool, optional): workers forward log records to the manager which is the only writer. Defaults to False.
         """
         super().__init__()
         self._workers_count = workers_count
@@ -78,6 +105,8 @@ class Manager(Service):
         self.wkwargs = {}
         self.__workers_run_future = None
         self._manager_run_future = None
+        self._log_aggregator = LogAggregator() if aggregate_logs else None
+        self.config_snapshot = None
 
     def create_worker(self):
         if self._manager_type != ManagerTypes.NO_START:
@@ -89,6 +118,8 @@ class Manager(Service):
     async def __start__(self):
         """Start the manager"""
         await self.__start_manager__()
+        if self._log_aggregator:
+            self._log_aggregator.start()
         self.log.debug(u'Start %s workers args %s, kwargs %s', self._workers_count, self.wargs, self.wkwargs)
 
         self.__workers_run_future = asyncio.Future(loop=self.ioloop)
@@ -125,6 +156,11 @@ class Manager(Service):
         if self.__workers_run_future:
             await self.__workers_run_future
         await self.__stop_manager__()
+        if self.config_snapshot:
+            self.config_snapshot.unlink()
+            self.config_snapshot = None
+        if self._log_aggregator:
+            self._log_aggregator.stop()
 
     def __start_worker(self):
         """Start the worker process
@@ -137,6 +173,11 @@ class Manager(Service):
             return None
         self.log.info('Starting worker')
         worker = self.__new_worker__()
+        if self._log_aggregator:
+            worker.log_queue = self._log_aggregator.queue
+        if self.config_snapshot:
+            worker.config_snapshot_name = self.config_snapshot.name
+        worker.fast_random = fast_random_enabled()
         process = Process(
             target=worker,
             name='{0}W'.format(worker.__class__.__name__),
@@ -167,7 +208,9 @@ class Manager(Service):
     @abstractmethod
     async def __start_manager__(self):
         """Custom manager start abstract method
-        Must be implemented."""
+        Must be implemented.
+        The config loaded once for all the workers can be published here (see `publish_config_snapshot`)
+        and assigned to `config_snapshot`."""
         raise NotImplementedError('Manager start')
 
     @abstractmethod
@@ -1,3 +1,5 @@
 # -*- coding:utf-8 -*-
 from .log import *
 from .formatter import *
+from .flood import *
+from .aggregator import *
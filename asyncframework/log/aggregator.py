@@ -0,0 +1,106 @@
+# -*- coding:utf-8 -*-
+from typing import Optional, List, Mapping
+from copy import copy
+from queue import Empty
+from threading import Thread
+import multiprocessing
+import logging
+import logging.handlers
+from .log import set_handler
+
+
+__all__ = ['LogAggregator', 'LogForwarder', 'forward_logging']
+
+
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+
+class LogForwarder(logging.handlers.QueueHandler):
+    """Handler forwarding the records to the `LogAggregator` queue.
+    Used in the child processes instead of the real handlers.
+    """
+    __exc_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy(record)
+        if record.args:
+            # the primitive arguments are kept to group the records by the template (see `FloodFilter`),
+            # the rest might be not picklable or formatted differently as a string (e.g. '%.2f' of Decimal)
+            if isinstance(record.args, Mapping) or not all(isinstance(a, _PRIMITIVES) for a in record.args):
+                record.msg = record.getMessage()
+                record.args = None
+        elif not isinstance(record.msg, str):
+            record.msg = str(record.msg)
+        if record.exc_info:
+            record.exc_text = self.__exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def forward_logging(queue: multiprocessing.Queue):
+    """Globally replace the logging handler to the one forwarding records to the `queue`
+
+    Args:
+        queue (multiprocessing.Queue): the `LogAggregator` queue
+    """
+    set_handler(LogForwarder(queue))
+
+
+class LogAggregator():
+    """Single writer for the logs of several processes.
+    Child processes forward records to the `queue` (see `forward_logging`) and the aggregator
+    thread passes them to the handlers in batches.
+    """
+    queue: multiprocessing.Queue
+    handlers: Optional[List[logging.Handler]]
+    batch_size: int
+    __thread: Optional[Thread]
+
+    def __init__(self, handlers: Optional[List[logging.Handler]] = None, batch_size: int = 512):
+        """Constructor
+
+        Args:
+            handlers (Optional[List[logging.Handler]], optional): handlers to write records to. Defaults to the root logger handlers at start.
+            batch_size (int, optional): maximum amount of records to handle at once. Defaults to 512.
+        """
+        self.queue = multiprocessing.Queue(-1)
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.__thread = None
+
+    def start(self):
+        """Start the aggregating thread"""
+        if self.__thread is None:
+            if self.handlers is None:
+                self.handlers = logging.root.handlers[:]
+            self.__thread = Thread(target=self.__monitor, name='LogAggregator', daemon=True)
+            self.__thread.start()
+
+    def stop(self):
+        """Write all the pending records and stop the aggregating thread"""
+        if self.__thread is not None:
+            self.queue.put(None)
+            self.__thread.join()
+            self.__thread = None
+
+    def handle(self, record: logging.LogRecord):
+        for handler in self.handlers or ():
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def __monitor(self):
+        stopping = False
+        while not stopping:
+            batch = [self.queue.get()]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self.queue.get_nowait())
+            except Empty:
+                pass
+            for record in batch:
+                if record is None:
+                    stopping = True
+                else:
+                    self.handle(record)
+            for handler in self.handlers or ():
+                handler.flush()
@@ -0,0 +1,151 @@
+# -*- coding:utf-8 -*-
+from typing import Dict, Optional, Tuple, Any, List, Union
+from copy import copy
+from time import monotonic
+from threading import Lock, Timer
+import sys
+import logging
+
+
+__all__ = ['FloodFilter']
+
+
+# since 3.12 the filter might return the changed copy of the record to the handler
+_RETURNS_RECORD = sys.version_info >= (3, 12)
+
+
+class FloodFilter(logging.Filter):
+    """Logging filter suppressing the floods of repeated records.
+
+    Records are grouped by (logger name, message template, exception type).
+    The first `limit` records of each group pass within the `period`, the rest are
+    counted and dropped (every `sample`-th of them still passes if sampling is on).
+    The amount of suppressed records is set to the `suppressed` attribute of the next passed
+    record of the group (`LogFormatter` appends it to the message). The groups which stay
+    silent after the flood are reported by the timer once their period is over.
+    Before Python 3.12 the attribute is set on the record shared with the other handlers.
+    """
+    def __init__(self, limits: Dict[Optional[str], int], period: float = 60.0, sample: int = 0, max_keys: int = 10000, handler: Optional[logging.Handler] = None):
+        """Constructor
+
+        Args:
+            limits (Dict[Optional[str], int]): pairs of 'logger name': records per period. None or '' is the default for all loggers.
+            period (float, optional): the period in seconds. Defaults to 60.0.
+            sample (int, optional): pass every n-th suppressed record, 0 to pass none. Defaults to 0.
+            max_keys (int, optional): maximum amount of tracked groups. Defaults to 10000.
+            handler (Optional[logging.Handler], optional): the handler the filter is added to, the summaries are written to it. Defaults to the logger of the record.
+        """
+        super().__init__()
+        self.limits: Dict[str, int] = {(name or ''): limit for name, limit in limits.items()}
+        self.period = period
+        self.sample = sample
+        self.max_keys = max_keys
+        self.handler = handler
+        # key: [period start, records in period, suppressed, the last suppressed record]
+        self.__states: Dict[Tuple[str, Any, Any], List[Any]] = {}
+        self.__name_limits: Dict[str, int] = {}
+        self.__lock = Lock()
+        self.__timer: Optional[Timer] = None
+
+    def filter(self, record: logging.LogRecord) -> Union[bool, logging.LogRecord]:
+        if getattr(record, 'suppressed', None) is not None:
+            # the summary or already annotated by another filter
+            return True
+        limit = self.__name_limits.get(record.name)
+        if limit is None:
+            limit = self.__name_limits[record.name] = self._limit_for(record.name)
+        if limit <= 0:
+            return True
+        key = self._key(record)
+        now = monotonic()
+        with self.__lock:
+            state = self.__states.get(key)
+            if state is None or now - state[0] >= self.period:
+                if state is None and len(self.__states) >= self.max_keys:
+                    del self.__states[next(iter(self.__states))]
+                suppressed = state[2] if state else 0
+                self.__states[key] = [now, 1, 0, None]
+                return self._annotate(record, suppressed) if suppressed else True
+            state[1] += 1
+            if state[1] <= limit:
+                return True
+            if self.sample > 0 and (state[1] - limit) % self.sample == 0:
+                suppressed, state[2], state[3] = state[2], 0, None
+                return self._annotate(record, suppressed)
+            state[2] += 1
+            state[3] = record
+            if self.__timer is None:
+                self.__timer = Timer(self.period, self.__on_timer)
+                self.__timer.daemon = True
+                self.__timer.start()
+        return False
+
+    def flush(self, force: bool = False):
+        """Write the summaries of the groups which were suppressed during the expired period
+
+        Args:
+            force (bool, optional): write all the summaries regardless of the period. Defaults to False.
+        """
+        now = monotonic()
+        summaries: List[logging.LogRecord] = []
+        with self.__lock:
+            for state in self.__states.values():
+                if state[2] and (force or now - state[0] >= self.period):
+                    # the last suppressed record is written, so the rest are reported
+                    summary = copy(state[3])
+                    summary.suppressed = state[2] - 1
+                    summaries.append(summary)
+                    state[2], state[3] = 0, None
+        for summary in summaries:
+            if self.handler is not None:
+                self.handler.handle(summary)
+            else:
+                logging.getLogger(summary.name).handle(summary)
+
+    def close(self):
+        """Stop the timer and write all the summaries"""
+        with self.__lock:
+            timer, self.__timer = self.__timer, None
+        if timer is not None:
+            timer.cancel()
+        self.flush(force=True)
+
+    def __on_timer(self):
+        self.flush()
+        with self.__lock:
+            pending = [state[0] for state in self.__states.values() if state[2]]
+            if pending:
+                # the next check is at the end of the earliest pending period
+                delay = max(min(pending) + self.period - monotonic(), 0.01)
+                self.__timer = Timer(delay, self.__on_timer)
+                self.__timer.daemon = True
+                self.__timer.start()
+            else:
+                self.__timer = None
+
+    def _limit_for(self, name: str) -> int:
+        while True:
+            limit = self.limits.get(name)
+            if limit is not None:
+                return limit
+            if not name:
+                return 0
+            name = name.rpartition('.')[0]
+
+    @staticmethod
+    def _key(record: logging.LogRecord) -> Tuple[str, Any, Any]:
+        msg = record.msg
+        try:
+            hash(msg)
+        except TypeError:
+            msg = str(msg)
+        return record.name, msg, record.exc_info[0] if record.exc_info else None
+
+    @staticmethod
+    def _annotate(record: logging.LogRecord, suppressed: int) -> Union[bool, logging.LogRecord]:
+        if _RETURNS_RECORD:
+            record = copy(record)
+            record.suppressed = suppressed
+            return record
+        record.suppressed = suppressed
+        return True
@@ -1,7 +1,7 @@
 # -*- coding:utf-8 -*-
 from typing import Tuple, Any, Mapping, Sequence, MutableMapping, Optional
 from itertools import chain
-from copy import deepcopy
+from copy import copy, deepcopy
 import logging
 
 
@@ -16,6 +16,12 @@ class LogFormatter(logging.Formatter):
         super().__init__(fmt, datefmt)
 
     def format(self, record):
+        suppressed = getattr(record, 'suppressed', None)
+        if suppressed:
+            # see `FloodFilter`, the record might be shared with the other handlers
+            record = copy(record)
+            record.msg = f'{record.getMessage()} [{suppressed} similar messages suppressed]'
+            record.args = None
         if hasattr(record, 'tags'):
             record.tags = str(record.tags) # type: ignore
         else:
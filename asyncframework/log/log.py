@@ -5,6 +5,7 @@ import logging
 import logging.handlers
 from typing import Optional, Dict, Union
 from .formatter import LogFormatter
+from .flood import FloodFilter
 
 __all__ = ['set_levels', 'set_handler', 'init_logging', 'get_logger']
 
@@ -49,7 +50,9 @@ def init_logging(
     log_level: Union[int, str] = 'DEBUG',
     log_levels: Optional[dict] = None,
     log_rotated_amount: int = 1,
-    formatter: Optional[logging.Formatter] = None
+    formatter: Optional[logging.Formatter] = None,
+    log_flood_limits: Optional[Dict[Optional[str], int]] = None,
+    log_flood_period: float = 60.0
 ):
     """Initialize logging
 
@@ -64,6 +67,8 @@ def init_logging(
         log_levels (Optional[dict], optional): pairs of 'logger name': log level. Defaults to None.
         log_rotated_amount (int, optional): amount of rotated logs (days to keep log files). Defaults to 1.
         formatter (Optional[logging.Formatter], optional): the formatter used to format log strings. Defaults to None.
+        log_flood_limits (Optional[dict], optional): pairs of 'logger name': max similar records per period. Defaults to None.
+        log_flood_period (float, optional): period in seconds for `log_flood_limits`. Defaults to 60.0.
     """
     handler: Optional[logging.Handler] = None
 
@@ -83,6 +88,8 @@ def init_logging(
         handler = logging.handlers.TimedRotatingFileHandler(log_filename, when='midnight', backupCount=log_rotated_amount, encoding='utf-8')
 
     handler.setFormatter(formatter or LogFormatter())
+    if log_flood_limits:
+        handler.addFilter(FloodFilter(log_flood_limits, log_flood_period, handler=handler))
 
     if log_name:
         set_local_top_logger_name(log_name)
@@ -1,6 +1,9 @@
 # -*- coding:utf-8 -*-
+from .backoff import *
 from .connection_base import *
+from .idle import *
 from .line_protocol import *
+from .loopback import *
 from .reconnecting_stream import *
 from .server_base import *
 from .socket import *
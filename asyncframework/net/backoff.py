@@ -0,0 +1,125 @@
+# -*- coding:utf-8 -*-
+from typing import Optional, Union, List, Iterator
+from time import monotonic
+from ..util.random import random
+
+
+__all__ = ['Backoff', 'CircuitOpenError']
+
+
+class CircuitOpenError(ConnectionError):
+    """The attempt is refused without trying, the circuit of the `Backoff` is open"""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f'Circuit is open, retry in {retry_after:.2f} seconds')
+        self.retry_after = retry_after
+
+
+class Backoff():
+    """Retry delays policy: exponential growth with the decorrelated jitter, limited by the cap.
+    The jitter spreads the reconnects of many clients of the restarted backend over time.
+    After `failure_threshold` consecutive failures the circuit is open for `open_time` seconds:
+    the next delay lasts until it is closed again and the single attempt is made, its failure opens it again.
+    """
+
+    def __init__(self, base: float = 0.5, cap: float = 60.0, multiplier: float = 3.0, connect_timeout: Optional[float] = None, failure_threshold: Optional[int] = None, open_time: float = 30.0) -> None:
+        """Constructor
+
+        Args:
+            base (float, optional): the minimal delay, seconds. Defaults to 0.5.
+            cap (float, optional): the maximal delay, seconds. Defaults to 60.0.
+            multiplier (float, optional): the maximal growth of the delay per attempt. Defaults to 3.0.
+            connect_timeout (Optional[float], optional): the time limit of the single attempt, None for no limit. Defaults to None.
+            failure_threshold (Optional[int], optional): the consecutive failures to open the circuit, None to never open. Defaults to None.
+            open_time (float, optional): the time the circuit stays open, seconds. Defaults to 30.0.
+
+        Raises:
+            ValueError: if the delays are wrong
+        """
+        if base < 0 or cap < base:
+            raise ValueError(f'Backoff delays must be 0 <= base <= cap, but {base} and {cap} given')
+        self.base = base
+        self.cap = cap
+        self.multiplier = multiplier
+        self.connect_timeout = connect_timeout
+        self.failure_threshold = failure_threshold
+        self.open_time = open_time
+        self.__delay = base
+        self.__failures = 0
+        self.__opened_at: Optional[float] = None
+
+    @classmethod
+    def from_schedule(cls, timeouts: Union[float, List[float]], **kwargs) -> 'Backoff':
+        """Policy with the same delays range as the fixed schedule (e.g. `DEFAULT_RECONNECT_TIMEOUTS`)
+
+        Args:
+            timeouts (Union[float, List[float]]): the constant delay or the list of delays
+
+        Returns:
+            Backoff: the policy, the constant delay has no jitter
+        """
+        if isinstance(timeouts, (list, tuple)):
+            return cls(base=min(timeouts), cap=max(timeouts), **kwargs)
+        return cls(base=timeouts, cap=timeouts, **kwargs)
+
+    def copy(self) -> 'Backoff':
+        """The policy with the same settings and the initial state"""
+        return type(self)(self.base, self.cap, self.multiplier, self.connect_timeout, self.failure_threshold, self.open_time)
+
+    @property
+    def failures(self) -> int:
+        """The amount of the consecutive failures"""
+        return self.__failures
+
+    @property
+    def open_remaining(self) -> float:
+        """The time until the circuit is closed, 0 if it is closed"""
+        if self.__opened_at is None:
+            return 0.0
+        remaining = self.__opened_at + self.open_time - monotonic()
+        if remaining <= 0:
+            self.__opened_at = None
+            return 0.0
+        return remaining
+
+    @property
+    def is_open(self) -> bool:
+        """True while the circuit is open, the attempts should fail fast (see `check`)"""
+        return self.open_remaining > 0
+
+    def check(self):
+        """Fail fast while the circuit is open
+
+        Raises:
+            CircuitOpenError: if the circuit is open
+        """
+        remaining = self.open_remaining
+        if remaining > 0:
+            raise CircuitOpenError(remaining)
+
+    def next_delay(self) -> float:
+        """The delay before the next attempt
+
+        Returns:
+            float: the delay, seconds
+        """
+        upper = min(self.cap, self.__delay * self.multiplier)
+        self.__delay = self.base + (upper - self.base) * random() if upper > self.base else self.base
+        return max(self.__delay, self.open_remaining)
+
+    def delays(self) -> Iterator[float]:
+        """The endless iterator of `next_delay`"""
+        while True:
+            yield self.next_delay()
+
+    def on_success(self):
+        """The attempt is successful, reset the delays and close the circuit"""
+        self.__delay = self.base
+        self.__failures = 0
+        self.__opened_at = None
+
+    def on_failure(self):
+        """The attempt is failed"""
+        self.__failures += 1
+        if self.failure_threshold is not None and self.__failures >= self.failure_threshold:
+            self.__opened_at = monotonic()
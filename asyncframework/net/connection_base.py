@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import asyncio
-from typing import Optional, Callable
+from typing import Optional, Callable, Awaitable
+from time import monotonic
 from abc import ABCMeta, abstractmethod
 from ..aio.maybefuture import mayBeFuture
 
@@ -12,6 +13,15 @@ class ConnectionBase(metaclass=ABCMeta):
     """Base class for all connections
     """
     on_close_future: Optional[asyncio.Future] = None
+    # seconds without the received messages to consider the peer dead and close the connection, None to wait forever
+    idle_timeout: Optional[float] = None
+    # seconds without the sent messages to send the heartbeat, None to disable
+    heartbeat_interval: Optional[float] = None
+    # `time.monotonic` of the last received and sent messages
+    last_received: float = 0.0
+    last_sent: float = 0.0
+    # the messages are passed to the peer as is, so `RPC` writes its messages without the serialization
+    transfers_objects: bool = False
     __on_connection_made: Optional[Callable] = None
     __on_connection_lost: Optional[Callable] = None
     __on_message_received: Optional[Callable] = None
@@ -53,6 +63,7 @@ class ConnectionBase(metaclass=ABCMeta):
         """
         if not self.on_close_future or self.on_close_future.done():
             self.on_close_future = asyncio.Future()
+        self.last_received = self.last_sent = monotonic()
 
     async def close(self, *args, **kwargs):
         """Disconnect
@@ -72,6 +83,18 @@ class ConnectionBase(metaclass=ABCMeta):
         """
         raise NotImplementedError()
 
+    def write_nowait(self, data: bytes) -> Optional[Awaitable]:
+        """Write the encoded message without waiting if possible, used for `ServerBase.broadcast`.
+        Might be reimplemented in child, by default returns `write` of the decoded message.
+
+        Args:
+            data (bytes): the encoded message
+
+        Returns:
+            Optional[Awaitable]: None if written, else the awaitable to complete the write
+        """
+        return self.write(data.decode())
+
     async def on_connection_made(self, transport, *args, **kwargs):
         self.__connected = True
         if self.__on_connection_made:
@@ -82,7 +105,44 @@ class ConnectionBase(metaclass=ABCMeta):
             await mayBeFuture(self.__on_connection_lost, exc, *args, **kwargs)
         self.__connected = False
 
+    def idle_due(self, now: float) -> bool:
+        """Check if the idle timeout is expired or the heartbeat is needed
+
+        Args:
+            now (float): `time.monotonic`
+
+        Returns:
+            bool: True if `check_idle` has something to do
+        """
+        return (self.idle_timeout is not None and now - self.last_received >= self.idle_timeout) or \
+            (self.heartbeat_interval is not None and now - self.last_sent >= self.heartbeat_interval)
+
+    async def check_idle(self, now: float):
+        """Close the idle connection or send the heartbeat, called periodically by `IdleSweeper`
+
+        Args:
+            now (float): `time.monotonic`
+        """
+        if self.idle_timeout is not None and now - self.last_received >= self.idle_timeout:
+            await self.on_idle_timeout()
+        elif self.heartbeat_interval is not None and now - self.last_sent >= self.heartbeat_interval:
+            self.last_sent = now
+            await self.send_heartbeat()
+
+    async def on_idle_timeout(self):
+        """Nothing is received during `idle_timeout`.
+        Might be reimplemented in child, closes the connection by default
+        """
+        await self.close()
+
+    async def send_heartbeat(self):
+        """Send the heartbeat message.
+        Might be reimplemented in child, does nothing by default
+        """
+        pass
+
     async def on_message_received(self, msg: str, *args, **kwargs):
+        self.last_received = monotonic()
         if self.__on_message_received:
             await mayBeFuture(self.__on_message_received, self, msg, *args, **kwargs)
 
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from typing import Optional
+from time import monotonic
+from weakref import WeakSet
+from ..log.log import get_logger
+from .connection_base import ConnectionBase
+
+
+__all__ = ['IdleSweeper']
+
+
+class IdleSweeper():
+    """Checks the idle timeouts and sends the heartbeats of many connections (see `ConnectionBase.idle_timeout`)
+    with the single periodic task instead of a task per connection.
+    The task runs while there are connections to check.
+    """
+    log = get_logger('IdleSweeper')
+
+    def __init__(self, interval: float = 1.0) -> None:
+        """Constructor
+
+        Args:
+            interval (float, optional): the period of the check, seconds. Defaults to 1.0.
+        """
+        self.interval = interval
+        self.__connections: WeakSet = WeakSet()
+        self.__task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.__connections)
+
+    def add(self, connection: ConnectionBase):
+        """Start checking the connection, it is discarded automatically once collected
+
+        Args:
+            connection (ConnectionBase): the connection
+        """
+        self.__connections.add(connection)
+        if self.__task is None or self.__task.done():
+            self.__task = asyncio.ensure_future(self.__run())
+
+    def discard(self, connection: ConnectionBase):
+        """Stop checking the connection
+
+        Args:
+            connection (ConnectionBase): the connection
+        """
+        self.__connections.discard(connection)
+
+    async def sweep(self):
+        """Check all the connections once"""
+        now = monotonic()
+        due = [conn for conn in self.__connections if conn.is_connected and conn.idle_due(now)]
+        if not due:
+            return
+        results = await asyncio.gather(*(conn.check_idle(now) for conn in due), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                self.log.error(f'Error checking idle connection {result!r}')
+
+    async def stop(self):
+        """Stop checking all the connections"""
+        self.__connections = WeakSet()
+        if self.__task is not None:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+            self.__task = None
+
+    async def __run(self):
+        while self.__connections:
+            await asyncio.sleep(self.interval)
+            await self.sweep()
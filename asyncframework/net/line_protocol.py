@@ -1,16 +1,52 @@
 # -*- coding: utf-8 -*-
 import asyncio
 from abc import ABCMeta, abstractmethod
-from typing import Optional
+from enum import Enum
+from typing import Optional, Union, List, Any
+from ..log.log import get_logger
 
 
-__all__ = ['LineProtocol']
+__all__ = ['LineProtocol', 'LineFormat', 'LineOverflow']
+
+
+class LineFormat(Enum):
+    """The type of the lines passed to `LineProtocol.on_line_received`"""
+    # decoded with `LineProtocol.encoding`
+    STR = 'str'
+    BYTES = 'bytes'
+    # the view of the received data without copying
+    MEMORYVIEW = 'memoryview'
+
+
+class LineOverflow(Enum):
+    """What to do with the line longer than `LineProtocol.max_line_length`"""
+    # close the connection
+    CLOSE = 'close'
+    # drop the line and continue with the next one
+    DISCARD = 'discard'
+
+
+# the enum members access is slow, it is done for every received chunk
+_STR = LineFormat.STR
+_MEMORYVIEW = LineFormat.MEMORYVIEW
 
 
 class LineProtocol(asyncio.Protocol, metaclass=ABCMeta):
-    _bufer: bytes = b''
+    log = get_logger('LineProtocol')
     delimiter: bytes = b'\n'
+    # the maximum line length without the delimiter, None for no limit
+    max_line_length: Optional[int] = None
+    line_overflow: LineOverflow = LineOverflow.CLOSE
+    line_format: LineFormat = LineFormat.STR
+    encoding: str = 'utf-8'
     transport: Optional[asyncio.Transport] = None
+    # the received chunks of the incomplete line
+    _pending: Optional[List[bytes]] = None
+    _pending_size: int = 0
+    # the last bytes of the pending data to find the delimiter split between the chunks
+    _tail: bytes = b''
+    # the rest of the too long line is being dropped
+    _discarding: bool = False
 
     def connection_made(self, transport: asyncio.Transport):
         super().connection_made(transport)
@@ -20,13 +56,123 @@ class LineProtocol(asyncio.Protocol, metaclass=ABCMeta):
         super().connection_lost(exc)
 
     def data_received(self, data: bytes):
-        lines = (self._bufer + data).split(self.delimiter)
-        self._bufer = lines.pop()
+        if not data:
+            return
+        pending = self._pending
+        if pending is None:
+            pending = self._pending = []
+        delimiter = self.delimiter
+        size = len(delimiter)
+        if size > 1 and pending and delimiter in self._tail + data[:size - 1]:
+            # the delimiter is split between the chunks
+            pending.append(data)
+            data = b''.join(pending)
+            pending.clear()
+        # only the new bytes are searched, the pending ones are joined once the line is complete
+        lines: List[Any]
+        if self.line_format is _MEMORYVIEW:
+            lines = self._split_views(data, pending)
+        else:
+            lines = data.split(delimiter)
+            if len(lines) > 1 and pending:
+                pending.append(lines[0])
+                lines[0] = b''.join(pending)
+                pending.clear()
+        rest = lines.pop()
+        if not lines:
+            pending.append(rest)
+            self._pending_size += len(rest)
+            if size > 1:
+                self._tail = (self._tail + rest)[1 - size:]
+            self._check_pending()
+            return
+        if rest:
+            pending.append(rest)
+        self._pending_size = len(rest)
+        if size > 1:
+            self._tail = rest[1 - size:]
+        if self._deliver(lines):
+            self._check_pending()
+
+    def _split_views(self, data: bytes, pending: List[bytes]) -> List[Any]:
+        """Split to the views of the received data, the last item is the incomplete line"""
+        delimiter = self.delimiter
+        end = data.find(delimiter)
+        if end < 0:
+            return [data]
+        if pending:
+            pending.append(data)
+            end += self._pending_size
+            data = b''.join(pending)
+            pending.clear()
+        view = memoryview(data)
+        lines: List[Any] = []
+        start = 0
+        while end >= 0:
+            lines.append(view[start:end])
+            start = end + len(delimiter)
+            end = data.find(delimiter, start)
+        lines.append(data[start:])
+        return lines
+
+    def _deliver(self, lines: List[Any]) -> bool:
+        if self._discarding:
+            # the end of the too long line
+            self._discarding = False
+            del lines[0]
+        max_length = self.max_line_length
+        on_line_received = self.on_line_received
+        if self.line_format is _STR:
+            encoding = self.encoding
+            if max_length is None:
+                for line in lines:
+                    on_line_received(line.decode(encoding))
+                return True
+            for line in lines:
+                if len(line) <= max_length:
+                    on_line_received(line.decode(encoding))
+                elif not self._overflow():
+                    return False
+            return True
         for line in lines:
-            self.on_line_received(line.decode())
+            if max_length is None or len(line) <= max_length:
+                on_line_received(line)
+            elif not self._overflow():
+                return False
+        return True
+
+    def _check_pending(self):
+        max_length = self.max_line_length
+        if not self._discarding:
+            # the pending data might end with the beginning of the delimiter
+            if max_length is None or self._pending_size <= max_length + len(self.delimiter) - 1:
+                return
+            if not self._overflow():
+                return
+            self._discarding = True
+        # keep the possible beginning of the delimiter only
+        self._pending = [self._tail] if self._tail else []
+        self._pending_size = len(self._tail)
+
+    def _overflow(self) -> bool:
+        """Handle the too long line
+
+        Returns:
+            bool: True to continue with the next line
+        """
+        if self.line_overflow is LineOverflow.DISCARD:
+            self.log.warning(f'Line is longer than {self.max_line_length} bytes, discarded')
+            return True
+        self.log.error(f'Line is longer than {self.max_line_length} bytes, closing the connection')
+        self._pending = None
+        self._pending_size = 0
+        self._tail = b''
+        if self.transport:
+            self.transport.close()
+        return False
 
     @abstractmethod
-    def on_line_received(self, line: str):
+    def on_line_received(self, line: Union[str, bytes, memoryview]):
         pass
 
     def send_line(self, line: str):
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+import asyncio
+from typing import Optional, Tuple, Any, Awaitable
+from time import monotonic
+from ..log.log import get_logger
+from .connection_base import ConnectionBase
+from .server_base import ServerBase
+
+
+__all__ = ['LoopbackConnection', 'LoopbackServer']
+
+
+# the end of the stream put to the peer queue on close
+_EOF = object()
+
+
+class LoopbackConnection(ConnectionBase):
+    """In-process connection: the messages written are received by the paired connection without any socket.
+    Used to colocate the services talking over `RPC` in the single process and as the transport baseline in the benchmarks.
+    The messages are delivered in order by the receiving side task, so the writer never runs the peer callbacks itself.
+    """
+    log = get_logger('LoopbackConnection')
+    # the maximum amount of the messages written but not received by the peer yet, 0 for no limit
+    queue_size: int = 1024
+    __peer: Optional['LoopbackConnection'] = None
+    __queue: Optional[asyncio.Queue] = None
+    __consumer_task: Optional[asyncio.Future] = None
+
+    @property
+    def peer(self) -> Optional['LoopbackConnection']:
+        return self.__peer
+
+    def __init__(self, *args, transfers_objects: bool = False, queue_size: Optional[int] = None, **kwargs) -> None:
+        """Constructor
+
+        Args:
+            transfers_objects (bool, optional): pass the messages as is without the serialization (see `ConnectionBase.transfers_objects`), both sides share the objects. Defaults to False.
+            queue_size (Optional[int], optional): the maximum amount of the messages not received by the peer yet. Defaults to `queue_size` class attribute.
+        """
+        super().__init__(*args, **kwargs)
+        self.transfers_objects = transfers_objects
+        if queue_size is not None:
+            self.queue_size = queue_size
+        self.__peer = None
+        self.__queue = None
+        self.__consumer_task = None
+
+    @classmethod
+    async def open_pair(cls, *args, **kwargs) -> Tuple['LoopbackConnection', 'LoopbackConnection']:
+        """Create two connected connections
+
+        Args:
+            args, kwargs: the constructor arguments of both connections
+
+        Returns:
+            Tuple[LoopbackConnection, LoopbackConnection]: the connections written to each other
+        """
+        first, second = cls(*args, **kwargs), cls(*args, **kwargs)
+        await first.connect(second)
+        return first, second
+
+    async def connect_to(self, server: 'LoopbackServer'):
+        """Connect to the server, its `connection_fabric` must return `LoopbackConnection`
+
+        Args:
+            server (LoopbackServer): the started server
+
+        Raises:
+            ConnectionRefusedError: if the server is not started
+        """
+        if not server.is_serving:
+            raise ConnectionRefusedError('Loopback server is not started')
+        await server.on_client_connected(self)
+        if self.__peer is None:
+            raise ConnectionRefusedError('Loopback server rejected the connection')
+
+    async def connect(self, peer: 'LoopbackConnection', *args, **kwargs):
+        """Connect to the peer, the peer is connected back if it is not yet
+
+        Args:
+            peer (LoopbackConnection): the connection to write to
+
+        Raises:
+            ConnectionError: if already connected
+        """
+        if self.__peer is not None:
+            raise ConnectionError('Loopback connection is already connected')
+        await super().connect(*args, **kwargs)
+        self.__peer = peer
+        self.__queue = asyncio.Queue(self.queue_size)
+        self.__consumer_task = asyncio.ensure_future(self._consume(self.__queue))
+        if peer.peer is not self:
+            await peer.connect(self)
+        self.log.debug('Loopback connection is made')
+        await self.on_connection_made(peer)
+
+    async def close(self, *args, is_lost=False, **kwargs):
+        """Close the connection, the peer receives the rest of the written messages and then loses the connection
+
+        Args:
+            is_lost (bool, optional): the connection is lost. Defaults to False.
+        """
+        peer, self.__peer = self.__peer, None
+        task, self.__consumer_task = self.__consumer_task, None
+        if task and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+        if peer is not None and peer.peer is self:
+            peer._put_eof()
+        await super().close()
+        if not is_lost and peer is not None:
+            self.log.info('Loopback connection is closed')
+
+    async def write(self, msg: Any, *args, **kwargs):
+        """Write the message to the peer, waits while the peer queue is full
+
+        Args:
+            msg (Any): the message, `str` unless `transfers_objects` is set
+            kwargs: the message properties passed to the peer `on_message_received`, `type` is passed as `msg_type`
+
+        Raises:
+            ConnectionError: if no connection.
+            TypeError: if the message is not `str` and `transfers_objects` is not set.
+        """
+        aw = self.__send(msg, kwargs)
+        if aw is not None:
+            await aw
+
+    def write_nowait(self, data: bytes) -> Optional[Awaitable]:
+        """Write the encoded message to the peer queue
+
+        Args:
+            data (bytes): the encoded message
+
+        Raises:
+            ConnectionError: if no connection.
+
+        Returns:
+            Optional[Awaitable]: None if written, the queue put if it is full
+        """
+        return self.__send(data.decode(), {})
+
+    def __send(self, msg: Any, kwargs: dict) -> Optional[Awaitable]:
+        peer = self.__peer
+        if peer is None or peer.__peer is not self or peer.__queue is None:
+            raise ConnectionError('No connection is made or peer is closed')
+        if not self.transfers_objects and not isinstance(msg, str):
+            raise TypeError(f'Loopback connection transfers str messages only, {type(msg).__name__} given')
+        if 'type' in kwargs:
+            kwargs['msg_type'] = kwargs.pop('type')
+        self.last_sent = monotonic()
+        item = (msg, kwargs)
+        try:
+            peer.__queue.put_nowait(item)
+        except asyncio.QueueFull:
+            return peer.__queue.put(item)
+        return None
+
+    def _put_eof(self):
+        if self.__queue is None:
+            return
+        try:
+            self.__queue.put_nowait(_EOF)
+        except asyncio.QueueFull:
+            asyncio.ensure_future(self.__queue.put(_EOF))
+
+    async def _consume(self, queue: asyncio.Queue) -> None:
+        self.log.debug('Consumer started')
+        while True:
+            item = await queue.get()
+            if item is _EOF:
+                self.log.debug('Loopback connection is lost')
+                await self.on_connection_lost(ConnectionResetError())
+                asyncio.ensure_future(self.close(is_lost=True))
+                break
+            msg, kwargs = item
+            try:
+                await self.on_message_received(msg, **kwargs)
+            except Exception as e:
+                self.log.error(f'Error receiving message {e!r}')
+
+
+class LoopbackServer(ServerBase):
+    """Server accepting the `LoopbackConnection` clients in the same process (see `LoopbackConnection.connect_to`)
+    """
+    log = get_logger('LoopbackServer')
+
+    @property
+    def is_serving(self) -> bool:
+        return self._started and not self._stopping
+
+    async def __start__(self, *args, **kwargs):
+        pass
+
+    async def on_rejected(self, *args, **kwargs):
+        # the client is left unconnected, `LoopbackConnection.connect_to` raises
+        pass
+
+    async def __stop__(self, *args):
+        await super().__stop__(*args)
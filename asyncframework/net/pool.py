@@ -1,11 +1,16 @@
 # -*- coding:utf-8 -*-
-from typing import Union, Optional, List, TypeVar, Generic, Any
-from asyncio import Task, sleep, CancelledError
+from typing import Union, Optional, List, TypeVar, Generic, Any, Deque, Dict, Sequence, Tuple
+from asyncio import Task, Future, sleep, wait, wait_for, gather, shield, get_running_loop, create_task, CancelledError
+from functools import partial
 from abc import ABCMeta, abstractmethod
+from bisect import bisect_left
+from collections import deque
+from time import monotonic
 from ..log.log import get_logger
+from .backoff import Backoff
 
 
-__all__ = ['StaticPool']
+__all__ = ['StaticPool', 'DynamicPool', 'PoolStats']
 
 
 _DEFAULT_TIMEOUT_CREATION = [0.5, 0.75, 1, 1.5, 2, 3, 5, 8, 10, 15, 30, 60]
@@ -17,10 +22,16 @@ class StaticPool(Generic[T], metaclass=ABCMeta):
     """Static pool class
     The next element is fetched consequently and created lazily.
     The same element might be returned several times.
+    The concurrent acquires of the empty slot wait for the single creation.
+    If `health_check_interval` is set, the dead elements (see `is_alive`) are replaced in background.
     """
     log = get_logger('StaticPool')
     acquire_repeat_cnt: Optional[int] = None
     timeout_creation: Union[float, List[float]] = _DEFAULT_TIMEOUT_CREATION
+    # the creation retry delays policy (copied per pool), None to build it from `timeout_creation`
+    backoff: Optional[Backoff] = None
+    # the period of the elements check, seconds, None to disable
+    health_check_interval: Optional[float] = None
     queue: List[Any]
 
     def __init__(self, pool_size: int = 1):
@@ -36,57 +47,140 @@ class StaticPool(Generic[T], metaclass=ABCMeta):
             raise ValueError('Pool size must be positive non-0')
         self.queue = [None] * pool_size
         self.index = 0
+        # shared by the slots, they are created for the same backend
+        self._backoff = self.backoff.copy() if self.backoff is not None else Backoff.from_schedule(self.timeout_creation)
+        # the arguments of the last creation, used to replace the dead elements
+        self.__create_args: Tuple[Any, Any] = ((), {})
+        self.__health_task: Optional[Task] = None
+        self.__stopped = False
 
     async def stop(self):
         """Stop the pool completely"""
+        self.__stopped = True
+        if self.__health_task is not None:
+            self.__health_task.cancel()
+            try:
+                await self.__health_task
+            except CancelledError:
+                pass
+            self.__health_task = None
         for elem in self.queue:
             if elem is None:
                 continue
             elif isinstance(elem, Task):
                 elem.cancel()
-                await elem
+                try:
+                    elem = await elem
+                except (CancelledError, Exception):
+                    elem = None
+                if elem is not None:
+                    await self.destroy(elem)
             else:
                 await self.destroy(elem)
+        self.queue = [None] * len(self.queue)
 
     async def acquire(self, *args, **kwargs) -> Optional[T]:
         """Acquire next element from pool
 
+        Raises:
+            CircuitOpenError: if the element is not created yet and the creation circuit is open (see `Backoff`)
+
         Returns:
             Optional[T]: element or None if creation was cancelled
         """
+        self.__start_health_check()
         idx, self.index = self.index, self.index + 1
         self.index %= len(self.queue)
         elem = self.queue[idx]
-        if not elem:
-            elem = await self._create(*args, **kwargs)
-            self.queue[idx] = elem
+        if elem is None or isinstance(elem, Task):
+            # don't wait for the creation which is refused or delayed until the circuit is closed
+            self._backoff.check()
+        if elem is None:
+            elem = self.__start_creation(idx, args, kwargs)
+        if isinstance(elem, Task):
+            # the caller cancellation doesn't cancel the creation shared with the others
+            return await shield(elem)
         return elem
 
+    async def warm_up(self, *args, **kwargs) -> None:
+        """Create all the missing elements in parallel and start the health check.
+        The arguments are passed to `create`.
+        """
+        self.__start_health_check()
+        tasks = []
+        for idx, elem in enumerate(self.queue):
+            if elem is None:
+                elem = self.__start_creation(idx, args, kwargs)
+            if isinstance(elem, Task):
+                tasks.append(elem)
+        await gather(*tasks)
+
+    async def health_check(self) -> None:
+        """Check the created elements with `is_alive`, destroy the dead ones and start their replacement.
+        Called periodically if `health_check_interval` is set.
+        """
+        slots = [(idx, elem) for idx, elem in enumerate(self.queue) if elem is not None and not isinstance(elem, Task)]
+        results = await gather(*(self.is_alive(elem) for _, elem in slots), return_exceptions=True)
+        for (idx, elem), alive in zip(slots, results):
+            if (alive and not isinstance(alive, BaseException)) or self.__stopped or self.queue[idx] is not elem:
+                continue
+            self.log.warning(f'Pool element {idx} is dead{f" ({alive})" if isinstance(alive, BaseException) else ""}, replacing')
+            args, kwargs = self.__create_args
+            self.__start_creation(idx, args, kwargs)
+            try:
+                await self.destroy(elem)
+            except Exception as e:
+                self.log.error(f'Error destroying pool element {e}')
+
+    def __start_creation(self, idx: int, args: Any, kwargs: Any) -> Task:
+        self.__create_args = (args, kwargs)
+        task = create_task(self._create(*args, **kwargs))
+        self.queue[idx] = task
+        task.add_done_callback(partial(self.__created, idx))
+        return task
+
+    def __created(self, idx: int, task: Task):
+        if self.queue[idx] is not task:
+            return
+        if task.cancelled() or task.exception() is not None:
+            self.queue[idx] = None
+        else:
+            self.queue[idx] = task.result()
+
+    def __start_health_check(self):
+        if self.health_check_interval is not None and self.__health_task is None and not self.__stopped:
+            self.__health_task = create_task(self.__health_loop())
+
+    async def __health_loop(self):
+        while True:
+            await sleep(self.health_check_interval)  # type: ignore
+            try:
+                await self.health_check()
+            except Exception as e:
+                self.log.error(f'Error checking pool elements {e}')
+
     async def _create(self, *args, **kwargs) -> Optional[T]:
         elem = None
         curr_attempt = 1
         while not elem:
             try:
-                elem = await self.create(*args, **kwargs)
+                elem = await wait_for(self.create(*args, **kwargs), self._backoff.connect_timeout)
             except CancelledError as e:
                 self.log.warning(f'Cancelled')
                 return None
             except Exception as e:
-                self.log.error(f'Error creating pool element {e}')
+                self._backoff.on_failure()
+                self.log.error(f'Error creating pool element {e!r}')
                 if self.acquire_repeat_cnt is not None and curr_attempt >= self.acquire_repeat_cnt:
                     raise e
-                tm: float
-                if isinstance(self.timeout_creation, list):
-                    idx = curr_attempt - 1 if len(self.timeout_creation) > curr_attempt else -1
-                    tm = self.timeout_creation[idx]
-                else:
-                    tm = self.timeout_creation
+                tm = self._backoff.next_delay()
                 curr_attempt += 1
 
-                self.log.warning(f'Waiting for {tm} seconds to next ({curr_attempt}) try.')
+                self.log.warning(f'Waiting for {tm:.2f} seconds to next ({curr_attempt}) try.')
                 await sleep(tm)
             else:
                 if self.check(elem):
+                    self._backoff.on_success()
                     return elem
 
     @abstractmethod
@@ -111,6 +205,379 @@ class StaticPool(Generic[T], metaclass=ABCMeta):
         """
         return bool(elem)
 
+    async def is_alive(self, elem: T) -> bool:
+        """Check if the created element is still usable, called by `health_check`.
+        Might be reimplemented in child
+
+        Args:
+            elem (T): the element
+
+        Returns:
+            bool: True if ok
+        """
+        return self.check(elem)
+
+    async def destroy(self, elem: T) -> None:
+        """Destroy element callback
+
+        Args:
+            elem (T): the element need to be destroyed
+        """
+        pass
+
+
+class _Entry():
+    __slots__ = ('elem', 'created', 'idle_since')
+
+    def __init__(self, elem: Any) -> None:
+        self.elem = elem
+        self.created = self.idle_since = monotonic()
+
+
+class PoolStats():
+    """The snapshot of `DynamicPool` metrics"""
+    __slots__ = ('size', 'in_use', 'idle', 'waiters', 'acquired', 'timeouts', 'created', 'destroyed', 'wait_time', 'wait_buckets', 'wait_histogram')
+
+    def __init__(self, wait_buckets: Sequence[float]) -> None:
+        self.size = 0
+        self.in_use = 0
+        self.idle = 0
+        self.waiters = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.created = 0
+        self.destroyed = 0
+        # total seconds spent in acquire
+        self.wait_time = 0.0
+        # upper bounds of the histogram buckets, the last histogram counter is for the longer waits
+        self.wait_buckets = tuple(wait_buckets)
+        self.wait_histogram = [0] * (len(self.wait_buckets) + 1)
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)}' for name in self.__slots__)
+        return f'PoolStats({fields})'
+
+
+class _Acquire(Generic[T]):
+    """The result of `DynamicPool.acquire`, usable as `await pool.acquire()` or `async with pool.acquire() as elem`"""
+    __slots__ = ('pool', 'args', 'kwargs', 'elem')
+
+    def __init__(self, pool: 'DynamicPool[T]', args: Any, kwargs: Any) -> None:
+        self.pool = pool
+        self.args = args
+        self.kwargs = kwargs
+        self.elem: Optional[T] = None
+
+    def __await__(self):
+        return self.pool._acquire(*self.args, **self.kwargs).__await__()
+
+    async def __aenter__(self) -> T:
+        self.elem = await self.pool._acquire(*self.args, **self.kwargs)
+        return self.elem
+
+    async def __aexit__(self, exc_type, exc, tb):
+        elem, self.elem = self.elem, None
+        await self.pool.release(elem)
+
+
+class DynamicPool(Generic[T], metaclass=ABCMeta):
+    """Elastic pool class
+    The element is used exclusively between `acquire` and `release`.
+    The elements are created on demand up to `max_size`, the callers wait in the fair (FIFO) queue when all of them are busy.
+    The elements idle longer than `max_idle_time` (above `min_size`) or older than `max_lifetime` are destroyed.
+    """
+    log = get_logger('DynamicPool')
+    # the period of the idle elements check, seconds
+    eviction_interval: float = 1.0
+    # the upper bounds of the wait time histogram buckets, seconds
+    wait_buckets: Sequence[float] = (0.001, 0.01, 0.1, 1.0, 10.0)
+
+    def __init__(self, min_size: int = 0, max_size: int = 10, acquire_timeout: Optional[float] = None, max_idle_time: Optional[float] = None, max_lifetime: Optional[float] = None):
+        """Constructor
+
+        Args:
+            min_size (int, optional): the amount of elements kept even if idle. Defaults to 0.
+            max_size (int, optional): the maximum amount of elements. Defaults to 10.
+            acquire_timeout (Optional[float], optional): the default time to wait for the element, None to wait forever. Defaults to None.
+            max_idle_time (Optional[float], optional): the time the element might stay idle, None to keep forever. Defaults to None.
+            max_lifetime (Optional[float], optional): the time the element might be used since creation, None to use forever. Defaults to None.
+
+        Raises:
+            ValueError: if the sizes are wrong
+        """
+        if max_size <= 0:
+            raise ValueError('Pool size must be positive non-0')
+        if min_size < 0 or min_size > max_size:
+            raise ValueError(f'Pool min size must be in range 0..{max_size}, but {min_size} given')
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.max_idle_time = max_idle_time
+        self.max_lifetime = max_lifetime
+        # the most recently released elements are on the right
+        self.__idle: Deque[_Entry] = deque()
+        self.__in_use: Dict[int, _Entry] = {}
+        # the futures get the entry or None if the waiter is allowed to create the element
+        self.__waiters: Deque[Future] = deque()
+        # in use, idle and being created
+        self.__size = 0
+        self.__stopped = False
+        self.__evict_task: Optional[Task] = None
+        self.__stats = PoolStats(self.wait_buckets)
+
+    @property
+    def size(self) -> int:
+        return self.__size
+
+    def stats(self) -> PoolStats:
+        """The pool metrics
+
+        Returns:
+            PoolStats: the copy of the metrics
+        """
+        stats = PoolStats(self.__stats.wait_buckets)
+        for name in PoolStats.__slots__:
+            value = getattr(self.__stats, name)
+            setattr(stats, name, list(value) if isinstance(value, list) else value)
+        stats.size = self.__size
+        stats.in_use = len(self.__in_use)
+        stats.idle = len(self.__idle)
+        stats.waiters = sum(1 for waiter in self.__waiters if not waiter.done())
+        return stats
+
+    async def start(self, *args, **kwargs):
+        """Create `min_size` elements and start the idle elements eviction.
+        The arguments are passed to `create`.
+        """
+        self.__stopped = False
+        while self.__size < self.min_size:
+            self.__size += 1
+            try:
+                entry = await self._create(*args, **kwargs)
+            except BaseException:
+                self.__size -= 1
+                raise
+            self.__idle.append(entry)
+        if (self.max_idle_time is not None or self.max_lifetime is not None) and self.__evict_task is None:
+            self.__evict_task = create_task(self.__evict_loop())
+
+    async def stop(self):
+        """Stop the pool: destroy the idle elements, fail the waiters. The elements in use are destroyed on release."""
+        self.__stopped = True
+        if self.__evict_task is not None:
+            self.__evict_task.cancel()
+            try:
+                await self.__evict_task
+            except CancelledError:
+                pass
+            self.__evict_task = None
+        while self.__waiters:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(RuntimeError('Pool is stopped'))
+        while self.__idle:
+            await self._destroy(self.__idle.pop())
+
+    def acquire(self, *args, timeout: Optional[float] = ..., **kwargs) -> _Acquire[T]:  # type: ignore
+        """Acquire the element for the exclusive use, `await pool.acquire()` (then `release`) or `async with pool.acquire() as elem`.
+        The arguments are passed to `create`.
+
+        Args:
+            timeout (Optional[float], optional): the time to wait for the element, None to wait forever. Defaults to `acquire_timeout`.
+
+        Raises:
+            TimeoutError: if the element was not acquired in time
+            RuntimeError: if the pool is stopped
+
+        Returns:
+            _Acquire[T]: the awaitable and the async context manager
+        """
+        kwargs['timeout'] = self.acquire_timeout if timeout is ... else timeout
+        return _Acquire(self, args, kwargs)
+
+    async def _acquire(self, *args, timeout: Optional[float] = None, **kwargs) -> T:
+        if self.__stopped:
+            raise RuntimeError('Pool is stopped')
+        started = monotonic()
+        entry: Optional[_Entry] = None
+        if not self.__has_waiters():
+            entry = await self.__take_idle()
+            if entry is None and self.__size >= self.max_size:
+                entry = await self.__wait(timeout)
+            elif entry is None:
+                self.__size += 1
+        else:
+            entry = await self.__wait(timeout)
+        if entry is None:
+            # the size is reserved for the element
+            try:
+                entry = await self._create(*args, **kwargs)
+            except BaseException:
+                self.__free_slot()
+                raise
+        self.__in_use[id(entry.elem)] = entry
+        self.__record_wait(monotonic() - started)
+        return entry.elem
+
+    async def release(self, elem: T, discard: bool = False):
+        """Return the element to the pool
+
+        Args:
+            elem (T): the acquired element
+            discard (bool, optional): destroy the element instead (e.g. it is broken). Defaults to False.
+
+        Raises:
+            ValueError: if the element is not acquired from the pool
+        """
+        entry = self.__in_use.pop(id(elem), None)
+        if entry is None:
+            raise ValueError('The element is not acquired from the pool')
+        if discard or self.__stopped or self.__expired(entry, monotonic()) or not self.check(elem):
+            try:
+                await self._destroy(entry)
+            finally:
+                self.__free_slot()
+            return
+        entry.idle_since = monotonic()
+        while self.__waiters:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(entry)
+                return
+        self.__idle.append(entry)
+
+    def __has_waiters(self) -> bool:
+        while self.__waiters and self.__waiters[0].done():
+            self.__waiters.popleft()
+        return bool(self.__waiters)
+
+    async def __take_idle(self) -> Optional[_Entry]:
+        now = monotonic()
+        while self.__idle:
+            entry = self.__idle.pop()
+            if not self.__expired(entry, now) and self.check(entry.elem):
+                return entry
+            try:
+                await self._destroy(entry)
+            finally:
+                # somebody might be waiting since the destroy started, the slot is returned even if cancelled
+                self.__free_slot()
+        return None
+
+    async def __wait(self, timeout: Optional[float]) -> Optional[_Entry]:
+        waiter = get_running_loop().create_future()
+        self.__waiters.append(waiter)
+        try:
+            await wait((waiter, ), timeout=timeout)
+        except CancelledError:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                # got the element or the slot at the same moment, pass it on
+                self.__pass_on(waiter.result())
+            waiter.cancel()
+            raise
+        if not waiter.done():
+            waiter.cancel()
+            self.__stats.timeouts += 1
+            raise TimeoutError(f'Pool element was not acquired in {timeout} seconds')
+        return waiter.result()
+
+    def __pass_on(self, entry: Optional[_Entry]):
+        while self.__waiters:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(entry)
+                return
+        if entry is None:
+            self.__size -= 1
+        else:
+            self.__idle.append(entry)
+
+    def __free_slot(self):
+        """The element is gone, the first waiter might create a new one"""
+        self.__pass_on(None)
+
+    def __expired(self, entry: _Entry, now: float) -> bool:
+        return self.max_lifetime is not None and now - entry.created >= self.max_lifetime
+
+    def __record_wait(self, wait_time: float):
+        stats = self.__stats
+        stats.acquired += 1
+        stats.wait_time += wait_time
+        stats.wait_histogram[bisect_left(stats.wait_buckets, wait_time)] += 1
+
+    async def __evict_loop(self):
+        while True:
+            await sleep(self.eviction_interval)
+            try:
+                await self.evict()
+            except Exception as e:
+                self.log.error(f'Error evicting pool elements {e}')
+
+    async def evict(self):
+        """Destroy the idle elements which are idle too long (above `min_size`) or too old.
+        Called periodically after `start`.
+        """
+        now = monotonic()
+        keep: Deque[_Entry] = deque()
+        evicted: List[_Entry] = []
+        size = self.__size
+        # the oldest released are on the left
+        for entry in self.__idle:
+            idle_too_long = self.max_idle_time is not None and now - entry.idle_since >= self.max_idle_time and size > self.min_size
+            if idle_too_long or self.__expired(entry, now):
+                size -= 1
+                evicted.append(entry)
+            else:
+                keep.append(entry)
+        self.__idle = keep
+        for i, entry in enumerate(evicted):
+            try:
+                await self._destroy(entry)
+            except BaseException:
+                # cancelled (e.g. on stop), the rest are returned to the idle ones and evicted later
+                self.__idle.extendleft(reversed(evicted[i + 1:]))
+                raise
+            finally:
+                # the slot goes to the waiter, as on release
+                self.__free_slot()
+
+    async def _create(self, *args, **kwargs) -> _Entry:
+        elem = await self.create(*args, **kwargs)
+        if not self.check(elem):
+            await self.destroy(elem)
+            raise RuntimeError('Pool element check failed after creation')
+        self.__stats.created += 1
+        return _Entry(elem)
+
+    async def _destroy(self, entry: _Entry):
+        self.__stats.destroyed += 1
+        try:
+            await self.destroy(entry.elem)
+        except Exception as e:
+            self.log.error(f'Error destroying pool element {e}')
+
+    @abstractmethod
+    async def create(self, *args, **kwargs) -> T:
+        """Abstract method for creating the element.
+        Method should be implemented in child
+
+        Returns:
+            T: the created element
+        """
+        pass
+
+    def check(self, elem: T) -> bool:
+        """Check if the element is usable, called after creation and before it is handed out.
+        Might be reimplemented in child
+
+        Args:
+            elem (T): the element
+
+        Returns:
+            bool: True if ok
+        """
+        return bool(elem)
+
     async def destroy(self, elem: T) -> None:
         """Destroy element callback
 
@@ -1,21 +1,48 @@
 # -*- coding: utf-8 -*-
 import asyncio
-from typing import Optional, Union, List
+from typing import Optional, Union, List, Deque, Tuple
+from enum import Enum
+from collections import deque
+from time import monotonic
 from logging import Logger
 from ..log.log import get_logger
+from .backoff import Backoff
 
 
-__all__ = ['ReconnectingStream']
+__all__ = ['ReconnectingStream', 'DropPolicy']
 
 
 DEFAULT_RECONNECT_TIMEOUTS = [0.5, 0.75, 1, 1.5, 2, 3, 5, 8, 10, 15, 30, 60]
 
 
+class DropPolicy(Enum):
+    """What to do with the write when the outgoing buffer of `ReconnectingStream` is full"""
+    # drop the oldest buffered data to fit the new one
+    DROP_OLDEST = 'drop_oldest'
+    # drop the new data
+    DROP_NEWEST = 'drop_newest'
+    # raise `BufferError`
+    RAISE = 'raise'
+
+
 class ReconnectingStream(asyncio.streams.FlowControlMixin):
     """Stream protocol which will reconnect upon connection lost
+    The data written while disconnected or not ready is buffered and sent when the connection is ready.
+    The connection is ready right after `connection_made`. The protocols with the handshake (auth, TLS upgrade)
+    set `defer_ready`, write the handshake with `transport.write` and call `ready` when it is done,
+    the buffered data is sent after the handshake then.
     """
     log: Logger = get_logger('PersistentConnection')
     reconnect_timeout: Union[float, List[float]] = DEFAULT_RECONNECT_TIMEOUTS  # Время ожидания при неудачной попытке подключения
+    # the reconnect delays policy (copied per connection), None to build it from `reconnect_timeout`
+    backoff: Optional[Backoff] = None
+    # the outgoing buffer size while disconnected, 0 to fail the writes instead
+    buffer_max_bytes: int = 1024 * 1024
+    # the time the data might wait in the buffer, seconds, None to wait forever
+    buffer_max_age: Optional[float] = None
+    buffer_drop_policy: DropPolicy = DropPolicy.DROP_OLDEST
+    # the subclass calls `ready` itself after the handshake
+    defer_ready: bool = False
 
     def __init__(self, host=None, port=None, loop=None, **create_conn_kwargs) -> None:
         super().__init__(loop=loop)
@@ -27,6 +54,13 @@ class ReconnectingStream(asyncio.streams.FlowControlMixin):
         self.transport: Optional[asyncio.BaseTransport] = None
         self._closing_future: Union[None, asyncio.Future, asyncio.Task] = None
         self._connect_future: Union[None, asyncio.Future, asyncio.Task] = None
+        self._backoff = self.backoff.copy() if self.backoff is not None else Backoff.from_schedule(self.reconnect_timeout)
+        # (buffered at, data)
+        self._buffer: Deque[Tuple[float, bytes]] = deque()
+        self._buffer_size: int = 0
+        self._ready: bool = False
+        # the amount of the bytes dropped from the buffer
+        self.buffer_dropped: int = 0
 
     @classmethod
     async def create_connection(cls, host=None, port=None, loop=None, **create_conn_kwargs):
@@ -42,26 +76,21 @@ class ReconnectingStream(asyncio.streams.FlowControlMixin):
 
     async def _connect(self) -> bool:
         try:
-            idx: int = 0
-            timeout: float
             while True:
                 try:
-                    await self.loop.create_connection(
+                    await asyncio.wait_for(self.loop.create_connection(
                         protocol_factory=lambda: self,
                         host=self.host,
                         port=self.port,
                         **self.create_conn_kwargs
-                    )
-                except ConnectionError as e:
-                    self.log.error(f'Connection error {e}')
-                    if isinstance(self.reconnect_timeout, list):
-                        timeout = self.reconnect_timeout[idx]
-                        if idx < len(self.reconnect_timeout):
-                            idx += 1
-                    else:
-                        timeout = self.reconnect_timeout
+                    ), self._backoff.connect_timeout)
+                except (OSError, asyncio.TimeoutError) as e:
+                    self._backoff.on_failure()
+                    timeout = self._backoff.next_delay()
+                    self.log.error(f'Connection error {e!r}, the next try in {timeout:.2f} seconds')
                     await asyncio.sleep(timeout)
                 else:
+                    self._backoff.on_success()
                     return True
         except asyncio.CancelledError:
             self.log.warning('Connection is cancelled')
@@ -72,13 +101,94 @@ class ReconnectingStream(asyncio.streams.FlowControlMixin):
             raise ConnectionResetError('Connection is closing')
         await self._drain_helper()
 
+    @property
+    def buffered(self) -> int:
+        """The amount of the bytes waiting for the connection"""
+        return self._buffer_size
+
+    async def write(self, data: bytes):
+        """Write the data or buffer it if disconnected
+
+        Args:
+            data (bytes): the data
+
+        Raises:
+            ConnectionResetError: if the connection is closing
+            ConnectionError: if disconnected and the buffering is disabled
+            CircuitOpenError: if disconnected and the reconnect circuit is open (see `Backoff`)
+            BufferError: if the buffer is full and the drop policy is `DropPolicy.RAISE`
+        """
+        if self._closing:
+            raise ConnectionResetError('Connection is closing')
+        if not self._ready or self.transport is None or self._connection_lost or self.transport.is_closing():
+            self._buffer_data(data)
+            return
+        self.transport.write(data)  # type: ignore
+        await self._drain_helper()
+
+    def _buffer_data(self, data: bytes):
+        if self.buffer_max_bytes <= 0:
+            raise ConnectionError('No connection is made')
+        # the backend is down, the data would wait at least `open_time`
+        self._backoff.check()
+        self._drop_expired()
+        size = len(data)
+        if self._buffer_size + size > self.buffer_max_bytes:
+            if self.buffer_drop_policy is DropPolicy.RAISE:
+                raise BufferError(f'Outgoing buffer is full ({self._buffer_size} bytes)')
+            if self.buffer_drop_policy is DropPolicy.DROP_NEWEST or size > self.buffer_max_bytes:
+                self.buffer_dropped += size
+                return
+            while self._buffer_size + size > self.buffer_max_bytes:
+                self._drop_first()
+        self._buffer.append((monotonic(), data))
+        self._buffer_size += size
+
+    def _drop_first(self):
+        _, data = self._buffer.popleft()
+        self._buffer_size -= len(data)
+        self.buffer_dropped += len(data)
+
+    def _drop_expired(self):
+        if self.buffer_max_age is None:
+            return
+        deadline = monotonic() - self.buffer_max_age
+        while self._buffer and self._buffer[0][0] < deadline:
+            self._drop_first()
+
+    def _flush_buffer(self):
+        self._drop_expired()
+        if not self._buffer:
+            return
+        self.log.debug(f'Sending {self._buffer_size} buffered bytes')
+        data = b''.join(data for _, data in self._buffer)
+        self._buffer.clear()
+        self._buffer_size = 0
+        self.transport.write(data)  # type: ignore
+
     def connection_made(self, transport: asyncio.BaseTransport):
         self.log.debug(f'Connected succesfully to "{self.host}":{self.port}')
         super().connection_made(transport)
         self._connection_lost = False
         self.transport = transport
+        if not self.defer_ready:
+            self.ready()
+
+    def ready(self):
+        """Mark the connection ready, send the buffered data and call `on_ready`.
+        Called by `connection_made` unless `defer_ready` is set.
+        """
+        if self._ready or self.transport is None or self._connection_lost:
+            return
+        self._ready = True
+        self._flush_buffer()
+        self.on_ready()
+
+    def on_ready(self):
+        """Called when the connection is ready and the buffered data is written, might be overridden"""
 
     def connection_lost(self, exc: Optional[Exception]):
+        self._ready = False
         super().connection_lost(exc)
         if not self._closing:
             self.log.warning(f'Connection lost ({exc})')
@@ -90,6 +200,10 @@ class ReconnectingStream(asyncio.streams.FlowControlMixin):
     async def close(self):
         self.log.debug('Closing the connection')
         self._closing = True
+        if self._buffer:
+            self.log.warning(f'{self._buffer_size} buffered bytes are not sent')
+            self._buffer.clear()
+            self._buffer_size = 0
         if self._connect_future and not self._connect_future.done():
             self._connect_future.cancel()
 
@@ -1,56 +1,184 @@
 # -*- coding: utf-8 -*-
 import asyncio
-from typing import List, Callable, Coroutine, Any, Awaitable
+from enum import Enum
+from functools import partial
+from typing import List, Dict, Set, Callable, Coroutine, Any, Awaitable, Iterable, Optional, Union
 from ..log.log import get_logger
 from ..app.service import Service
 from ..aio.is_async import is_async
 from .connection_base import ConnectionBase
+from .idle import IdleSweeper
 
 
-__all__ = ['ServerBase']
+__all__ = ['ServerBase', 'ConnectionLimitPolicy']
 
 
 FABRIC_TYPE = Callable[[], ConnectionBase] | Callable[[], Awaitable[ConnectionBase]]
 
 
+class ConnectionLimitPolicy(Enum):
+    """What to do with the new connection when `ServerBase.max_connections` is reached"""
+    # the connection is not served until the other one is closed
+    WAIT = 'wait'
+    # the connection is closed at once
+    REJECT = 'reject'
+
+
+async def _gather_bounded(awaitables: Iterable[Awaitable], limit: int) -> List[Any]:
+    """Await all with at most `limit` at once, the exceptions are returned"""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(aw: Awaitable) -> Any:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(_run(aw) for aw in awaitables), return_exceptions=True)
+
+
 class ServerBase(Service):
     """Base class for all servers
     """
     log = get_logger('BaseServer')
     connection_fabric: FABRIC_TYPE
-    client_pool: List[ConnectionBase] = []
+    # the connected clients in the order of connection (the values are not used)
+    client_pool: Dict[ConnectionBase, None] = {}
+    # the period of the clients idle timeouts and heartbeats check, seconds
+    sweep_interval: float = 1.0
+    # the maximum amount of the served clients, None for no limit
+    max_connections: Optional[int] = None
+    connection_limit_policy: ConnectionLimitPolicy = ConnectionLimitPolicy.WAIT
+    # the amount of the clients closed or written to at once
+    shutdown_concurrency: int = 256
+    broadcast_concurrency: int = 256
 
-    def __init__(self, connection_fabric: FABRIC_TYPE, *args, **kwargs) -> None:
+    def __init__(self, connection_fabric: FABRIC_TYPE, *args, max_connections: Optional[int] = None, **kwargs) -> None:
         """Constructor
 
         Args:
             connection_fabric (Callable): the `ConnectionBase` class fabric
+            max_connections (Optional[int], optional): the maximum amount of the served clients. Defaults to `max_connections` class attribute.
         """
         super().__init__(*args, linear=False, **kwargs)
         self.connection_fabric = connection_fabric
-        self.client_pool = []
-    
+        self.client_pool = {}
+        self._sweeper = IdleSweeper(self.sweep_interval)
+        if max_connections is not None:
+            self.max_connections = max_connections
+        self.__slots = asyncio.Semaphore(self.max_connections) if self.max_connections is not None else None
+        # the connections waiting for the slot, cancelled on stop
+        self.__waiting: Set[asyncio.Future] = set()
+
     async def on_client_connected(self, *args, **kwargs):
         """Default callback to call on client connection event
         """
+        if self.__slots is not None:
+            if self.__slots.locked() and self.connection_limit_policy is ConnectionLimitPolicy.REJECT:
+                self.log.warning(f'Connections limit {self.max_connections} is reached, rejecting')
+                await self.on_rejected(*args, **kwargs)
+                return
+            if not await self.__acquire_slot():
+                await self.on_rejected(*args, **kwargs)
+                return
+        try:
+            client = self.connection_fabric()
+            if not isinstance(client, ConnectionBase):
+                client = await client
+            await client.connect(*args, **kwargs)
+        except BaseException:
+            if self.__slots is not None:
+                self.__slots.release()
+            raise
+        self.client_pool[client] = None
+        if client.on_close_future:
+            client.on_close_future.add_done_callback(partial(self._on_close, client))
+        if client.idle_timeout is not None or client.heartbeat_interval is not None:
+            self._sweeper.add(client)
+        asyncio.ensure_future(self.on_accepted(client))
+
+    async def __acquire_slot(self) -> bool:
+        """Wait for the free slot
+
+        Returns:
+            bool: False if the server is stopping, the slot is not taken then
+        """
+        if self._stopping:
+            return False
+        waiter = asyncio.ensure_future(self.__slots.acquire())  # type: ignore
+        self.__waiting.add(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.__slots.release()  # type: ignore
+            if self._stopping:
+                return False
+            raise
+        finally:
+            self.__waiting.discard(waiter)
+        if self._stopping:
+            # the slot is freed by the clients closed on stop
+            self.__slots.release()  # type: ignore
+            return False
+        return True
+
+    async def on_rejected(self, *args, **kwargs):
+        """Close the connection rejected because of `max_connections`.
+        Might be reimplemented in child, by default the client is created, connected and closed.
+        The arguments are the same as of `on_client_connected`.
+        """
         client = self.connection_fabric()
         if not isinstance(client, ConnectionBase):
             client = await client
         await client.connect(*args, **kwargs)
-        self.client_pool.append(client)
-        if client.on_close_future:
-            client.on_close_future.add_done_callback(self._on_close)
-        asyncio.ensure_future(self.on_accepted(client))
+        await client.close()
 
     async def __stop__(self):
-        for client in self.client_pool:
-            await client.close()
-    
-    def _on_close(self, client):
-        if client in self.client_pool:
-            self.client_pool.remove(client)
+        self._stopping = True
+        for waiter in list(self.__waiting):
+            waiter.cancel()
+        await self._sweeper.stop()
+        results = await _gather_bounded([client.close() for client in self.client_pool], self.shutdown_concurrency)
+        for result in results:
+            if isinstance(result, Exception):
+                self.log.error(f'Error closing client {result!r}')
+
+    def _on_close(self, client, _ = None):
+        self._sweeper.discard(client)
+        if self.client_pool.pop(client, self) is not self and self.__slots is not None:
+            self.__slots.release()
         asyncio.ensure_future(self.on_closed(client))
 
+    async def broadcast(self, msg: Union[str, bytes], clients: Optional[Iterable[ConnectionBase]] = None) -> int:
+        """Write the message to many clients, it is encoded once.
+        The clients with the full write buffers are waited for in parallel.
+        The data goes to `ConnectionBase.write_nowait` as is, the `write` overrides (e.g. `RPCConnectionMixin`
+        framing and compression) are bypassed, so the message must be in the wire format of the clients.
+
+        Args:
+            msg (Union[str, bytes]): the message
+            clients (Optional[Iterable[ConnectionBase]], optional): the clients to write to. Defaults to all the clients.
+
+        Returns:
+            int: the amount of the clients the message is written to
+        """
+        data = msg.encode() if isinstance(msg, str) else msg
+        waiting: List[Awaitable] = []
+        written = 0
+        for client in list(self.client_pool if clients is None else clients):
+            try:
+                aw = client.write_nowait(data)
+            except Exception as e:
+                self.log.debug(f'Broadcast failed {e!r}')
+                continue
+            if aw is None:
+                written += 1
+            else:
+                waiting.append(aw)
+        if waiting:
+            results = await _gather_bounded(waiting, self.broadcast_concurrency)
+            written += sum(1 for result in results if not isinstance(result, BaseException))
+        return written
+
     async def on_accepted(self, client: ConnectionBase):
         """On accepted conneciton callback
 
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Awaitable
+import os
+import stat
 import socket
+from time import monotonic
 import asyncio
 import traceback
 from ssl import SSLContext
@@ -10,7 +13,7 @@ from ..log.log import get_logger
 from ..util.datetime import time
 
 
-__all__ = ['SocketConnection', 'SocketServer', 'new_listen_socket']
+__all__ = ['SocketConnection', 'SocketServer', 'new_listen_socket', 'set_keepalive']
 
 
 _DEFAULT_LIMIT = 2 ** 16  # 64 KiB
@@ -37,11 +40,63 @@ def new_listen_socket(host: str, port: int, maxlisten=1024) -> socket.socket:
     return sock
 
 
+def _bind_unix_socket(path: str, permissions: int) -> socket.socket:
+    """Bind the Unix domain socket file and set its mode before `listen`, so no one connects in between
+
+    Args:
+        path (str): the socket file path, the stale socket file is removed
+        permissions (int): the mode of the socket file
+
+    Returns:
+        socket.socket: the bound socket, not listening yet
+    """
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.remove(path)
+    except FileNotFoundError:
+        pass
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.bind(path)
+        os.chmod(path, permissions)
+    except BaseException:
+        sock.close()
+        raise
+    return sock
+
+
+def set_keepalive(sock: socket.socket, idle: int = 60, interval: int = 10, count: int = 5):
+    """Enable TCP keepalive to detect the dead peers on the kernel level.
+    The timings are set where the platform supports them.
+
+    Args:
+        sock (socket.socket): the connected socket
+        idle (int, optional): seconds of idleness before the first probe. Defaults to 60.
+        interval (int, optional): seconds between the probes. Defaults to 10.
+        count (int, optional): the amount of the failed probes to drop the connection. Defaults to 5.
+    """
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, 'TCP_KEEPIDLE'):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle)
+    elif hasattr(socket, 'TCP_KEEPALIVE'):
+        # macOS
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, idle)  # type: ignore
+    if hasattr(socket, 'TCP_KEEPINTVL'):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval)
+    if hasattr(socket, 'TCP_KEEPCNT'):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, count)
+
+
 class SocketConnection(ConnectionBase):
     """Socket connection.
     Used with socket server or as a standalone connection.
     """
     log = get_logger('SocketConnetion')
+    # the message sent as a heartbeat (see `heartbeat_interval`), it is not passed to `on_message_received`.
+    # The delimiter is appended if the message does not end with it
+    heartbeat_message: Optional[str] = None
+    # TCP keepalive (idle, interval, count) for `set_keepalive`, None to keep the system defaults
+    keepalive: Optional[Tuple[int, int, int]] = None
     __reader: Optional[asyncio.StreamReader] = None
     __writer: Optional[asyncio.StreamWriter] = None
     __consumer_task: Optional[asyncio.Future] = None
@@ -49,6 +104,7 @@ class SocketConnection(ConnectionBase):
     __connection_port: Optional[int] = None
     __pause_future: Optional[asyncio.Future] = None
     __delimiter: Optional[bytes] = None
+    __heartbeat: Optional[str] = None
 
     @property
     def host(self) -> Optional[str]:
@@ -66,6 +122,10 @@ class SocketConnection(ConnectionBase):
         """
         super().__init__(*args, **kwargs)
         self.__delimiter = delimiter
+        self.__heartbeat = self.heartbeat_message
+        if self.__heartbeat is not None and delimiter and not self.__heartbeat.encode().endswith(delimiter):
+            # the received messages are compared with the delimiter, as `readuntil` returns them
+            self.__heartbeat += delimiter.decode()
         self.__reader: Optional[asyncio.StreamReader] = None
         self.__writer: Optional[asyncio.StreamWriter] = None
         self.__consumer_task = None
@@ -78,7 +138,7 @@ class SocketConnection(ConnectionBase):
         ssl: Optional[SSLContext] = None, ssl_handshake_timeout: Optional[int] = None, 
         family=0, proto=0, flags=0, sock: Optional[socket.socket] = None, 
         local_addr: Optional[Tuple[str, int]] = None, 
-        server_hostname: Optional[str] = None):
+        server_hostname: Optional[str] = None, path: Optional[str] = None):
         """Connect to peer
 
         Args:
@@ -93,12 +153,20 @@ class SocketConnection(ConnectionBase):
             sock (Optional[socket.socket], optional): already created socket if exists. Defaults to None.
             local_addr (Optional[Tuple[str, int]], optional): tuple of host,port for local connection. Defaults to None.
             server_hostname (Optional[str], optional): if ssl enabled might replace the default hostname. Defaults to None.
+            path (Optional[str], optional): the Unix domain socket path to connect to instead of host and port, starting with "\\0" for the abstract namespace (Linux). Defaults to None.
 
         Raises:
             RuntimeError: if ssl not enabled, but server_hostname is given
         """
         if server_hostname and not ssl:
             raise RuntimeError('Server hostname might be set only if ssl context is specified')
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(
+                path=path, limit=limit, ssl=ssl, sock=sock,
+                server_hostname=server_hostname, ssl_handshake_timeout=ssl_handshake_timeout
+            )
+            await self.connect(reader, writer)
+            return
         reader, writer = await asyncio.open_connection(
             host=host, port=port, limit=limit, 
             family=family, proto=proto, flags=flags, sock=sock, 
@@ -118,8 +186,17 @@ class SocketConnection(ConnectionBase):
         self.__reader = reader
         self.__writer = writer
         ei = self.__writer.get_extra_info('peername')
-        self.__connection_host = ei[0]
-        self.__connection_port = ei[1]
+        sock = self.__writer.get_extra_info('socket')
+        if self.keepalive is not None and sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            set_keepalive(sock, *self.keepalive)
+        if isinstance(ei, (tuple, list)):
+            self.__connection_host = ei[0]
+            self.__connection_port = ei[1]
+        else:
+            # Unix domain socket: the path (bytes for the abstract namespace), the accepted connections have no peer name
+            path = ei or self.__writer.get_extra_info('sockname')
+            self.__connection_host = os.fsdecode(path) if isinstance(path, bytes) else path
+            self.__connection_port = None
         self.log.debug(f'Connected to {self.__connection_host}')
         self.__consumer_task = asyncio.ensure_future(self._read_reader())
         await self.on_connection_made(self.__writer.transport)
@@ -154,10 +231,45 @@ class SocketConnection(ConnectionBase):
         Raises:
             ConnectionError: if no connection.
         """
+        await self._write_raw(msg)
+
+    async def _write_raw(self, msg: str):
+        """`write` of the socket itself, the mixins (e.g. `RPCConnectionMixin`) override `write` with their own signature"""
         if not self.__writer:
             raise ConnectionError('No connection is made or writer is dead')
         self.__writer.write(msg.encode())
+        self.last_sent = monotonic()
         await self.__writer.drain()
+
+    def write_nowait(self, data: bytes) -> Optional[Awaitable]:
+        """Write the encoded message to the stream buffer
+
+        Args:
+            data (bytes): the encoded message
+
+        Raises:
+            ConnectionError: if no connection.
+
+        Returns:
+            Optional[Awaitable]: None if written, the drain if the write buffer is full
+        """
+        if not self.__writer:
+            raise ConnectionError('No connection is made or writer is dead')
+        self.__writer.write(data)
+        self.last_sent = monotonic()
+        transport = self.__writer.transport
+        if transport.get_write_buffer_size() > transport.get_write_buffer_limits()[1]:
+            return self.__writer.drain()
+        return None
+
+    async def send_heartbeat(self):
+        if self.__heartbeat is not None:
+            await self._write_raw(self.__heartbeat)
+
+    async def on_idle_timeout(self):
+        self.log.warning(f'Connection to {self.__connection_host}:{self.__connection_port} is idle for {self.idle_timeout} seconds, closing')
+        await self.on_connection_lost(TimeoutError('Idle timeout'))
+        await self.close(is_lost=True)
     
     async def _read_reader(self) -> None:
         if not self.__reader:
@@ -175,15 +287,20 @@ class SocketConnection(ConnectionBase):
                     else:
                         msg += await self.__reader.read(_DEFAULT_LIMIT)
                     self.log.debug(f'Message: {msg.decode()}')
-                except asyncio.exceptions.IncompleteReadError:
-                    continue
+                except asyncio.exceptions.IncompleteReadError as e:
+                    # EOF, the rest without the delimiter is passed as is
+                    msg += e.partial
                 if not msg:
                     self.log.error(f'Connection from {self.__connection_host}:{self.__connection_port} is lost')
                     await self.on_connection_lost(ConnectionResetError())
                     asyncio.ensure_future(self.close(is_lost=True))
                     break
-                await self.on_message_received(msg.decode())
+                text = msg.decode()
                 msg = b''
+                if self.__heartbeat is not None and text == self.__heartbeat:
+                    self.last_received = monotonic()
+                    continue
+                await self.on_message_received(text)
         except Exception as e:
             self.log.error(f'Reader stopped {traceback.format_exc()}')
             await self.on_connection_lost(e)
@@ -219,12 +336,15 @@ class SocketServer(ServerBase):
     _ssl: Optional[SSLContext] = None
     _ssl_handshake_timeout: Optional[int] = None
     _server: Optional[asyncio.AbstractServer] = None
+    _path: Optional[str] = None
+    _permissions: Optional[int] = None
 
     def __init__(
         self, connection_fabric: FABRIC_TYPE, *args, 
         host: Optional[str] = None, port: Optional[int] = None, limit: int = _DEFAULT_LIMIT, 
         family = socket.AF_UNSPEC, flags = socket.AI_PASSIVE, sock: Optional[socket.socket] = None, backlog = 100, reuse_address: Optional[bool] = None, reuse_port: Optional[bool] = None,
-        ssl: Optional[SSLContext] = None, ssl_handshake_timeout: Optional[int] = None, **kwargs):
+        ssl: Optional[SSLContext] = None, ssl_handshake_timeout: Optional[int] = None,
+        path: Optional[str] = None, permissions: Optional[int] = None, **kwargs):
         """Constructor
 
         Args:
@@ -240,6 +360,8 @@ class SocketServer(ServerBase):
             reuse_port (Optional[bool], optional): if server need to reuse port. Defaults to None.
             ssl (Optional[SSLContext], optional): the `SSLContext` to use with this socket. Defaults to None.
             ssl_handshake_timeout (Optional[int], optional): timeout of ssl handshake. Defaults to None.
+            path (Optional[str], optional): the Unix domain socket path to listen on instead of host and port, starting with "\\0" for the abstract namespace (Linux). Defaults to None.
+            permissions (Optional[int], optional): the mode of the Unix domain socket file, e.g. 0o660. Defaults to None.
         """
         super().__init__(connection_fabric, *args, **kwargs)
         self._host = host
@@ -254,8 +376,34 @@ class SocketServer(ServerBase):
         self._ssl = ssl
         self._ssl_handshake_timeout = ssl_handshake_timeout
         self._server = None
-    
+        self._path = path
+        self._permissions = permissions
+
+    def _is_socket_file(self) -> bool:
+        return self._path is not None and not self._path.startswith('\0')
+
     async def __start__(self, *args, **kwargs):
+        if self._path is not None:
+            path, sock = self._path, self._sock
+            if self._permissions is not None and self._is_socket_file() and sock is None:
+                # asyncio listens on the socket after the mode is set
+                path, sock = None, _bind_unix_socket(self._path, self._permissions)
+            # otherwise the stale socket file is removed by asyncio
+            try:
+                self._server = await asyncio.start_unix_server(
+                    self.on_client_connected,
+                    path=path, limit=self._limit, sock=sock, backlog=self._backlog,
+                    ssl=self._ssl, ssl_handshake_timeout=self._ssl_handshake_timeout,
+                    start_serving=False
+                )
+            except BaseException:
+                if sock is not None and sock is not self._sock:
+                    sock.close()
+                raise
+            if self._permissions is not None and self._is_socket_file() and self._sock is not None:
+                # the given socket might be listening already
+                os.chmod(self._path, self._permissions)
+            return
         self._server = await asyncio.start_server(
             self.on_client_connected,
             host=self._host, port=self._port, limit=self._limit, family=self._family, flags=self._flags, backlog=self._backlog,
@@ -267,9 +415,17 @@ class SocketServer(ServerBase):
     async def __body__(self, *args, **kwargs):
         await self._server.start_serving()  # type: ignore
 
+    async def on_rejected(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        writer.close()
+
     async def __stop__(self, *args):
         if self._server:
             self._server.close()
         await super().__stop__(*args)
         if self._server:
             await self._server.wait_closed()
+        if self._is_socket_file():
+            try:
+                os.unlink(self._path)  # type: ignore
+            except FileNotFoundError:
+                pass
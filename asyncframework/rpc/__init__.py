@@ -1,4 +1,5 @@
 # -*- coding:utf-8 -*-
+from .compression import *
 from .decorator import *
 from .rpc import *
 from .rpc_connection import *
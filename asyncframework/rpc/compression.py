@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import zlib
+from abc import ABCMeta, abstractmethod
+from typing import Dict, Optional
+
+
+__all__ = ['Codec', 'ZlibCodec', 'CompressionStats', 'codecs', 'register_codec', 'get_codec']
+
+
+class Codec(metaclass=ABCMeta):
+    """Message compression algorithm, registered with `register_codec` by its `name`.
+    The name is sent in the `RPCMessage.content_encoding` and `RPCMessage.accept_encoding`.
+    """
+    name: str
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def decompress(self, data: bytes, max_size: Optional[int] = None) -> bytes:
+        """Decompress the data
+
+        Args:
+            data (bytes): the compressed data
+            max_size (Optional[int], optional): the maximum size of the decompressed data, None for no limit. Defaults to None.
+
+        Raises:
+            ValueError: if the decompressed data is larger than `max_size` or the data is corrupt or truncated
+        """
+        raise NotImplementedError()
+
+
+class ZlibCodec(Codec):
+    """The zlib (deflate) compression"""
+    name = 'zlib'
+
+    def __init__(self, level: int = 6) -> None:
+        """Constructor
+
+        Args:
+            level (int, optional): the compression level 1-9, the lower is faster. Defaults to 6.
+        """
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes, max_size: Optional[int] = None) -> bytes:
+        try:
+            if max_size is None:
+                return zlib.decompress(data)
+            decompressor = zlib.decompressobj()
+            result = decompressor.decompress(data, max_size)
+        except zlib.error as e:
+            raise ValueError(f'Corrupt compressed message: {e}') from e
+        if decompressor.unconsumed_tail:
+            raise ValueError(f'Decompressed message is larger than {max_size} bytes')
+        if not decompressor.eof:
+            raise ValueError('Compressed message is truncated')
+        if decompressor.unused_data:
+            raise ValueError(f'Compressed message has {len(decompressor.unused_data)} extra bytes')
+        return result
+
+
+codecs: Dict[str, Codec] = {}
+
+
+def register_codec(codec: Codec, replace: bool = False):
+    """Register the codec to be used by the connections
+
+    Args:
+        codec (Codec): the codec
+        replace (bool, optional): replace the codec registered with the same name. Defaults to False.
+    """
+    assert replace or codec.name not in codecs, f'Duplicate codec: {codec.name}'
+    codecs[codec.name] = codec
+
+
+def get_codec(name: str) -> Codec:
+    """Get the registered codec
+
+    Args:
+        name (str): the codec name
+
+    Raises:
+        ValueError: if the codec is not registered
+
+    Returns:
+        Codec: the codec
+    """
+    codec = codecs.get(name)
+    if codec is None:
+        raise ValueError(f'Unknown content encoding: {name}')
+    return codec
+
+
+register_codec(ZlibCodec())
+
+
+class CompressionStats():
+    """The compression metrics of the connection"""
+    __slots__ = ('sent', 'compressed', 'raw_bytes', 'wire_bytes', 'received', 'decompressed')
+
+    def __init__(self) -> None:
+        self.sent = 0
+        # the sent messages sent compressed
+        self.compressed = 0
+        # the size of the compressed messages before and after the compression (with the base64 overhead), bytes
+        self.raw_bytes = 0
+        self.wire_bytes = 0
+        self.received = 0
+        # the received messages which were compressed
+        self.decompressed = 0
+
+    @property
+    def ratio(self) -> float:
+        """The compressed size to the original size of the compressed messages, 1.0 if nothing is compressed"""
+        return self.wire_bytes / self.raw_bytes if self.raw_bytes else 1.0
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)}' for name in self.__slots__)
+        return f'CompressionStats({fields})'
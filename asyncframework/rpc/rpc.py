@@ -8,7 +8,7 @@ from logging import Logger
 from uuid import uuid4
 from packets import json
 from .decorator import rpc_methods
-from .types import MessageType, Request, Response, RPCSenderStopped, WrongConsumer, RPCDispatcherStopped, RPCException, NotToHandle, ResponseType, RPCDeliveryFailed, RPCConnectionLost
+from .types import MessageType, BaseMessage, Request, Response, RPCSenderStopped, WrongConsumer, RPCDispatcherStopped, RPCException, NotToHandle, ResponseType, RPCDeliveryFailed, RPCConnectionLost
 from ..net.connection_base import ConnectionBase
 from ..log.log import get_logger
 
@@ -255,7 +255,11 @@ class RPC(Generic[T]):  # pylint: disable=unsubscriptable-object
             msg (str): the incoming message
         """
         try:
-            loaded_msg = self._load_message(msg, msg_type, correlation_id, content_type, app_id, headers, reply_to)
+            if isinstance(msg, BaseMessage):
+                # passed as is by the connection with `transfers_objects`
+                loaded_msg = msg
+            else:
+                loaded_msg = self._load_message(msg, msg_type, correlation_id, content_type, app_id, headers, reply_to)
             if isinstance(loaded_msg, Request):
                 await self._recv_request(loaded_msg)
             elif isinstance(loaded_msg, Response):
@@ -263,7 +267,7 @@ class RPC(Generic[T]):  # pylint: disable=unsubscriptable-object
             else:
                 self.log.error(f'Unknown message type: {msg} ({type(loaded_msg)})')
         except Exception as e:
-            self.log.error(f'Error parsing message: {msg}, exception: {e}, traceback: {traceback.format_exc()}')
+            self.log.error('Error parsing message: %s, exception: %s', msg, e, exc_info=True)
 
     async def _message_returned(self, 
         msg: str, 
@@ -295,9 +299,9 @@ class RPC(Generic[T]):  # pylint: disable=unsubscriptable-object
                     )
                     await self._recv_response(resp)
             else:
-                self.log.error(f'Message not delivered. correlation_id: {correlation_id}, msg: {msg}')
+                self.log.error('Message not delivered. correlation_id: %s, msg: %s', correlation_id, msg)
         except Exception as e:
-            self.log.error(f'Error parsing the message: {msg}, exception: {e}, traceback: {traceback.format_exc()}')
+            self.log.error('Error parsing the message: %s, exception: %s', msg, e, exc_info=True)
 
     async def _on_connection_lost(self, exc, *args, **kwargs):
         """Callback on connection lost from transport
@@ -339,7 +343,7 @@ class RPC(Generic[T]):  # pylint: disable=unsubscriptable-object
             if self.raise_on_unregistered:
                 exception = RPCException(message=f'Exception: {e}, correlation_id: {request.correlation_id}, app_id: {request.app_id}', type=e.__class__.__name__, traceback=traceback.format_exc())
             else:
-                self.log.error(f'RPC request cant be processed. No dispatcher for it: {e}')
+                self.log.error('RPC request cant be processed. No dispatcher for it: %s', e)
                 return
         except NotToHandle:
             return
@@ -351,7 +355,7 @@ class RPC(Generic[T]):  # pylint: disable=unsubscriptable-object
         if request.response_required:
             if exception:
                 result = ''
-                self.log.error(f'RPC function exception. correlation_id: {request.correlation_id}, exception: {exception}')
+                self.log.error('RPC function exception. correlation_id: %s, exception: %s', request.correlation_id, exception)
             self.log.debug(f'Replying to RPC. correlation_id: {request.correlation_id}')
             response = Response(result=result, exception=exception)
             response.correlation_id = request.correlation_id
@@ -363,10 +367,11 @@ class RPC(Generic[T]):  # pylint: disable=unsubscriptable-object
         """Send message to transport.
         Might be overloaded to process the message before sending
         """
+        transfers_objects = self.connection.transfers_objects
         if isinstance(msg, Response) and msg.exception:
             msg.result = msg.exception.message # duping message of exception in result field
             await self.connection.write(
-                msg.dumps(), 
+                msg if transfers_objects else msg.dumps(), 
                 content_type='application/x-exception', 
                 correlation_id=msg.correlation_id, 
                 app_id=msg.app_id,
@@ -376,7 +381,7 @@ class RPC(Generic[T]):  # pylint: disable=unsubscriptable-object
             )
         else:
             await self.connection.write(
-                msg.dumps(),
+                msg if transfers_objects else msg.dumps(),
                 content_type='application/json', 
                 correlation_id=msg.correlation_id, 
                 app_id=msg.app_id,
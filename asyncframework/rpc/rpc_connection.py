@@ -1,13 +1,20 @@
 # -*- coding: utf-8 -*-
-from typing import Optional
+from typing import Optional, Sequence, FrozenSet
+from base64 import b64encode, b64decode
 from packets import makeField, Packet
 from packets.typedef.string_t import string_t, StringT
 from packets.processors.hash import HashT, Hash
+from ..log.log import get_logger
+from .compression import CompressionStats, get_codec
 
 
 __all__ = ['RPCMessage', 'RPCConnectionMixin']
 
 
+# the mixin doesn't override the `log` of the connection
+_log = get_logger('RPCConnection')
+
+
 class RPCMessage(Packet):
     msg: StringT = makeField(string_t, required=True)
     msg_type: StringT = makeField(string_t, required=True)
@@ -16,12 +23,73 @@ class RPCMessage(Packet):
     app_id: Optional[StringT] = makeField(string_t)
     headers: HashT = makeField(Hash(string_t, string_t), default={})
     reply_to: Optional[StringT] = makeField(string_t)
+    # the codec name if `msg` is compressed, the compressed `msg` is base64 encoded
+    content_encoding: Optional[StringT] = makeField(string_t)
+    # the comma separated codec names the sender is able to decompress
+    accept_encoding: Optional[StringT] = makeField(string_t)
 
 
 class RPCConnectionMixin:
     """Connection mixin on streams not supporting sending additional params through
     the connection channel.
+    The messages longer than `compression_threshold` are compressed with the first codec of `compression`
+    accepted by the peer. Every message advertises the accepted codecs, so the messages are sent
+    uncompressed until anything is received from the peer, the peers without compression get none.
     """
+    # the codec names (see `register_codec`) in the order of preference, empty to disable the compression
+    compression: Sequence[str] = ()
+    # the shorter messages are sent uncompressed, characters
+    compression_threshold: int = 4096
+    # the maximum size of the decompressed message, bytes, None for no limit
+    max_decompressed_size: Optional[int] = 64 * 2 ** 20
+    __peer_encodings: FrozenSet[str] = frozenset()
+    __compression_stats: Optional[CompressionStats] = None
+
+    @property
+    def compression_stats(self) -> CompressionStats:
+        if self.__compression_stats is None:
+            self.__compression_stats = CompressionStats()
+        return self.__compression_stats
+
+    @property
+    def peer_encodings(self) -> FrozenSet[str]:
+        """The codec names accepted by the peer"""
+        return self.__peer_encodings
+
+    async def connect(self, *args, **kwargs):
+        # the peer might be another one after the reconnect
+        self.__peer_encodings = frozenset()
+        await super().connect(*args, **kwargs) # type: ignore
+
+    def _compress(self, msg: str) -> tuple[str, Optional[str]]:
+        """Compress the message if it is long enough and the peer accepts the codec
+
+        Returns:
+            tuple[str, Optional[str]]: the message to send and the codec name, None if not compressed
+        """
+        stats = self.compression_stats
+        stats.sent += 1
+        if len(msg) < self.compression_threshold or not self.__peer_encodings:
+            return msg, None
+        for name in self.compression:
+            if name in self.__peer_encodings:
+                break
+        else:
+            return msg, None
+        raw = msg.encode()
+        packed = b64encode(get_codec(name).compress(raw)).decode('ascii')
+        if len(packed) >= len(raw):
+            return msg, None
+        stats.compressed += 1
+        stats.raw_bytes += len(raw)
+        stats.wire_bytes += len(packed)
+        return packed, name
+
+    def _decompress(self, message: RPCMessage) -> str:
+        if not message.content_encoding:
+            return message.msg
+        return get_codec(message.content_encoding).decompress(b64decode(message.msg), self.max_decompressed_size).decode()
+
     async def write(self, 
         msg: str, 
         type: str,
@@ -31,6 +99,7 @@ class RPCConnectionMixin:
         headers: Optional[dict] = None,
         reply_to: Optional[str] = None
     ):
+        msg, encoding = self._compress(msg)
         message = RPCMessage(
             msg = msg,
             msg_type = type,
@@ -38,16 +107,37 @@ class RPCConnectionMixin:
             app_id = app_id,
             reply_to = reply_to
         )
+        if encoding:
+            message.content_encoding = encoding
+        if self.compression:
+            message.accept_encoding = ','.join(self.compression)
         if content_type:
             message.content_type = content_type
         if headers:
             message.headers = HashT(headers)
         await super().write(message.dumps()) # type: ignore
 
+    def _decompress_or_drop(self, message: RPCMessage) -> Optional[str]:
+        """`_decompress` which logs the broken message instead of raising, the connection keeps reading"""
+        try:
+            return self._decompress(message)
+        except ValueError as e:
+            _log.error(f'Dropping the message {message.msg_type} ({message.correlation_id}): {e}')
+            return None
+
     async def on_message_received(self, msg: str):
         message = RPCMessage.loads(msg)
+        if message.accept_encoding:
+            self.__peer_encodings = frozenset(message.accept_encoding.split(','))
+        stats = self.compression_stats
+        stats.received += 1
+        if message.content_encoding:
+            stats.decompressed += 1
+        text = self._decompress_or_drop(message)
+        if text is None:
+            return
         await super().on_message_received( # type: ignore
-            message.msg, 
+            text, 
             msg_type = message.msg_type, 
             correlation_id = message.correlation_id, 
             content_type = message.content_type, 
@@ -58,8 +148,11 @@ class RPCConnectionMixin:
 
     async def on_message_returned(self, msg: str):
         message = RPCMessage.loads(msg)
+        text = self._decompress_or_drop(message)
+        if text is None:
+            return
         await super().on_message_returned( # type: ignore
-            message.msg, 
+            text, 
             correlation_id = message.correlation_id, 
             app_id = message.app_id,
             reply_to = message.reply_to,
@@ -1,6 +1,7 @@
 # -*- coding:utf-8 -*-
 from . import _datetime as datetime
 from . import _time as time
+from . import _buckets as buckets
 
 
-__all__ = ['time', 'datetime']
+__all__ = ['time', 'datetime', 'buckets']
@@ -0,0 +1,142 @@
+# -*- coding:utf-8 -*-
+from typing import Callable, Dict, Iterable, List, Optional, Union, Any
+from datetime import date, timedelta
+from time import localtime
+from functools import lru_cache
+try:
+    import numpy
+    numpy_imported = True
+except ImportError:
+    numpy_imported = False
+
+
+__all__ = ['midnights', 'week_starts', 'month_starts', 'month_ends', 'clear_cache', 'numpy_imported']
+
+
+# the offset is cached per 15 minutes, the steps with a transition inside (None) are resolved per timestamp
+_OFFSET_STEP = 900
+_MAX_OFFSETS = 1000000
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_offsets: Dict[int, Optional[int]] = {}
+
+
+Timestamps = Union[Iterable[Union[int, float]], Any]
+
+
+def _step_offset(key: int) -> Optional[int]:
+    try:
+        return _offsets[key]
+    except KeyError:
+        pass
+    if len(_offsets) >= _MAX_OFFSETS:
+        _offsets.clear()
+    start = localtime(key * _OFFSET_STEP).tm_gmtoff
+    end = localtime(key * _OFFSET_STEP + _OFFSET_STEP - 1).tm_gmtoff
+    offset = _offsets[key] = start if start == end else None
+    return offset
+
+
+def _offset(ts: int) -> int:
+    offset = _step_offset(ts // _OFFSET_STEP)
+    return localtime(ts).tm_gmtoff if offset is None else offset
+
+
+@lru_cache(maxsize=65536)
+def _local_midnight(day: int) -> int:
+    """Unixtime of the local midnight of the local day number (days since 1970-01-01).
+    If the clocks are switched at midnight, it is the first moment of the day.
+    """
+    local = day * 86400
+    # the offsets before and after the possible switch, the zone offsets are within 14 hours
+    candidates = {local - _offset(local - 50400), local - _offset(local + 50400)}
+    valid = [ts for ts in candidates if (ts + _offset(ts)) // 86400 == day]
+    return min(valid or candidates)
+
+
+def _month_start(day: int) -> int:
+    return day - date.fromordinal(day + _EPOCH_ORDINAL).day + 1
+
+
+def _next_month_start(day: int) -> int:
+    dt = date.fromordinal(day + _EPOCH_ORDINAL)
+    return (dt.replace(day=1) + timedelta(days=32)).replace(day=1).toordinal() - _EPOCH_ORDINAL
+
+
+def _buckets(timestamps: Timestamps, bucket_day: Callable[[int], int], shift: int = 0) -> Any:
+    if numpy_imported and isinstance(timestamps, numpy.ndarray):
+        ts = timestamps.astype(numpy.int64)
+        keys, inverse = numpy.unique(ts // _OFFSET_STEP, return_inverse=True)
+        steps = [_step_offset(int(key)) for key in keys]
+        offsets = numpy.array([0 if offset is None else offset for offset in steps], dtype=numpy.int64)[inverse]
+        if None in steps:
+            exact = numpy.array([offset is None for offset in steps])[inverse]
+            offsets[exact] = [localtime(int(value)).tm_gmtoff for value in ts[exact]]
+        days, day_inverse = numpy.unique((ts + offsets) // 86400, return_inverse=True)
+        bounds = numpy.array([_local_midnight(bucket_day(int(day))) + shift for day in days], dtype=numpy.int64)
+        return bounds[day_inverse]
+    result: List[int] = []
+    bounds: Dict[int, int] = {}
+    for ts in timestamps:
+        ts = int(ts)
+        day = (ts + _offset(ts)) // 86400
+        bound = bounds.get(day)
+        if bound is None:
+            bound = bounds[day] = _local_midnight(bucket_day(day)) + shift
+        result.append(bound)
+    return result
+
+
+def midnights(timestamps: Timestamps, offset: int = 0) -> Any:
+    """Local midnights of the unixtimes (see `datetime.midnight`)
+
+    Args:
+        timestamps (Timestamps): sequence or numpy array of unixtimes
+        offset (int, optional): the amount of days to add. Might be negative. Defaults to 0.
+
+    Returns:
+        Any: list of unixtimes, or numpy array for the numpy array input
+    """
+    return _buckets(timestamps, lambda day: day + offset)
+
+
+def week_starts(timestamps: Timestamps) -> Any:
+    """Local midnights of the Mondays of the weeks of the unixtimes (see `datetime.week_start`)
+
+    Args:
+        timestamps (Timestamps): sequence or numpy array of unixtimes
+
+    Returns:
+        Any: list of unixtimes, or numpy array for the numpy array input
+    """
+    # 1970-01-01 is Thursday
+    return _buckets(timestamps, lambda day: day - (day + 3) % 7)
+
+
+def month_starts(timestamps: Timestamps) -> Any:
+    """Local midnights of the first days of the months of the unixtimes
+
+    Args:
+        timestamps (Timestamps): sequence or numpy array of unixtimes
+
+    Returns:
+        Any: list of unixtimes, or numpy array for the numpy array input
+    """
+    return _buckets(timestamps, _month_start)
+
+
+def month_ends(timestamps: Timestamps) -> Any:
+    """The last seconds of the months of the unixtimes (see `datetime.end_of_month`)
+
+    Args:
+        timestamps (Timestamps): sequence or numpy array of unixtimes
+
+    Returns:
+        Any: list of unixtimes, or numpy array for the numpy array input
+    """
+    return _buckets(timestamps, _next_month_start, -1)
+
+
+def clear_cache():
+    """Drop the cached timezone offsets, required after the local timezone is changed (`time.tzset`)"""
+    _offsets.clear()
+    _local_midnight.cache_clear()
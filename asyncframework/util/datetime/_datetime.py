@@ -1,8 +1,25 @@
 # -*- coding:utf-8 -*-
-from typing import Optional, Union
+from typing import Optional, Union, Iterable, List, Tuple
 from copy import copy
 from datetime import *
 from time import mktime
+from functools import lru_cache
+
+
+# the fixed formats are parsed with `fromisoformat`, anything else (e.g. not zero padded fields) with `strptime`
+_TIME_BASE = date(1900, 1, 1)
+
+
+def _is_fixed_datetime(s: str) -> bool:
+    return len(s) == 19 and s[4] == '-' and s[7] == '-' and s[10] == ' ' and s[13] == ':' and s[16] == ':'
+
+
+def _is_fixed_date(s: str) -> bool:
+    return len(s) == 10 and s[4] == '-' and s[7] == '-'
+
+
+def _is_fixed_time(s: str) -> bool:
+    return len(s) == 8 and s[2] == ':' and s[5] == ':'
 
 
 def parse(s: str) -> datetime:
@@ -14,6 +31,11 @@ def parse(s: str) -> datetime:
     Returns:
         datetime: parsed datetime
     """
+    if _is_fixed_datetime(s) and s[:4].isdigit():
+        try:
+            return datetime.fromisoformat(s)
+        except ValueError:
+            pass
     return datetime.strptime(s, '%Y-%m-%d %H:%M:%S')
 
 
@@ -26,6 +48,11 @@ def parse_date(s: str) -> datetime:
     Returns:
         datetime: parsed datetime
     """
+    if _is_fixed_date(s) and s[:4].isdigit():
+        try:
+            return datetime.fromisoformat(s)
+        except ValueError:
+            pass
     return datetime.strptime(s, '%Y-%m-%d')
 
 
@@ -38,9 +65,26 @@ def parse_time(s: str) -> datetime:
     Returns:
         datetime: parsed datetime
     """
+    if _is_fixed_time(s):
+        try:
+            return datetime.combine(_TIME_BASE, time.fromisoformat(s))
+        except ValueError:
+            pass
     return datetime.strptime(s, '%H:%M:%S')
 
 
+def parse_many(strings: Iterable[str]) -> List[datetime]:
+    """Parse the strings for date and time with default pattern
+
+    Args:
+        strings (Iterable[str]): date and time strings
+
+    Returns:
+        List[datetime]: parsed datetimes
+    """
+    return [parse(s) for s in strings]
+
+
 def to_text(dt: datetime) -> str:
     """Convert date and time to text with default pattern
 
@@ -50,7 +94,8 @@ def to_text(dt: datetime) -> str:
     Returns:
         str: converted string
     """
-    return dt.strftime('%Y-%m-%d %H:%M:%S')
+    # the timezone offset of the aware datetime is cut off as strftime pattern does not have it
+    return dt.isoformat(' ', 'seconds')[:19]
 
 
 def to_date_text(dt: datetime) -> str:
@@ -62,7 +107,7 @@ def to_date_text(dt: datetime) -> str:
     Returns:
         str: converted string
     """
-    return dt.strftime('%Y-%m-%d')
+    return f'{dt.year:04d}-{dt.month:02d}-{dt.day:02d}'
 
 
 def to_time_text(dt: Union[datetime, time]):
@@ -74,7 +119,7 @@ def to_time_text(dt: Union[datetime, time]):
     Returns:
         str: converted string
     """
-    return dt.strftime('%H:%M:%S')
+    return f'{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}'
 
 
 def to_unixtime(dt: datetime) -> int:
@@ -89,8 +134,18 @@ def to_unixtime(dt: datetime) -> int:
     return int(mktime(dt.timetuple()))
 
 
+@lru_cache(maxsize=1024)
+def _day_start(day: str) -> Tuple[int, bool]:
+    """Local midnight unixtime of the date and whether the day is 24 hours long (no DST switch)"""
+    dt = datetime.fromisoformat(day)
+    start = to_unixtime(dt)
+    return start, to_unixtime(dt + timedelta(days=1)) - start == 86400
+
+
+@lru_cache(maxsize=4096)
 def str_to_unixtime(time_str: str) -> int:
-    """Convert string with default pattern to unixtime
+    """Convert string with default pattern to unixtime.
+    The results are cached, call `clear_cache` after the local timezone is changed.
 
     Args:
         time_str (str): string time
@@ -98,12 +153,23 @@ def str_to_unixtime(time_str: str) -> int:
     Returns:
         int: unixtime
     """
+    if _is_fixed_datetime(time_str) and time_str[:4].isdigit():
+        try:
+            start, regular = _day_start(time_str[:10])
+            t = time.fromisoformat(time_str[11:])
+        except ValueError:
+            pass
+        else:
+            if regular:
+                return start + t.hour * 3600 + t.minute * 60 + t.second
     dt = parse(time_str)
     return to_unixtime(dt)
 
 
+@lru_cache(maxsize=4096)
 def unixtime_to_str(ts: int) -> str:
-    """Convert unixtime to text string
+    """Convert unixtime to text string.
+    The results are cached, call `clear_cache` after the local timezone is changed.
 
     Args:
         ts (int): unix time
@@ -115,6 +181,37 @@ def unixtime_to_str(ts: int) -> str:
     return to_text(dt)
 
 
+def strs_to_unixtimes(strings: Iterable[str]) -> List[int]:
+    """Convert strings with default pattern to unixtimes
+
+    Args:
+        strings (Iterable[str]): string times
+
+    Returns:
+        List[int]: unixtimes
+    """
+    return [str_to_unixtime(s) for s in strings]
+
+
+def unixtimes_to_strs(timestamps: Iterable[int]) -> List[str]:
+    """Convert unixtimes to text strings
+
+    Args:
+        timestamps (Iterable[int]): unix times
+
+    Returns:
+        List[str]: converted strings
+    """
+    return [unixtime_to_str(ts) for ts in timestamps]
+
+
+def clear_cache():
+    """Drop the cached conversions, required after the local timezone is changed (`time.tzset`)"""
+    _day_start.cache_clear()
+    str_to_unixtime.cache_clear()
+    unixtime_to_str.cache_clear()
+
+
 def midnight(dtnow: Optional[Union[datetime, int, float]] = None, offset: int = 0) -> datetime:
     """Get midnight for current date or given date
 
@@ -1,72 +1,114 @@
 # -*- coding:utf-8 -*-
-from typing import Mapping, Optional, Any, Union, Iterator, TypeVar, Dict, Tuple, MutableSequence, TypeAlias
+from typing import Mapping, Optional, Any, Union, Iterator, Iterable, TypeVar, Dict, Tuple, List, MutableSequence, Sequence, TypeAlias
 import itertools
-from _collections_abc import dict_keys, dict_items
+from enum import Enum
 from packets import PacketBase
 
 
+__all__ = ['diff', 'diff_keys', 'DiffKeys', 'PatchOp', 'Patch', 'make_patch', 'apply_patch', 'compose_patches']
+
+
 _DT = TypeVar('_DT')
+_SAME = object()
+
 
+class _DiffFrame():
+    __slots__ = ('items', 'result', 'key', 'depth')
+
+    def __init__(self, items: Iterator[Tuple[Any, Any, Any]], result: Union[dict, list], depth: int) -> None:
+        self.items = items
+        self.result = result
+        self.key = None
+        self.depth = depth
+
+    def add(self, key: Any, value: Any):
+        if isinstance(self.result, list):
+            if value is not None:
+                self.result.append(value)
+        else:
+            self.result[key] = value
 
-def diff(data1: Optional[_DT], data2: Optional[_DT]) -> Union[Dict[Any, Any], _DT, None]:
+
+def _mapping_items(data1: Mapping, data2: Mapping) -> Iterator[Tuple[Any, Any, Any]]:
+    for key, value in data1.items():
+        yield key, value, data2.get(key)
+    for key, value in data2.items():
+        if key not in data1:
+            yield key, None, value
+
+
+def _diff_node(data1: Any, data2: Any, depth: int, max_depth: Optional[int]) -> Any:
+    """Compare two items: `_SAME`, the new value or the frame to compare the children"""
+    if data1 is data2:
+        return _SAME
+    elif data1 is None or data2 is None:
+        return data2
+    elif max_depth is not None and depth >= max_depth:
+        return data2 if data1 != data2 else _SAME
+    elif isinstance(data1, PacketBase):
+        assert isinstance(data2, (PacketBase, Dict))
+        return _DiffFrame(((fn, data1.get(fn), data2.get(fn)) for fn in data1.field_names()), {}, depth + 1)
+    elif isinstance(data1, Mapping):
+        assert isinstance(data2, Mapping), (data2, type(data2))
+        if type(data1) is dict and type(data2) is dict and data1 == data2:
+            return _SAME
+        return _DiffFrame(_mapping_items(data1, data2), {}, depth + 1)
+    elif isinstance(data1, MutableSequence) and isinstance(data2, MutableSequence):
+        if type(data1) is list and type(data2) is list and data1 == data2:
+            return _SAME
+        return _DiffFrame(((None, a, b) for a, b in itertools.zip_longest(data1, data2)), [], depth + 1)
+    elif data1 != data2:
+        return data2
+    return _SAME
+
+
+def diff(data1: Optional[_DT], data2: Optional[_DT], max_depth: Optional[int] = None) -> Union[Dict[Any, Any], _DT, None]:
     """Generate a difference between two items
 
     Args:
         data1 (Optional[Any]): item 1
         data2 (Optional[Any]): item 2
+        max_depth (Optional[int], optional): the items deeper than that are compared as a whole. Defaults to None.
 
     Returns:
-        Union[dict, FieldDiff, Any, None]: the difference between two items in fmt key:[prev, curr] or just [prev, curr]
+        Union[dict, Any, None]: the difference between two items: the changed values of item 2 by the keys or just the item 2
     """
-    class FieldDiff():
-        curr: Optional[_DT] = None
-        def __init__(self, curr: Optional[_DT]) -> None:
-            self.curr = curr
-
-    def iterate_fields(data1: Optional[_DT], data2: Optional[_DT], it: Union[Iterator, dict_keys]):
-        assert isinstance(data1, (PacketBase, Dict))
-        assert isinstance(data2, (PacketBase, Dict))
-        result = {}
-        for fn in it:
-            d = _real_diff(data1.get(fn), data2.get(fn))
-            if d is None:
+    node = _diff_node(data1, data2, 0, max_depth)
+    if not isinstance(node, _DiffFrame):
+        return None if node is _SAME else node
+    stack = [node]
+    while True:
+        frame = stack[-1]
+        for key, value1, value2 in frame.items:
+            node = _diff_node(value1, value2, frame.depth, max_depth)
+            if node is _SAME:
                 continue
-            else:
-                result[fn] = d.curr
-        return result
-
-    def _real_diff(data1: Optional[_DT], data2: Optional[_DT]) -> Optional[FieldDiff]:
-        if data1 is data2:
-            return None
-        elif data1 is None or data2 is None:
-            return FieldDiff(data2)
-        elif isinstance(data1, PacketBase):
-            d = iterate_fields(data1, data2, data1.field_names())
-            return FieldDiff(d) if d else None
-        elif isinstance(data1, Mapping):
-            assert isinstance(data2, Mapping), (data2, type(data2))
-            d = iterate_fields(data1, data2, iter(set(data1.keys()) | set(data2.keys())))
-            return FieldDiff(d) if d else None
-        elif isinstance(data1, (MutableSequence)) and isinstance(data2, (MutableSequence)):
-            dlist: MutableSequence = []
-            for a, b in itertools.zip_longest(data1, data2):
-                d = _real_diff(a, b)
-                if d is None or d.curr is None:
-                    continue
-                else:
-                    dlist.append(d.curr)
-            return FieldDiff(dlist) if dlist else None # type: ignore 
-        elif data1 != data2:
-            return FieldDiff(data2)
+            elif isinstance(node, _DiffFrame):
+                node.key = key
+                stack.append(node)
+                break
+            frame.add(key, node)
         else:
-            return None
-    d = _real_diff(data1, data2)
-    return d.curr if d is not None else d
+            stack.pop()
+            if not stack:
+                return frame.result or None  # type: ignore
+            if frame.result:
+                stack[-1].add(frame.key, frame.result)
 
 
 DiffKeys: TypeAlias = Dict[str, Union[str, 'DiffKeys']]
 
 
+def _keys_items(data1: Union[PacketBase, dict], data2: Union[PacketBase, dict]) -> Iterable[Tuple[str, Any]]:
+    if isinstance(data1, PacketBase):
+        assert isinstance(data2, PacketBase), (data2, type(data2))
+        return data1.packet_fields()
+    elif isinstance(data1, dict):
+        assert isinstance(data2, dict), (data2, type(data2))
+        return data1.items()
+    raise ValueError(f'Cant diff {type(data1)} vs {type(data2)}')
+
+
 def diff_keys(data1: Union[PacketBase, dict], data2: Union[PacketBase, dict]) -> DiffKeys:
     """Generate a difference between two items (only dict and Packet supported)
 
@@ -80,35 +122,231 @@ def diff_keys(data1: Union[PacketBase, dict], data2: Union[PacketBase, dict]) ->
     Returns:
         DiffKeys: map of touched fields in format field: '1' or `DiffKeys`
     """
-    keys_diff = {}
-    def iterate_fields(it: Union[Iterator[Tuple[str, Any]], dict_items]):
-        for fn, fv1 in it:
-            fv2 = data2.get(fn)
-            if fv1 is None and fv2 is None:
-                continue
-            elif fv1 is None or fv2 is None:
-                keys_diff[fn] = '1'
-            elif isinstance(fv1, (PacketBase, dict)):
-                sub_dict = diff_keys(fv1, fv2)
-                keys_diff[fn] = sub_dict
-            elif fv1 != fv2:
-                keys_diff[fn] = '1'
-    if isinstance(data1, PacketBase):
-        assert isinstance(data2, PacketBase), (data2, type(data2))
-
+    keys_diff: DiffKeys = {}
     if data1 is data2:
         return keys_diff
     elif data1 is None and data2 is not None:
-        for fn in data2.fields_names():
+        for fn in data2.field_names():  # type: ignore
             keys_diff[fn] = '1'
+        return keys_diff
     elif data1 is not None and data2 is None:
         return keys_diff
-    elif isinstance(data1, PacketBase):
-        assert isinstance(data2, PacketBase), (data2, type(data2))
-        iterate_fields(data1.packet_fields())
-    elif isinstance(data1, dict):
-        assert isinstance(data2, dict), (data2, type(data2))
-        iterate_fields(data1.items())
-    else:
-        raise ValueError(f'Cant diff {type(data1)} vs {type(data2)}')
+    stack = [(keys_diff, _keys_items(data1, data2), data2)]
+    while stack:
+        result, items, container2 = stack.pop()
+        for fn, fv1 in items:
+            fv2 = container2.get(fn)
+            if fv1 is None and fv2 is None:
+                continue
+            elif fv1 is None or fv2 is None:
+                result[fn] = '1'
+            elif isinstance(fv1, (PacketBase, dict)):
+                sub_diff: DiffKeys = {}
+                result[fn] = sub_diff
+                if fv1 is not fv2:
+                    stack.append((sub_diff, _keys_items(fv1, fv2), fv2))
+            elif fv1 != fv2:
+                result[fn] = '1'
     return keys_diff
+
+
+class PatchOp(Enum):
+    """Patch operation.
+    SET sets the value by the path, DEL deletes the key by the path,
+    SEQ applies the edit script [(i, j, values), ...] to the sequence by the path: seq[i:j] = values.
+    """
+    SET = 1
+    DEL = 2
+    SEQ = 3
+
+
+PatchPath: TypeAlias = Tuple[Any, ...]
+Patch: TypeAlias = List[Tuple[PatchOp, PatchPath, Any]]
+
+
+def _edit_script(seq1: Sequence, seq2: Sequence, start: int) -> List[Tuple[int, int, list]]:
+    """Myers shortest edit script between the sequences as the replaced segments (i, j, values) of `seq1`"""
+    n, m = len(seq1), len(seq2)
+    v = {1: 0}
+    trace = []
+    for d in range(n + m + 1):
+        trace.append(dict(v))
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and seq1[x] == seq2[y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                break
+        else:
+            continue
+        break
+    moves = []
+    x, y = n, m
+    for d in range(len(trace) - 1, 0, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v[k - 1] < v[k + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+        moves.append((prev_x, prev_y, x == prev_x))
+        x, y = prev_x, prev_y
+    edits: List[Tuple[int, int, list]] = []
+    for px, py, insert in reversed(moves):
+        if edits and edits[-1][1] == px:
+            i, j, values = edits[-1]
+            edits[-1] = (i, j, values + [seq2[py]]) if insert else (i, j + 1, values)
+        else:
+            edits.append((px, px, [seq2[py]]) if insert else (px, px + 1, []))
+    return [(start + i, start + j, values) for i, j, values in edits]
+
+
+def make_patch(data1: Any, data2: Any, max_depth: Optional[int] = None) -> Patch:
+    """Generate the patch turning item 1 into item 2 (see `apply_patch`).
+    The patch values are taken from item 2 as is, not copied.
+
+    Args:
+        data1 (Any): item 1
+        data2 (Any): item 2
+        max_depth (Optional[int], optional): the items deeper than that are replaced as a whole. Defaults to None.
+
+    Returns:
+        Patch: list of (operation, path, value), the path is a tuple of keys, fields and indexes
+    """
+    patch: Patch = []
+    stack: List[Tuple[PatchPath, Any, Any]] = [((), data1, data2)]
+    while stack:
+        path, value1, value2 = stack.pop()
+        if value1 is value2:
+            continue
+        elif value1 is None or value2 is None or (max_depth is not None and len(path) >= max_depth):
+            if value1 != value2:
+                patch.append((PatchOp.SET, path, value2))
+        elif isinstance(value1, PacketBase) and type(value1) is type(value2):
+            stack.extend((path + (fn, ), value1.get(fn), value2.get(fn)) for fn in reversed(list(value1.field_names())))
+        elif isinstance(value1, Mapping) and isinstance(value2, Mapping) and not isinstance(value2, PacketBase):
+            if type(value1) is dict and type(value2) is dict and value1 == value2:
+                continue
+            children = []
+            for key, child in value1.items():
+                if key in value2:
+                    children.append((path + (key, ), child, value2[key]))
+                else:
+                    patch.append((PatchOp.DEL, path + (key, ), None))
+            stack.extend(reversed(children))
+            patch.extend((PatchOp.SET, path + (key, ), child) for key, child in value2.items() if key not in value1)
+        elif isinstance(value1, MutableSequence) and isinstance(value2, Sequence) and not isinstance(value2, str):
+            n, m = len(value1), len(value2)
+            start = 0
+            while start < n and start < m and value1[start] == value2[start]:
+                start += 1
+            end1, end2 = n, m
+            while end1 > start and end2 > start and value1[end1 - 1] == value2[end2 - 1]:
+                end1 -= 1
+                end2 -= 1
+            if end1 - start == end2 - start:
+                stack.extend((path + (i, ), value1[i], value2[i]) for i in range(end1 - 1, start - 1, -1))
+            else:
+                patch.append((PatchOp.SEQ, path, _edit_script(value1[start:end1], value2[start:end2], start)))
+        elif value1 != value2:
+            patch.append((PatchOp.SET, path, value2))
+    return patch
+
+
+def _child(container: Any, key: Any) -> Any:
+    if isinstance(container, (Mapping, Sequence)) and not isinstance(container, PacketBase):
+        return container[key]
+    return getattr(container, key)
+
+
+def apply_patch(data: Any, patch: Patch) -> Any:
+    """Apply the patch (see `make_patch`) to the item in place
+
+    Args:
+        data (Any): the item to modify
+        patch (Patch): the patch
+
+    Returns:
+        Any: the modified item, it is the new object if the patch replaces it as a whole
+    """
+    for op, path, value in patch:
+        if not path:
+            if op == PatchOp.SET:
+                data = value
+                continue
+            elif op == PatchOp.SEQ:
+                parent, key = None, None
+                target = data
+            else:
+                raise ValueError('Cant delete the root item')
+        else:
+            parent = data
+            for key in path[:-1]:
+                parent = _child(parent, key)
+            key = path[-1]
+            target = _child(parent, key) if op == PatchOp.SEQ else None
+        if op == PatchOp.SEQ:
+            for i, j, values in reversed(value):
+                target[i:j] = values
+        elif isinstance(parent, (Mapping, MutableSequence)) and not isinstance(parent, PacketBase):
+            if op == PatchOp.SET:
+                parent[key] = value  # type: ignore
+            elif isinstance(parent, Mapping):
+                # the composed patch might drop the setting of the key before its deletion
+                parent.pop(key, None)  # type: ignore
+            else:
+                del parent[key]
+        else:
+            setattr(parent, key, value if op == PatchOp.SET else None)
+    return data
+
+
+def compose_patches(*patches: Patch) -> Patch:
+    """Compose the patches into one equal to applying them in order.
+    The operations overwritten by the later ones are dropped.
+    The operations are walked once from the last, so the cost is linear in their amount (times the paths depth).
+
+    Returns:
+        Patch: the composed patch
+    """
+    ops = [op for patch in patches for op in patch]
+    # path -> index of the nearest later operation replacing the path
+    overwrites: Dict[PatchPath, int] = {}
+    # path -> index of the nearest later operation shifting the sequence items under the path
+    shifts: Dict[PatchPath, int] = {}
+    result: Patch = []
+    for index in range(len(ops) - 1, -1, -1):
+        op, path, value = ops[index]
+        nearest = len(ops)
+        overwritten = False
+        for depth in range(len(path) + 1):
+            prefix = path[:depth]
+            later = shifts.get(prefix) if depth < len(path) else None
+            if later is not None and later < nearest:
+                # the later paths point to the other items
+                nearest, overwritten = later, False
+            later = overwrites.get(prefix)
+            if later is not None and later <= nearest:
+                # deleting the list item is not the same as deleting and setting it again
+                nearest, overwritten = later, not (op == PatchOp.DEL and bool(path) and isinstance(path[-1], int))
+        if not overwritten:
+            result.append((op, path, value))
+        if op == PatchOp.SEQ:
+            shifts[path] = index
+        else:
+            overwrites[path] = index
+            if op == PatchOp.DEL and path and isinstance(path[-1], int):
+                shifts[path[:-1]] = index
+    result.reverse()
+    return result
@@ -1,24 +1,98 @@
 # -*- coding:utf-8 -*-
-from typing import Sequence, List, Any, TypeVar
+from typing import Sequence, List, Any, TypeVar, Optional, MutableSequence, Generic
+import os
+import heapq
+from math import log
 from random import *
-from operator import add
-from functools import reduce
+from itertools import accumulate
 from bisect import bisect_left
+try:
+    import numpy
+    numpy_imported = True
+except ImportError:
+    numpy_imported = False
 
 
 _sys_random = SystemRandom()
-random = _sys_random.random
-shuffle = _sys_random.shuffle
-choice = _sys_random.choice
-getrandbits = _sys_random.getrandbits
-sample = _sys_random.sample
-randint = _sys_random.randint
+# explicit generator for the security sensitive uses, it is not affected by `use_fast_random`
+secure_random = _sys_random
+_rng: Random = _sys_random
+
+
+def use_fast_random(seed: Optional[int] = None):
+    """Switch all the functions of the module to the fast non-cryptographic generator (Mersenne Twister).
+    The generator is re-seeded from `os.urandom` in the forked processes. The processes started
+    with 'spawn' or 'forkserver' don't inherit the switch, `Worker` applies it on start (see `fast_random_enabled`).
+
+    Args:
+        seed (Optional[int], optional): the seed, None to seed from `os.urandom`. Defaults to None.
+    """
+    global _rng
+    _rng = Random(seed)
+
+
+def use_system_random():
+    """Switch all the functions of the module back to `SystemRandom` (the default)"""
+    global _rng
+    _rng = _sys_random
+
+
+def fast_random_enabled() -> bool:
+    """Check if the fast generator is used (see `use_fast_random`)
+
+    Returns:
+        bool: True if the module functions use the fast generator
+    """
+    return _rng is not _sys_random
+
+
+def reseed(seed: Optional[int] = None):
+    """Seed the fast generator again (does nothing for `SystemRandom`)
+
+    Args:
+        seed (Optional[int], optional): the seed, None to seed from `os.urandom`. Defaults to None.
+    """
+    if _rng is not _sys_random:
+        _rng.seed(seed)
+
+
+def _reseed_after_fork():
+    # the forked processes must not repeat the parent sequence
+    reseed()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reseed_after_fork)
+
+
+def random() -> float:
+    return _rng.random()
+
+
+def shuffle(x: MutableSequence[Any]):
+    _rng.shuffle(x)
+
+
+def choice(seq: Sequence[Any]) -> Any:
+    return _rng.choice(seq)
+
+
+def getrandbits(k: int) -> int:
+    return _rng.getrandbits(k)
+
+
+def sample(population: Sequence[Any], k: int, *, counts=None) -> List[Any]:
+    return _rng.sample(population, k, counts=counts)
+
+
+def randint(a: int, b: int) -> int:
+    return _rng.randint(a, b)
 
 
 def rand32() -> int:
     """Get random number as int32 signed
     """
-    return _sys_random.getrandbits(32) - 2147483648
+    return _rng.getrandbits(32) - 2147483648
 
 
 def roll(chance: float) -> bool:
@@ -30,7 +104,7 @@ def roll(chance: float) -> bool:
     Returns:
         bool: True if got a chance, else False
     """
-    return _sys_random.random() < chance
+    return _rng.random() < chance
 
 
 def get_distribution(probabilities: Sequence[float]) -> List[float]:
@@ -45,7 +119,7 @@ def get_distribution(probabilities: Sequence[float]) -> List[float]:
     """
     if abs(sum(probabilities) - 1) > 1e-6:
         raise ValueError(f'Summ of probabilities can\'t be higher than 1.0, but {sum(probabilities)} given')
-    return [reduce(add, probabilities[:i + 1]) for i in range(len(probabilities))]
+    return list(accumulate(probabilities))
 
 
 def normalize_probabilities(probabilities: Sequence[float]) -> List[float]:
@@ -67,7 +141,7 @@ def roll_event_distribution(events: Sequence[T], distribution: Sequence[float])
     Returns:
         Any: a single random element from events list
     """    
-    return events[bisect_left(distribution, _sys_random.random())]
+    return events[bisect_left(distribution, _rng.random())]
 
 
 def roll_event_probabilities(events: Sequence[T], probabilities: List[float]) -> T:
@@ -82,3 +156,95 @@ def roll_event_probabilities(events: Sequence[T], probabilities: List[float]) ->
     """    
     distribution = get_distribution(probabilities)
     return roll_event_distribution(events, distribution)
+
+
+class WeightedSampler(Generic[T]):
+    """Weighted random sampler built once for the events table (Vose alias method).
+    Each draw costs O(1) regardless of the table size.
+    """
+    __slots__ = ('events', '_prob', '_alias', '_weights', '_np_prob', '_np_alias')
+
+    def __init__(self, events: Sequence[T], weights: Sequence[float]) -> None:
+        """Constructor
+
+        Args:
+            events (Sequence[T]): the events to select from
+            weights (Sequence[float]): the weights (or probabilities) of the events, not necessarily normalized
+
+        Raises:
+            ValueError: in case of the wrong weights
+        """
+        n = len(events)
+        if n == 0 or n != len(weights):
+            raise ValueError(f'Events and weights must be the same non zero size, but {n} and {len(weights)} given')
+        if any(w < 0 for w in weights):
+            raise ValueError('Weights can\'t be negative')
+        total = sum(weights)
+        if total <= 0:
+            raise ValueError('Sum of weights must be positive')
+        self.events = events
+        self._weights = list(weights)
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # the rest are 1.0 up to the rounding errors
+        self._prob = prob
+        self._alias = alias
+        self._np_prob = None
+        self._np_alias = None
+
+    def roll(self) -> T:
+        """Draw a single event
+
+        Returns:
+            T: the event
+        """
+        u = _rng.random() * len(self._prob)
+        i = int(u)
+        return self.events[i if u - i < self._prob[i] else self._alias[i]]
+
+    def sample(self, k: int) -> List[T]:
+        """Draw `k` events with replacement, vectorized with numpy if it is installed
+
+        Args:
+            k (int): the amount of events
+
+        Returns:
+            List[T]: the events
+        """
+        if numpy_imported:
+            if self._np_prob is None:
+                self._np_prob = numpy.array(self._prob)
+                self._np_alias = numpy.array(self._alias)
+            u = numpy.random.default_rng(_rng.getrandbits(64)).random(k) * len(self._prob)
+            index = u.astype(numpy.int64)
+            chosen = numpy.where(u - index < self._np_prob[index], index, self._np_alias[index])  # type: ignore
+            events = self.events
+            return [events[i] for i in chosen.tolist()]
+        return [self.roll() for _ in range(k)]
+
+    def sample_unique(self, k: int) -> List[T]:
+        """Draw `k` distinct events without replacement (Efraimidis-Spirakis), the events with zero weight are never drawn
+
+        Args:
+            k (int): the amount of events
+
+        Raises:
+            ValueError: if there are less than `k` events with non zero weight
+
+        Returns:
+            List[T]: the events in the order of drawing
+        """
+        keys = {i: log(_rng.random() or 5e-324) / w for i, w in enumerate(self._weights) if w > 0}
+        if k > len(keys):
+            raise ValueError(f'Can\'t draw {k} unique events from {len(keys)}')
+        return [self.events[i] for i in heapq.nlargest(k, keys, key=keys.__getitem__)]
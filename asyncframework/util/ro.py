@@ -1,9 +1,12 @@
 # -*- coding:utf-8 -*-
-from typing import TypeVar, Generic, cast, Union, Any
+from typing import TypeVar, Generic, cast, Union, Any, Dict, Optional, Mapping, Sequence, Tuple
 from datetime import time, datetime, timedelta
 from types import MethodType, BuiltinMethodType, FunctionType
 
 
+__all__ = ['ReadOnly', 'FrozenDict', 'FrozenList', 'FrozenView', 'freeze']
+
+
 Proxied = TypeVar('Proxied')
 
 
@@ -89,3 +92,267 @@ class ReadOnly(Generic[Proxied]):
     __setitem__ = __readonly
     __delattr__ = __readonly
     __delitem__ = __readonly
+
+
+def _readonly(*args, **kwargs):
+    raise RuntimeError('This is the read only object')
+
+
+class FrozenDict(dict):
+    """Immutable dict, the result of `freeze` for mappings"""
+    __slots__ = ('__hash', '__initialized')
+
+    def __init__(self, *args, **kwargs) -> None:
+        try:
+            self.__initialized
+        except AttributeError:
+            self.__initialized = True
+            dict.__init__(self, *args, **kwargs)
+        else:
+            _readonly()
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+
+    def __hash__(self) -> int:  # type: ignore
+        try:
+            return self.__hash
+        except AttributeError:
+            h = self.__hash = hash(frozenset(self.items()))
+            return h
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self), ))
+
+
+class FrozenList(list):
+    """Immutable list, the result of `freeze` for the lists and tuples which contain themselves
+    (the tuple can't), the other ones are frozen into tuples"""
+    __slots__ = ('__initialized', )
+
+    def __init__(self, *args) -> None:
+        try:
+            self.__initialized
+        except AttributeError:
+            self.__initialized = True
+            list.__init__(self, *args)
+        else:
+            _readonly()
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __iadd__ = _readonly
+    __imul__ = _readonly
+    append = _readonly
+    clear = _readonly
+    extend = _readonly
+    insert = _readonly
+    pop = _readonly
+    remove = _readonly
+    reverse = _readonly
+    sort = _readonly
+
+    def __hash__(self) -> int:  # type: ignore
+        # the items might contain the list itself
+        return hash((FrozenList, len(self)))
+
+    def __reduce__(self):
+        return (FrozenList, (list(self), ))
+
+
+# the methods changing the object in place, the same as `ReadOnly` blocks
+_MUTATORS = frozenset(('add', 'remove', 'pop', 'popitem', 'setdefault', 'append', 'extend', 'insert', 'sort', 'reverse', 'clear', 'update', 'discard'))
+
+
+class FrozenView():
+    """Immutable view of the object, the result of `freeze` for objects and packets.
+    The view is the snapshot: the fields and the items (`[]`, `in`, `len`, iteration) are frozen
+    and stored in the view on freeze, the other attributes on the first read, so reading them costs
+    the same as the plain attribute access and the later changes of the original object are not seen.
+    Only the methods run on the original object, their results are frozen, the mutating methods (see `ReadOnly`) raise.
+    """
+    __slots__ = ('__origin', '__items', '__values', '__size', '__truth', '__dict__')
+
+    def __init__(self, origin: Any) -> None:
+        object.__setattr__(self, '_FrozenView__origin', origin)
+        # the iteration result, key (index for the sequences) -> item, len(), bool()
+        object.__setattr__(self, '_FrozenView__items', None)
+        object.__setattr__(self, '_FrozenView__values', None)
+        object.__setattr__(self, '_FrozenView__size', None)
+        object.__setattr__(self, '_FrozenView__truth', True)
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr in _MUTATORS:
+            return _readonly
+        value = getattr(self.__origin, attr)
+        if isinstance(value, type):
+            return value
+        if callable(value):
+            method = value
+
+            def value(*args, **kwargs):
+                return freeze(method(*args, **kwargs))
+        else:
+            value = freeze(value)
+        self.__dict__[attr] = value
+        return value
+
+    def __getitem__(self, item: Any) -> Any:
+        values = self.__values
+        if isinstance(values, tuple):
+            return values[item]
+        if values is not None:
+            try:
+                return values[item]
+            except (KeyError, TypeError):
+                pass
+        if isinstance(item, str) and item in self.__dict__:
+            return self.__dict__[item]
+        raise KeyError(item)
+
+    def __contains__(self, item: Any) -> bool:
+        values = self.__values
+        if values is not None and not isinstance(values, tuple):
+            try:
+                return item in values
+            except TypeError:
+                return False
+        items = self.__items
+        if items is None:
+            raise TypeError(f'argument of type {type(self.__origin).__name__!r} is not iterable')
+        return item in items
+
+    def __len__(self) -> int:
+        size = self.__size
+        if size is None:
+            raise TypeError(f'object of type {type(self.__origin).__name__!r} has no len()')
+        return size
+
+    def __bool__(self) -> bool:
+        return self.__truth
+
+    def __iter__(self):
+        items = self.__items
+        if items is None:
+            raise TypeError(f'{type(self.__origin).__name__!r} object is not iterable')
+        return iter(items)
+
+    def __repr__(self) -> str:
+        return repr(self.__origin)
+
+    def __str__(self) -> str:
+        return str(self.__origin)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, FrozenView):
+            other = object.__getattribute__(other, '_FrozenView__origin')
+        return self.__origin == other
+
+    def __hash__(self) -> int:
+        try:
+            return hash(self.__origin)
+        except TypeError:
+            return id(self.__origin)
+
+    @property  # type: ignore
+    def __class__(self) -> type:
+        return type(self.__origin)
+
+    __setattr__ = _readonly
+    __delattr__ = _readonly
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+
+
+_IMMUTABLE = (int, float, complex, bool, str, bytes, type(None), time, timedelta, datetime, frozenset, FrozenDict, FrozenList, FrozenView)
+
+
+def _field_names(obj: Any) -> list:
+    field_names = getattr(obj, 'field_names', None)
+    if callable(field_names):
+        return list(field_names())
+    names = [name for klass in reversed(type(obj).__mro__) for name in getattr(klass, '__annotations__', {})]
+    names.extend(getattr(obj, '__dict__', ()))
+    return names
+
+
+def freeze(obj: Proxied, memo: Optional[Dict[int, Any]] = None) -> Proxied:
+    """Convert the structure into the immutable counterparts once:
+    mappings into `FrozenDict`, lists and tuples into tuples (`FrozenList` if they contain themselves),
+    sets into frozensets and other objects (packets included) into `FrozenView`.
+    Unlike `ReadOnly` nothing is wrapped on the read.
+
+    Args:
+        obj (Proxied): the structure to freeze
+        memo (Optional[Dict[int, Any]], optional): id(original) -> frozen, keeps the shared children shared. Defaults to None.
+
+    Returns:
+        Proxied: the frozen structure
+    """
+    return _freeze(obj, {} if memo is None else memo, {})
+
+
+def _freeze(obj: Any, memo: Dict[int, Any], pending: Dict[int, bool]) -> Any:
+    """`freeze` implementation, `pending` marks the sequences being frozen: id -> they are met inside themselves"""
+    if isinstance(obj, _IMMUTABLE) or isinstance(obj, type) or callable(obj):
+        return obj
+    key = id(obj)
+    frozen = memo.get(key)
+    if frozen is not None:
+        if key in pending:
+            pending[key] = True
+        return frozen
+    if isinstance(obj, Mapping) and not hasattr(obj, 'field_names'):
+        frozen = memo[key] = FrozenDict()
+        dict.update(frozen, ((k, _freeze(value, memo, pending)) for k, value in obj.items()))
+    elif isinstance(obj, (list, tuple)):
+        # the tuple is built after its items, the list stands for it while they are frozen
+        placeholder = memo[key] = FrozenList()
+        pending[key] = False
+        items = [_freeze(value, memo, pending) for value in obj]
+        if pending.pop(key):
+            list.extend(placeholder, items)
+            frozen = placeholder
+        else:
+            frozen = memo[key] = tuple(items)
+    elif isinstance(obj, (set, frozenset)):
+        frozen = memo[key] = frozenset(obj)
+    else:
+        frozen = memo[key] = FrozenView(obj)
+        values = frozen.__dict__
+        for name in _field_names(obj):
+            if name not in values:
+                value = getattr(obj, name, None)
+                if not callable(value) or isinstance(value, type):
+                    values[name] = _freeze(value, memo, pending)
+        _freeze_items(frozen, obj, memo, pending)
+    return frozen
+
+
+def _freeze_items(frozen: FrozenView, obj: Any, memo: Dict[int, Any], pending: Dict[int, bool]):
+    """Store the container protocol results of the object in its view"""
+    klass = type(obj)
+    items: Optional[Tuple[Any, ...]] = None
+    values: Union[None, Tuple[Any, ...], Dict[Any, Any]] = None
+    if hasattr(klass, '__iter__') and not hasattr(klass, '__next__'):
+        # the iterators are not consumed
+        keys = list(obj)
+        items = tuple(_freeze(value, memo, pending) for value in keys)
+        if isinstance(obj, Sequence):
+            values = items
+        elif hasattr(klass, '__getitem__'):
+            try:
+                values = {key: _freeze(obj[key], memo, pending) for key in (obj.keys() if hasattr(obj, 'keys') else keys)}
+            except Exception:
+                # iterates not over its keys
+                values = None
+    object.__setattr__(frozen, '_FrozenView__items', items)
+    object.__setattr__(frozen, '_FrozenView__values', values)
+    object.__setattr__(frozen, '_FrozenView__size', len(obj) if hasattr(klass, '__len__') else None)
+    object.__setattr__(frozen, '_FrozenView__truth', bool(obj))
@@ -0,0 +1,168 @@
+# -*- coding:utf-8 -*-
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+import pickle
+import struct
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+
+__all__ = ['SharedSnapshot', 'SnapshotMapping', 'active_snapshot']
+
+
+_MAGIC = b'AFSS'
+_HEADER = struct.Struct('<4sQQ')  # magic, index offset, index length
+
+
+class SnapshotMapping(Mapping[str, Any]):
+    """Read-only mapping over the snapshot entry.
+    Values are unpickled directly from the shared memory on every access and are not kept by the mapping,
+    so the process holds only what it keeps itself (e.g. the loaded config), the raw data stays shared.
+    The unpickled values are private to the process: the config built from all of them (not `__lazy__`)
+    costs every process the same memory as the one loaded from the files.
+    """
+    __slots__ = ('_buf', '_offsets')
+
+    def __init__(self, buf: memoryview, offsets: Dict[str, Tuple[int, int]]) -> None:
+        self._buf = buf
+        self._offsets = offsets
+
+    def __getitem__(self, key: str) -> Any:
+        offset, length = self._offsets[key]
+        return pickle.loads(self._buf[offset:offset + length])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._offsets
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+
+class SharedSnapshot():
+    """Read-only snapshot of the data published in the shared memory.
+    The snapshot consists of entries: key -> (meta, mapping), the mapping values are stored separately
+    and unpickled lazily (see `SnapshotMapping`) so the process pays only for the values it uses.
+    """
+    _shm: SharedMemory
+    _index: Dict[str, Tuple[Any, Dict[str, Tuple[int, int]]]]
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def __init__(self, shm: SharedMemory, owner: bool = False) -> None:
+        """Constructor. Use `create` or `attach` instead.
+
+        Args:
+            shm (SharedMemory): the shared memory block with the snapshot.
+            owner (bool, optional): the snapshot is created by this process. Defaults to False.
+        """
+        self._shm = shm
+        self._owner = owner
+        self._buf = shm.buf
+        magic, index_offset, index_length = _HEADER.unpack_from(self._buf, 0)
+        if magic != _MAGIC:
+            raise ValueError(f'Shared memory {shm.name} is not a snapshot')
+        self._index = pickle.loads(self._buf[index_offset:index_offset + index_length])
+        self._entries: Dict[str, SnapshotMapping] = {}
+
+    @classmethod
+    def create(cls, entries: Mapping[str, Tuple[Any, Mapping[str, Any]]], name: Optional[str] = None) -> 'SharedSnapshot':
+        """Create the new snapshot in the shared memory
+
+        Args:
+            entries (Mapping[str, Tuple[Any, Mapping[str, Any]]]): the entries key -> (meta, mapping), all must be picklable.
+            name (Optional[str], optional): shared memory block name. Defaults to a random one.
+
+        Returns:
+            SharedSnapshot: the snapshot
+        """
+        blobs = []
+        index: Dict[str, Tuple[Any, Dict[str, Tuple[int, int]]]] = {}
+        offset = _HEADER.size
+        for key, (meta, data) in entries.items():
+            offsets: Dict[str, Tuple[int, int]] = {}
+            for field, value in data.items():
+                blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+                offsets[field] = (offset, len(blob))
+                blobs.append(blob)
+                offset += len(blob)
+            index[key] = (meta, offsets)
+        index_blob = pickle.dumps(index, pickle.HIGHEST_PROTOCOL)
+        shm = SharedMemory(name=name, create=True, size=offset + len(index_blob))
+        _HEADER.pack_into(shm.buf, 0, _MAGIC, offset, len(index_blob))
+        offset = _HEADER.size
+        for blob in blobs:
+            shm.buf[offset:offset + len(blob)] = blob
+            offset += len(blob)
+        shm.buf[offset:offset + len(index_blob)] = index_blob
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedSnapshot':
+        """Attach to the snapshot published by other process
+
+        Args:
+            name (str): shared memory block name
+
+        Returns:
+            SharedSnapshot: the snapshot
+        """
+        try:
+            shm = SharedMemory(name=name, track=False)  # type: ignore # python 3.13+
+        except TypeError:
+            shm = SharedMemory(name=name)
+            # the block belongs to the publisher, it must not be unlinked on this process exit
+            resource_tracker.unregister(shm._name, 'shared_memory')  # type: ignore
+        return cls(shm)
+
+    def get(self, key: str) -> Optional[Tuple[Any, SnapshotMapping]]:
+        """Get the snapshot entry
+
+        Args:
+            key (str): the entry key
+
+        Returns:
+            Optional[Tuple[Any, SnapshotMapping]]: (meta, mapping) or None if there is no such entry
+        """
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+        meta, offsets = entry
+        mapping = self._entries.get(key)
+        if mapping is None:
+            mapping = self._entries[key] = SnapshotMapping(self._buf, offsets)
+        return meta, mapping
+
+    def activate(self):
+        """Make the snapshot active for the process (see `active_snapshot`)"""
+        global _active
+        _active = self
+
+    def close(self):
+        """Detach from the shared memory"""
+        global _active
+        if _active is self:
+            _active = None
+        self._entries.clear()
+        self._shm.close()
+
+    def unlink(self):
+        """Detach and destroy the shared memory block. Only the publishing process should call it."""
+        self.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+_active: Optional[SharedSnapshot] = None
+
+
+def active_snapshot() -> Optional[SharedSnapshot]:
+    """The snapshot activated in this process
+
+    Returns:
+        Optional[SharedSnapshot]: active snapshot or None
+    """
+    return _active
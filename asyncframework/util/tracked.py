@@ -0,0 +1,405 @@
+# -*- coding:utf-8 -*-
+from typing import Any, Dict, Iterable, List, Optional, Set, Union, TYPE_CHECKING
+if TYPE_CHECKING:
+    from .diff import DiffKeys
+
+
+__all__ = ['TrackedMixin', 'TrackedDict', 'TrackedList', 'track']
+
+
+_SIMPLE = (int, float, complex, bool, str, bytes, type(None))
+
+
+class _Tracked():
+    """Common part of the tracked objects: the link to the owner to notify about the nested changes"""
+    _owner: Optional['_Tracked'] = None
+    _owner_key: Any = None
+
+    def _link(self, owner: '_Tracked', key: Any):
+        object.__setattr__(self, '_owner', owner)
+        object.__setattr__(self, '_owner_key', key)
+
+    def _child_changed(self, key: Any):
+        raise NotImplementedError()
+
+    def _notify_owner(self):
+        if self._owner is not None:
+            self._owner._child_changed(self._owner_key)
+
+    def changes(self) -> Any:
+        raise NotImplementedError()
+
+    def changed_keys(self) -> Any:
+        raise NotImplementedError()
+
+    def reset_changes(self):
+        raise NotImplementedError()
+
+
+def track(value: Any, owner: Optional[_Tracked] = None, key: Any = None) -> Any:
+    """Convert the dicts and lists in the value into the tracked ones and link them with the owner
+
+    Args:
+        value (Any): the value
+        owner (Optional[_Tracked], optional): the tracked container or packet holding the value. Defaults to None.
+        key (Any, optional): the value key in the owner. Defaults to None.
+
+    Returns:
+        Any: the tracked value (the same object for the tracked packets and the simple values)
+    """
+    if isinstance(value, _SIMPLE):
+        return value
+    if isinstance(value, _Tracked):
+        if isinstance(value, TrackedMixin) and not value.tracking:
+            value.track_changes()
+    elif isinstance(value, dict):
+        value = TrackedDict(value)
+    elif isinstance(value, list):
+        value = TrackedList(value)
+    else:
+        return value
+    if owner is not None:
+        value._link(owner, key)
+    return value
+
+
+def _nested_changes(value: Any, keys: bool) -> Any:
+    if isinstance(value, _Tracked):
+        return value.changed_keys() if keys else value.changes()
+    return None
+
+
+class TrackedDict(_Tracked, dict):
+    """Dict recording the changed keys, see `TrackedMixin`"""
+
+    def __init__(self, *args, **kwargs) -> None:
+        dict.__init__(self, *args, **kwargs)
+        object.__setattr__(self, '_changed', set())
+        object.__setattr__(self, '_nested', set())
+        for key, value in dict.items(self):
+            dict.__setitem__(self, key, track(value, self, key))
+
+    def __setitem__(self, key: Any, value: Any):
+        old = dict.get(self, key, self)
+        if old is value or (isinstance(value, _SIMPLE) and type(old) is type(value) and old == value):
+            return
+        dict.__setitem__(self, key, track(value, self, key))
+        self._changed.add(key)
+        self._notify_owner()
+
+    def __delitem__(self, key: Any):
+        dict.__delitem__(self, key)
+        self._changed.add(key)
+        self._notify_owner()
+
+    def __ior__(self, other: Any):  # type: ignore
+        self.update(other)
+        return self
+
+    def __reduce__(self):
+        # the copy is not linked to the owner and has no changes
+        return (TrackedDict, (dict(self), ))
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        if key in self:
+            self._changed.add(key)
+            self._notify_owner()
+        return dict.pop(self, key, *default)
+
+    def popitem(self) -> Any:
+        key, value = dict.popitem(self)
+        self._changed.add(key)
+        self._notify_owner()
+        return key, value
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):  # type: ignore
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        self._changed.update(self.keys())
+        dict.clear(self)
+        self._notify_owner()
+
+    def _child_changed(self, key: Any):
+        self._nested.add(key)
+        self._notify_owner()
+
+    def changes(self) -> Dict[Any, Any]:
+        """The changes in `util.diff.diff` format, the removed keys are None"""
+        result = {key: dict.get(self, key) for key in self._changed}
+        for key in self._nested:
+            if key not in self._changed:
+                nested = _nested_changes(dict.get(self, key), False)
+                if nested:
+                    result[key] = nested
+        return result
+
+    def changed_keys(self) -> 'DiffKeys':
+        """The changes in `util.diff.diff_keys` format"""
+        result: 'DiffKeys' = {key: '1' for key in self._changed}
+        for key in self._nested:
+            if key not in self._changed:
+                nested = _nested_changes(dict.get(self, key), True)
+                if nested:
+                    result[key] = nested
+        return result
+
+    def reset_changes(self):
+        """Forget the changes made so far"""
+        for key in self._nested:
+            value = dict.get(self, key)
+            if isinstance(value, _Tracked):
+                value.reset_changes()
+        self._changed.clear()
+        self._nested.clear()
+
+
+class TrackedList(_Tracked, list):
+    """List recording the changed indexes, see `TrackedMixin`.
+    The shifting operations (insert, delete, sort...) change all the items from the first affected index,
+    the same as the positional comparison of `util.diff.diff` sees them.
+    """
+
+    def __init__(self, iterable: Iterable = ()) -> None:
+        list.__init__(self, iterable)
+        object.__setattr__(self, '_changed', set())
+        object.__setattr__(self, '_nested', set())
+        object.__setattr__(self, '_shifted', None)
+        self._relink(0)
+
+    def _relink(self, start: int):
+        for i in range(start, len(self)):
+            list.__setitem__(self, i, track(list.__getitem__(self, i), self, i))
+
+    def _shift(self, start: int):
+        """All the items from `start` are changed"""
+        if self._shifted is None or start < self._shifted:
+            object.__setattr__(self, '_shifted', start)
+        self._relink(start)
+        self._notify_owner()
+
+    def __setitem__(self, index: Any, value: Any):
+        if isinstance(index, slice):
+            size = len(self)
+            start, stop, step = index.indices(size)
+            list.__setitem__(self, index, value)
+            if len(self) == size:
+                changed = range(start, stop, step)
+                for i in changed:
+                    list.__setitem__(self, i, track(list.__getitem__(self, i), self, i))
+                self._changed.update(changed)
+                self._notify_owner()
+            else:
+                self._shift(start)
+            return
+        if index < 0:
+            index += len(self)
+        old = list.__getitem__(self, index)
+        if old is value or (isinstance(value, _SIMPLE) and type(old) is type(value) and old == value):
+            return
+        list.__setitem__(self, index, track(value, self, index))
+        self._changed.add(index)
+        self._notify_owner()
+
+    def __delitem__(self, index: Any):
+        start = index.indices(len(self))[0] if isinstance(index, slice) else (index + len(self) if index < 0 else index)
+        list.__delitem__(self, index)
+        self._shift(start)
+
+    def __reduce__(self):
+        # the copy is not linked to the owner and has no changes
+        return (TrackedList, (list(self), ))
+
+    def __iadd__(self, other: Iterable):  # type: ignore
+        self.extend(other)
+        return self
+
+    def __imul__(self, count: int):  # type: ignore
+        start = len(self)
+        list.__imul__(self, count)
+        self._shift(min(start, len(self)))
+        return self
+
+    def append(self, value: Any):
+        list.append(self, track(value, self, len(self)))
+        self._changed.add(len(self) - 1)
+        self._notify_owner()
+
+    def extend(self, values: Iterable):
+        start = len(self)
+        list.extend(self, values)
+        self._relink(start)
+        self._changed.update(range(start, len(self)))
+        self._notify_owner()
+
+    def insert(self, index: int, value: Any):
+        size = len(self)
+        list.insert(self, index, value)
+        self._shift(min(max(index if index >= 0 else index + size, 0), size))
+
+    def pop(self, index: int = -1) -> Any:
+        start = index + len(self) if index < 0 else index
+        value = list.pop(self, index)
+        self._shift(start)
+        return value
+
+    def remove(self, value: Any):
+        start = self.index(value)
+        list.__delitem__(self, start)
+        self._shift(start)
+
+    def clear(self):
+        list.clear(self)
+        self._shift(0)
+
+    def sort(self, *args, **kwargs):
+        list.sort(self, *args, **kwargs)
+        self._shift(0)
+
+    def reverse(self):
+        list.reverse(self)
+        self._shift(0)
+
+    def _child_changed(self, key: Any):
+        self._nested.add(key)
+        self._notify_owner()
+
+    def _changed_indexes(self) -> Set[int]:
+        indexes = set(i for i in self._changed if i < len(self))
+        if self._shifted is not None:
+            indexes.update(range(self._shifted, len(self)))
+        return indexes
+
+    def changes(self) -> List[Any]:
+        """The changes in `util.diff.diff` format: the changed items in order, the removed ones are skipped"""
+        changed = self._changed_indexes()
+        indexes = set(changed)
+        indexes.update(i for i in self._nested if i < len(self))
+        result = []
+        for i in sorted(indexes):
+            value = list.__getitem__(self, i)
+            if i not in changed:
+                value = _nested_changes(value, False)
+            if value is not None and (i in changed or value):
+                result.append(value)
+        return result
+
+    def changed_keys(self) -> Union[str, 'DiffKeys']:
+        """The changes in `util.diff.diff_keys` format: the list is a single value"""
+        return '1' if self._changed or self._nested or self._shifted is not None else {}
+
+    def reset_changes(self):
+        """Forget the changes made so far"""
+        for i in self._nested:
+            if i < len(self):
+                value = list.__getitem__(self, i)
+                if isinstance(value, _Tracked):
+                    value.reset_changes()
+        self._changed.clear()
+        self._nested.clear()
+        object.__setattr__(self, '_shifted', None)
+
+
+_fields_cache: Dict[type, frozenset] = {}
+
+
+def _field_names(cls: type) -> frozenset:
+    names = _fields_cache.get(cls)
+    if names is None:
+        names = _fields_cache[cls] = frozenset(cls.field_names())  # type: ignore
+    return names
+
+
+class TrackedMixin(_Tracked):
+    """Mixin recording the changed fields of the packet on assignment, including the changes
+    of the nested packets, dicts and lists (they are converted to the tracked ones).
+    The changes are produced in `util.diff.diff`/`diff_keys` format in time proportional to their amount.
+    Put it before the packet base: `class Player(TrackedMixin, Packet)`,
+    call `track_changes` after the packet is created or loaded and `reset_changes` after the changes are consumed.
+    The fields replaced as a whole are reported with their new values.
+    """
+    __tracking: bool = False
+
+    @property
+    def tracking(self) -> bool:
+        return self.__tracking
+
+    def track_changes(self):
+        """Start tracking: convert the containers in the fields to the tracked ones and forget the changes"""
+        object.__setattr__(self, '_TrackedMixin__tracking', False)
+        for name in self.field_names():  # type: ignore
+            value = getattr(self, name, None)
+            tracked = track(value, self, name)
+            if tracked is not value:
+                self.__store(name, tracked)
+        object.__setattr__(self, '_TrackedMixin__changed', set())
+        object.__setattr__(self, '_TrackedMixin__nested', set())
+        object.__setattr__(self, '_TrackedMixin__tracking', True)
+
+    def __setattr__(self, name: str, value: Any):
+        if not self.__tracking or name not in _field_names(type(self)):
+            super().__setattr__(name, value)
+            return
+        old = getattr(self, name, None)
+        if old is value or (isinstance(value, _SIMPLE) and type(old) is type(value) and old == value):
+            return
+        self.__store(name, track(value, self, name))
+        self.__changed.add(name)
+        self._notify_owner()
+
+    def __store(self, name: str, tracked: Any):
+        """Set the field through the packet processors and check the tracked container is kept
+
+        Raises:
+            TypeError: if the field processor replaces the tracked container
+        """
+        super().__setattr__(name, tracked)
+        if isinstance(tracked, (TrackedDict, TrackedList)):
+            stored = getattr(self, name, None)
+            if stored is not tracked and not isinstance(stored, _Tracked):
+                raise TypeError(f'{type(self).__name__}.{name} field converts {type(stored).__name__} and loses the changes tracking')
+
+    def _child_changed(self, key: Any):
+        self.__nested.add(key)
+        self._notify_owner()
+
+    def changes(self) -> Dict[str, Any]:
+        """The changes in `util.diff.diff` format"""
+        if not self.__tracking:
+            return {}
+        result = {name: getattr(self, name) for name in self.__changed}
+        for name in self.__nested:
+            if name not in self.__changed:
+                nested = _nested_changes(getattr(self, name), False)
+                if nested:
+                    result[name] = nested
+        return result
+
+    def changed_keys(self) -> 'DiffKeys':
+        """The changes in `util.diff.diff_keys` format"""
+        if not self.__tracking:
+            return {}
+        result: 'DiffKeys' = {name: '1' for name in self.__changed}
+        for name in self.__nested:
+            if name not in self.__changed:
+                nested = _nested_changes(getattr(self, name), True)
+                if nested:
+                    result[name] = nested
+        return result
+
+    def reset_changes(self):
+        """Forget the changes made so far"""
+        if not self.__tracking:
+            return
+        for name in self.__nested:
+            value = getattr(self, name, None)
+            if isinstance(value, _Tracked):
+                value.reset_changes()
+        self.__changed.clear()
+        self.__nested.clear()
@@ -0,0 +1,50 @@
+# -*- coding:utf-8 -*-
+"""Config loading with and without the parsed files cache.
+
+The config tree has dozens of readers sharing the same multi-megabyte base file.
+Run from the repository root: python benchmarks/bench_config_cache.py
+"""
+import os
+import json
+import tempfile
+import timeit
+from asyncframework.app.config import ConfigReader, clear_config_cache
+
+
+READERS = 40
+BASE_ROWS = 50000
+ROUNDS = 5
+
+
+def make_tree(path: str):
+    base = os.path.join(path, 'base.json')
+    with open(base, 'w') as f:
+        json.dump({f'row{i}': {'name': f'name{i}', 'number': i, 'active': bool(i % 2)} for i in range(BASE_ROWS)}, f)
+    readers = []
+    for i in range(READERS):
+        own = os.path.join(path, f'reader{i}.json')
+        with open(own, 'w') as f:
+            json.dump({f'own{i}': {'value': i}}, f)
+        readers.append(type(f'Reader{i}', (ConfigReader, ), {'__filename__': [base, own]}))
+    return readers
+
+
+def load_all(readers, cached: bool):
+    for reader in readers:
+        if not cached:
+            clear_config_cache()
+        reader._load_data()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as path:
+        readers = make_tree(path)
+        print(f'base file: {os.path.getsize(os.path.join(path, "base.json")) / 2 ** 20:.1f} MiB, readers: {READERS}')
+        for cached in (False, True):
+            load_all(readers, cached)
+            t = min(timeit.repeat(lambda: load_all(readers, cached), number=1, repeat=ROUNDS))
+            print(f'{"cached" if cached else "uncached"}: {t * 1000:.1f} ms per load cycle')
+
+
+if __name__ == '__main__':
+    main()
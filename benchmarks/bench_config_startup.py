@@ -0,0 +1,58 @@
+# -*- coding:utf-8 -*-
+"""Config startup time: cold JSON parsing and validation against the compiled cache.
+
+Run from the repository root: python benchmarks/bench_config_startup.py
+"""
+import os
+import json
+import tempfile
+import timeit
+from packets import Packet, makeField
+from packets.typedef.string_t import string_t
+from packets.typedef.int_t import int_t
+from packets.typedef.bool_t import bool_t
+from asyncframework.app.config import TableConfigReader, clear_config_cache
+
+
+ROWS = 100000
+ROUNDS = 5
+
+
+class Row(Packet):
+    name: str = makeField(string_t, required=True)
+    number: int = makeField(int_t, required=True)
+    active: bool = makeField(bool_t, default=True)
+
+
+class JsonTable(TableConfigReader[Row]):
+    __default_field__ = makeField(Row, required=True)
+
+
+class CachedTable(TableConfigReader[Row]):
+    __default_field__ = makeField(Row, required=True)
+    __compiled_cache__ = True
+
+
+def cold_load(cls):
+    # every worker restart starts with the empty parsed files cache
+    clear_config_cache()
+    cls.load_cfg()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as path:
+        filename = os.path.join(path, 'table.json')
+        with open(filename, 'w') as f:
+            json.dump({f'row{i}': {'name': f'name{i}', 'number': i, 'active': bool(i % 2)} for i in range(ROWS)}, f)
+        JsonTable.__filename__ = [filename]
+        CachedTable.__filename__ = [filename]
+        print(f'table: {ROWS} rows, {os.path.getsize(filename) / 2 ** 20:.1f} MiB')
+        t = timeit.timeit(lambda: cold_load(CachedTable), number=1)
+        print(f'cache build: {t * 1000:.1f} ms')
+        for cls in (JsonTable, CachedTable):
+            t = min(timeit.repeat(lambda: cold_load(cls), number=1, repeat=ROUNDS))
+            print(f'{cls.__name__}: {t * 1000:.1f} ms per load')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+# -*- coding:utf-8 -*-
+"""Fixed format datetime parsing and formatting against `strptime`/`strftime`, bulk time bucketing.
+
+Run from the repository root: python benchmarks/bench_datetime.py
+"""
+import timeit
+from datetime import datetime as _datetime
+from time import mktime
+from asyncframework.util.datetime import datetime, buckets
+
+
+COUNT = 100000
+FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def main():
+    start = 1700000000
+    # log ingestion: many records per second, so the timestamps repeat
+    timestamps = [start + i // 4 for i in range(COUNT)]
+    texts = [_datetime.fromtimestamp(ts).strftime(FORMAT) for ts in timestamps]
+    dts = [_datetime.fromtimestamp(ts) for ts in timestamps]
+    cases = (
+        ('parse', lambda: [_datetime.strptime(s, FORMAT) for s in texts], lambda: datetime.parse_many(texts)),
+        ('to_text', lambda: [dt.strftime(FORMAT) for dt in dts], lambda: [datetime.to_text(dt) for dt in dts]),
+        ('str_to_unixtime', lambda: [int(mktime(_datetime.strptime(s, FORMAT).timetuple())) for s in texts], lambda: datetime.strs_to_unixtimes(texts)),
+        ('unixtime_to_str', lambda: [_datetime.fromtimestamp(ts).strftime(FORMAT) for ts in timestamps], lambda: datetime.unixtimes_to_strs(timestamps)),
+        ('midnight', lambda: [datetime.to_unixtime(datetime.midnight(ts)) for ts in timestamps], lambda: buckets.midnights(timestamps)),
+    )
+    for name, old, new in cases:
+        datetime.clear_cache()
+        buckets.clear_cache()
+        t_old = min(timeit.repeat(old, number=1, repeat=3))
+        t_new = min(timeit.repeat(new, number=1, repeat=3))
+        print(f'{name}: strptime/strftime {COUNT / t_old / 1e6:.2f} M/s, fast {COUNT / t_new / 1e6:.2f} M/s')
+
+
+if __name__ == '__main__':
+    main()
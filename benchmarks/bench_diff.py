@@ -0,0 +1,77 @@
+# -*- coding:utf-8 -*-
+"""Diff and patch of the large nested packet trees: thousands of player states per tick.
+
+Run from the repository root: python benchmarks/bench_diff.py
+"""
+from typing import Dict, List, Optional
+import timeit
+from copy import deepcopy
+from packets import Packet, makeField
+from packets.processors import Array, Hash
+from packets.typedef.int_t import int_t
+from packets.typedef.string_t import string_t
+from asyncframework.util.diff import diff, diff_keys, make_patch, apply_patch, compose_patches
+
+
+PLAYERS = 2000
+ROUNDS = 5
+
+
+class Item(Packet):
+    id: int = makeField(int_t, required=True)
+    count: int = makeField(int_t, default=0)
+
+
+class Player(Packet):
+    name: str = makeField(string_t, required=True)
+    level: int = makeField(int_t, default=1)
+    guild: Optional[str] = makeField(string_t)
+    items: List[Item] = makeField(Array(Item), default=[])
+    stats: Dict[str, int] = makeField(Hash(string_t, int_t), default={})
+
+
+def make_state() -> Dict[str, Player]:
+    return {
+        f'player{i}': Player(
+            name=f'player{i}', level=i % 50,
+            items=[Item(id=j, count=j * i % 7) for j in range(20)],
+            stats={f'stat{j}': j for j in range(10)},
+        )
+        for i in range(PLAYERS)
+    }
+
+
+def tick(state: Dict[str, Player]) -> Dict[str, Player]:
+    state = deepcopy(state)
+    for i, player in enumerate(state.values()):
+        if i % 10 == 0:
+            player.level += 1
+            player.items[3].count += 1
+        if i % 50 == 0:
+            player.items.append(Item(id=100, count=1))
+    return state
+
+
+def main():
+    before = make_state()
+    after = tick(before)
+    print(f'players: {PLAYERS}, changed: {PLAYERS // 10}')
+    for name, func in (('diff', lambda: diff(before, after)), ('diff_keys', lambda: diff_keys(before, after)), ('make_patch', lambda: make_patch(before, after))):
+        t = min(timeit.repeat(func, number=1, repeat=ROUNDS))
+        print(f'{name}: {t * 1000:.1f} ms')
+    patch = make_patch(before, after)
+    target = deepcopy(before)
+    t = timeit.timeit(lambda: apply_patch(target, patch), number=1)
+    print(f'apply_patch ({len(patch)} ops): {t * 1000:.2f} ms')
+    # the composing must scale linearly with the amount of the operations
+    later = tick(after)
+    for size in (PLAYERS // 4, PLAYERS // 2, PLAYERS):
+        names = list(before)[:size]
+        patches = [make_patch({n: s[n] for n in names}, {n: e[n] for n in names}) for s, e in ((before, after), (after, later))]
+        ops = sum(len(p) for p in patches)
+        t = min(timeit.repeat(lambda: compose_patches(*patches), number=1, repeat=ROUNDS))
+        print(f'compose_patches ({ops} ops): {t * 1000:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
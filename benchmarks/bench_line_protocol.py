@@ -0,0 +1,63 @@
+# -*- coding:utf-8 -*-
+"""LineProtocol incremental splitting against splitting the joined buffer on every chunk.
+
+Run from the repository root: python benchmarks/bench_line_protocol.py
+"""
+import timeit
+from asyncframework.net import LineProtocol, LineFormat
+
+
+CHUNK = 1024
+
+
+class Joined():
+    """The previous implementation: join the pending bytes with the chunk and split"""
+    delimiter = b'\n'
+
+    def __init__(self) -> None:
+        self._bufer = b''
+
+    def data_received(self, data: bytes):
+        lines = (self._bufer + data).split(self.delimiter)
+        self._bufer = lines.pop()
+        for line in lines:
+            self.on_line_received(line.decode())
+
+    def on_line_received(self, line):
+        pass
+
+
+class Incremental(LineProtocol):
+    def on_line_received(self, line):
+        pass
+
+
+def chunks(data: bytes):
+    return [data[i:i + CHUNK] for i in range(0, len(data), CHUNK)]
+
+
+def main():
+    cases = (
+        ('short lines', chunks(b'{"method": "ping", "id": 12345}\n' * 30000)),
+        ('1 MiB line', chunks(b'x' * (1 << 20) + b'\n')),
+    )
+    for name, data in cases:
+        def joined():
+            proto = Joined()
+            for chunk in data:
+                proto.data_received(chunk)
+
+        def incremental(line_format=LineFormat.STR):
+            proto = Incremental()
+            proto.line_format = line_format
+            for chunk in data:
+                proto.data_received(chunk)
+
+        t_joined = min(timeit.repeat(joined, number=1, repeat=3))
+        t_str = min(timeit.repeat(incremental, number=1, repeat=3))
+        t_view = min(timeit.repeat(lambda: incremental(LineFormat.MEMORYVIEW), number=1, repeat=3))
+        print(f'{name}: joined {t_joined * 1000:.1f} ms, bytearray {t_str * 1000:.1f} ms, memoryview lines {t_view * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+# -*- coding:utf-8 -*-
+"""Draws per second of `util.random` with the system and the fast generators
+and of the loot table with thousands of entries: bisect over the distribution vs `WeightedSampler`.
+
+Run from the repository root: python benchmarks/bench_random.py
+"""
+import timeit
+from asyncframework.util import random
+
+
+DRAWS = 200000
+EVENTS = ['common', 'rare', 'epic', 'legendary']
+DISTRIBUTION = random.get_distribution([0.7, 0.2, 0.08, 0.02])
+LOOT = [f'item{i}' for i in range(5000)]
+LOOT_WEIGHTS = [1 + i % 17 for i in range(5000)]
+
+
+def main():
+    for name, switch in (('SystemRandom', random.use_system_random), ('fast', random.use_fast_random)):
+        switch()
+        for func_name, func in (
+            ('roll', lambda: random.roll(0.5)),
+            ('rand32', random.rand32),
+            ('choice', lambda: random.choice(EVENTS)),
+            ('roll_event_distribution', lambda: random.roll_event_distribution(EVENTS, DISTRIBUTION)),
+        ):
+            t = min(timeit.repeat(func, number=DRAWS, repeat=3))
+            print(f'{name} {func_name}: {DRAWS / t / 1e6:.2f} M draws/s')
+    probabilities = random.normalize_probabilities(LOOT_WEIGHTS)
+    t = timeit.timeit(lambda: random.roll_event_probabilities(LOOT, probabilities), number=100)
+    print(f'roll_event_probabilities ({len(LOOT)} entries): {100 / t:.0f} draws/s')
+    sampler = random.WeightedSampler(LOOT, LOOT_WEIGHTS)
+    t = min(timeit.repeat(sampler.roll, number=DRAWS, repeat=3))
+    print(f'WeightedSampler.roll: {DRAWS / t / 1e6:.2f} M draws/s')
+    t = min(timeit.repeat(lambda: sampler.sample(DRAWS), number=1, repeat=3))
+    print(f'WeightedSampler.sample({DRAWS}): {DRAWS / t / 1e6:.2f} M draws/s (numpy: {random.numpy_imported})')
+    t = min(timeit.repeat(lambda: sampler.sample_unique(10), number=100, repeat=3))
+    print(f'WeightedSampler.sample_unique(10): {t * 10:.2f} ms')
+    random.use_system_random()
+
+
+if __name__ == '__main__':
+    main()
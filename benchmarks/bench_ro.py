@@ -0,0 +1,43 @@
+# -*- coding:utf-8 -*-
+"""Reading the nested structure through the `ReadOnly` proxy and through the `freeze` views.
+
+Run from the repository root: python benchmarks/bench_ro.py
+"""
+import timeit
+from asyncframework.util.ro import ReadOnly, freeze
+
+
+READS = 200000
+
+
+class Item():
+    def __init__(self, i: int) -> None:
+        self.number = i
+        self.tags = {'name': f'item{i}', 'weight': i % 7}
+        self.levels = list(range(10))
+
+
+class Root():
+    def __init__(self) -> None:
+        self.items = [Item(i) for i in range(100)]
+        self.options = {'speed': 1.5, 'names': ['a', 'b', 'c']}
+
+
+def read(root):
+    total = 0
+    for i in range(READS):
+        item = root.items[i % 100]
+        total += item.number + item.tags['weight'] + item.levels[5] + len(root.options['names'])
+    return total
+
+
+def main():
+    root = Root()
+    print(f'freeze: {timeit.timeit(lambda: freeze(root), number=10) / 10 * 1000:.2f} ms')
+    for name, view in (('plain', root), ('ReadOnly', ReadOnly.make_ro(root)), ('freeze', freeze(root))):
+        t = min(timeit.repeat(lambda: read(view), number=1, repeat=5))
+        print(f'{name}: {t / READS * 1e9:.0f} ns per read')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# -*- coding:utf-8 -*-
+"""RPC call round trip over the in-process loopback (with and without serialization) against a TCP socket.
+The loopback without serialization is the dispatching overhead of `RPC` itself.
+
+Run from the repository root: python benchmarks/bench_rpc_loopback.py
+"""
+import asyncio
+import time
+from asyncframework.net import LoopbackConnection, SocketConnection, SocketServer
+from asyncframework.rpc import RPC, RPCConnectionMixin, rpc_method
+
+
+COUNT = 5000
+
+
+@rpc_method()
+def bench_echo(app, msg, **kwargs):
+    return msg
+
+
+class RPCSocketConnection(RPCConnectionMixin, SocketConnection):
+    pass
+
+
+class RPCLoopbackConnection(RPCConnectionMixin, LoopbackConnection):
+    pass
+
+
+async def calls(rpc: RPC) -> float:
+    start = time.perf_counter()
+    for _ in range(COUNT):
+        await rpc.call('bench_echo', 'ping')
+    return time.perf_counter() - start
+
+
+async def loopback(cls: type, **kwargs) -> float:
+    client, server = await cls.open_pair(**kwargs)
+    RPC(None, server)
+    elapsed = await calls(RPC(None, client))
+    await client.close()
+    return elapsed
+
+
+async def socket() -> float:
+    def fabric():
+        sc = RPCSocketConnection()
+        RPC(None, sc)
+        return sc
+
+    srv = SocketServer(fabric, host='127.0.0.1', port=56801)
+    await srv.start()
+    serv_future = srv.run()
+    await asyncio.sleep(.1)
+    client = RPCSocketConnection()
+    rpc = RPC(None, client)
+    await client.connect_to('127.0.0.1', 56801)
+    elapsed = await calls(rpc)
+    await srv.stop()
+    await serv_future
+    return elapsed
+
+
+async def run():
+    results = [
+        ('loopback objects', await loopback(LoopbackConnection, transfers_objects=True)),
+        ('loopback json', await loopback(LoopbackConnection)),
+        ('loopback json + envelope', await loopback(RPCLoopbackConnection)),
+        ('tcp json + envelope', await socket()),
+    ]
+    for name, elapsed in results:
+        print(f'{name:<26} {elapsed / COUNT * 1e6:8.1f} us/call')
+
+
+def main():
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
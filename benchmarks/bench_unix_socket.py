@@ -0,0 +1,61 @@
+# -*- coding:utf-8 -*-
+"""Request-response round trip over TCP loopback against a Unix domain socket.
+
+Run from the repository root: python benchmarks/bench_unix_socket.py
+"""
+import os
+import asyncio
+import tempfile
+import time
+from asyncframework.net import SocketConnection, SocketServer
+
+
+COUNT = 5000
+
+
+async def round_trips(connect_kwargs: dict, server_kwargs: dict) -> float:
+    async def on_msg(src, msg: str, **kwargs):
+        await src.write(msg)
+
+    def fabric():
+        sc = SocketConnection(delimiter=b'\n')
+        sc.add_callbacks(on_message_received=on_msg)
+        return sc
+
+    replies: asyncio.Queue = asyncio.Queue()
+
+    async def on_reply(src, msg: str, **kwargs):
+        replies.put_nowait(msg)
+
+    srv = SocketServer(fabric, **server_kwargs)
+    await srv.start()
+    serv_future = srv.run()
+    await asyncio.sleep(.1)
+    client = SocketConnection(delimiter=b'\n')
+    client.add_callbacks(on_message_received=on_reply)
+    await client.connect_to(**connect_kwargs)
+    start = time.perf_counter()
+    for _ in range(COUNT):
+        await client.write('ping\n')
+        await replies.get()
+    elapsed = time.perf_counter() - start
+    await client.close()
+    await srv.stop()
+    await serv_future
+    return elapsed
+
+
+async def run():
+    t_tcp = await round_trips(dict(host='127.0.0.1', port=56800), dict(host='127.0.0.1', port=56800))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.sock')
+        t_unix = await round_trips(dict(path=path), dict(path=path))
+    print(f'round trip: tcp {t_tcp / COUNT * 1e6:.1f} us, unix {t_unix / COUNT * 1e6:.1f} us')
+
+
+def main():
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
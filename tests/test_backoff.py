@@ -0,0 +1,86 @@
+# -*- coding:utf-8 -*-
+import time
+import asyncio
+import unittest
+from asyncframework.net import Backoff, CircuitOpenError, ReconnectingStream, StaticPool
+
+
+class BackoffTestCase(unittest.TestCase):
+    def test_delays(self):
+        backoff = Backoff(base=0.1, cap=2.0)
+        delays = [backoff.next_delay() for _ in range(1000)]
+        self.assertTrue(all(0.1 <= delay <= 2.0 for delay in delays))
+        # jittered, not the fixed schedule
+        self.assertGreater(len(set(delays)), 100)
+        self.assertGreater(max(delays), 1.0)
+        backoff.on_success()
+        self.assertLessEqual(backoff.next_delay(), 0.3)
+        constant = Backoff.from_schedule(0.25)
+        self.assertEqual([constant.next_delay() for _ in range(3)], [0.25] * 3)
+        self.assertEqual((Backoff.from_schedule([0.5, 1, 60]).base, Backoff.from_schedule([0.5, 1, 60]).cap), (0.5, 60))
+
+    def test_circuit_breaker(self):
+        backoff = Backoff(base=0.0, cap=0.0, failure_threshold=2, open_time=0.05)
+        backoff.on_failure()
+        self.assertFalse(backoff.is_open)
+        backoff.on_failure()
+        self.assertTrue(backoff.is_open)
+        self.assertGreater(backoff.next_delay(), 0.0)
+        time.sleep(0.06)
+        self.assertFalse(backoff.is_open)
+        # the single failure after the circuit is half-open opens it again
+        backoff.on_failure()
+        self.assertTrue(backoff.is_open)
+        backoff.on_success()
+        self.assertEqual((backoff.is_open, backoff.failures), (False, 0))
+        copy = Backoff(failure_threshold=1).copy()
+        self.assertEqual(copy.failure_threshold, 1)
+
+    def test_check(self):
+        backoff = Backoff(failure_threshold=1, open_time=0.05)
+        backoff.check()
+        backoff.on_failure()
+        with self.assertRaises(CircuitOpenError) as ctx:
+            backoff.check()
+        self.assertGreater(ctx.exception.retry_after, 0.0)
+        self.assertIsInstance(ctx.exception, ConnectionError)
+        time.sleep(0.06)
+        backoff.check()
+
+    def test_copy_keeps_type(self):
+        class Custom(Backoff):
+            pass
+
+        copy = Custom(base=1, cap=2).copy()
+        self.assertIsInstance(copy, Custom)
+        self.assertEqual((copy.base, copy.cap), (1, 2))
+
+
+class FailingPool(StaticPool[object]):
+    backoff = Backoff(base=0.0, cap=0.0, failure_threshold=1, open_time=10)
+    acquire_repeat_cnt = 1
+
+    async def create(self) -> object:
+        raise ConnectionRefusedError()
+
+
+class CircuitOpenTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_pool_fails_fast(self):
+        pool = FailingPool(2)
+        with self.assertRaises(ConnectionRefusedError):
+            await pool.acquire()
+        with self.assertRaises(CircuitOpenError):
+            await pool.acquire()
+        await pool.stop()
+
+    async def test_stream_fails_fast(self):
+        class Stream(ReconnectingStream):
+            backoff = Backoff(base=0.0, cap=0.0, failure_threshold=1, open_time=10)
+
+        stream = Stream(host='127.0.0.1', port=56793, loop=asyncio.get_running_loop())
+        await stream.write(b'buffered')
+        stream._backoff.on_failure()
+        with self.assertRaises(CircuitOpenError):
+            await stream.write(b'refused')
+        self.assertEqual(stream.buffered, 8)
+        await stream.close()
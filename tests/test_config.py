@@ -1,11 +1,14 @@
 # -*- coding:utf-8 -*-
 import unittest, pickle
+import os, json, asyncio, tempfile
 from typing import Optional
 from packets import Packet, makeField
 from packets.typedef.string_t import string_t
 from packets.typedef.int_t import int_t
 from packets.typedef.bool_t import bool_t
-from asyncframework.app.config import Config, TableConfigReader, ConfigReader, configReader
+from asyncframework.app.config import Config, TableConfigReader, ConfigReader, configReader, clear_config_cache, ConfigWatcher, tableIndex
+from asyncframework.app.config.base import _parse_file, _parsed_files, publish_config_snapshot
+from asyncframework.util.shared_snapshot import SharedSnapshot
 
 
 
@@ -26,12 +29,38 @@ class RecordsConfigWithField(TableConfigReader[Record]):
     additional: bool = makeField(bool_t, required=True)
 
 
+class IndexedRecordsConfig(TableConfigReader[Record]):
+    __filename__ = 'tests/records.json'
+    __default_field__ = makeField(Record, required=True)
+    by_number = tableIndex('number', unique=True)
+    by_active = tableIndex('active')
+    ordered = tableIndex('number', sorted=True)
+
+
+class CachedRecordsConfig(TableConfigReader[Record]):
+    __default_field__ = makeField(Record, required=True)
+    __compiled_cache__ = True
+    by_number = tableIndex('number', unique=True)
+
+
+class LazyRecordsConfig(TableConfigReader[Record]):
+    __filename__ = 'tests/records_with_field.json'
+    __default_field__ = makeField(Record, required=True)
+    __lazy__ = True
+    additional: bool = makeField(bool_t, required=True)
+
+
 class SimpleConfig(ConfigReader):
     __filename__ = 'tests/simple.json'
     record: Record = makeField(Record, required=True)
     test: Optional[bool] = makeField(bool_t)
 
 
+class SnapshotConfig(ConfigReader):
+    record: Record = makeField(Record, required=True)
+    test: Optional[bool] = makeField(bool_t)
+
+
 class TConfig(Config):
     records = configReader(RecordsConfig)
 
@@ -74,3 +103,155 @@ class TestConfig(unittest.TestCase):
         c_pickled = pickle.loads(pickle.dumps(c, -1))
         self.assertHasAttr(c_pickled, 'test_call')
         self.assertEqual(c_pickled.test_call(), True)
+
+    def test_config_table_indexes(self):
+        c: IndexedRecordsConfig = IndexedRecordsConfig.load_cfg()
+        self.assertIs(c.by_number[2], c.record2)
+        self.assertIs(c.by_number.get(3), c.record3)
+        self.assertIsNone(c.by_number.get(4))
+        self.assertNotIn(4, c.by_number)
+        self.assertEqual(c.by_active.get(True), (c.record2, c.record3))
+        self.assertEqual(c.by_active.get(False), (c.record1,))
+        self.assertEqual(c.ordered.range(2), (c.record2, c.record3))
+        self.assertEqual(c.ordered.range(1, 3, include_hi=False), (c.record1, c.record2))
+        self.assertEqual(list(c.ordered), [c.record1, c.record2, c.record3])
+
+    def test_config_lazy_table(self):
+        c: LazyRecordsConfig = LazyRecordsConfig.load_cfg()
+        self.assertEqual(len(c), 2)
+        self.assertEqual(c.additional, True)
+        self.assertIn('recordwf1', c)
+        self.assertNotIn('recordwf3', c)
+        self.assertIsInstance(c.recordwf1, Record)
+        self.assertIs(c.recordwf1, c.recordwf1)
+        self.assertEqual(c.recordwf2.number, 256)
+        self.assertEqual(c.recordwf2.active, True)
+        self.assertIs(c.get('recordwf2'), c.recordwf2)
+        self.assertIsNone(c.get('recordwf3'))
+        with self.assertRaises(AttributeError):
+            c.recordwf3
+
+    def test_lazy_table_indexes(self):
+        with self.assertRaises(TypeError):
+            class LazyIndexedConfig(TableConfigReader[Record]):
+                __default_field__ = makeField(Record, required=True)
+                __lazy__ = True
+                by_number = tableIndex('number', unique=True)
+
+    def test_config_compiled_cache(self):
+        with tempfile.TemporaryDirectory() as path:
+            filename = os.path.join(path, 'records.json')
+            with open('tests/records.json') as src, open(filename, 'w') as dst:
+                dst.write(src.read())
+            CachedRecordsConfig.__filename__ = [filename]
+            cache_dir = os.path.join(path, 'cache')
+            CachedRecordsConfig.__compiled_cache_dir__ = cache_dir
+            c1: CachedRecordsConfig = CachedRecordsConfig.load_cfg()
+            self.assertEqual(os.stat(cache_dir).st_mode & 0o777, 0o700)
+            cache_files = os.listdir(cache_dir)
+            self.assertEqual(len(cache_files), 1)
+            self.assertEqual(os.stat(os.path.join(cache_dir, cache_files[0])).st_mode & 0o077, 0)
+            c2: CachedRecordsConfig = CachedRecordsConfig.load_cfg()
+            self.assertEqual(c2.record2.number, c1.record2.number)
+            self.assertIs(c2.by_number[3], c2.record3)
+            with open(filename, 'w') as f:
+                json.dump({'record4': {'name': 'test4', 'number': 4}}, f)
+            c3: CachedRecordsConfig = CachedRecordsConfig.load_cfg()
+            self.assertEqual(len(c3), 1)
+            self.assertEqual(c3.by_number[4].name, 'test4')
+            # the cache writable by others is not trusted
+            for fn in os.listdir(cache_dir):
+                os.unlink(os.path.join(cache_dir, fn))
+            os.chmod(cache_dir, 0o777)
+            c4: CachedRecordsConfig = CachedRecordsConfig.load_cfg()
+            self.assertEqual(c4.by_number[4].name, 'test4')
+            self.assertEqual(os.listdir(cache_dir), [])
+
+    def test_schema_fingerprint(self):
+        from asyncframework.app.config.base import _packet_types
+        found = {}
+        _packet_types(CachedRecordsConfig, found)
+        # the row type changes must invalidate the cache too
+        self.assertIn(Record, found)
+
+    def test_config_snapshot_same_filename(self):
+        published = publish_config_snapshot(SnapshotConfig, 'tests/simple.json')
+        try:
+            attached = SharedSnapshot.attach(published.name)
+            attached.activate()
+            clear_config_cache()
+            # the forked worker loads the config with the same file again
+            c: SnapshotConfig = SnapshotConfig.load_cfg('tests/simple.json')
+            self.assertEqual(SnapshotConfig.__filename__, ['tests/simple.json'])
+            # the files are not parsed, the snapshot is used
+            self.assertNotIn(os.path.abspath('tests/simple.json'), _parsed_files)
+            with open('tests/simple.json') as f:
+                self.assertEqual(c.record.name, json.load(f)['record']['name'])
+            attached.close()
+        finally:
+            published.unlink()
+
+    def test_config_parse_cache(self):
+        clear_config_cache()
+        c1: SimpleConfig = SimpleConfig.load_cfg()
+        data = _parse_file('tests/simple.json')
+        self.assertIs(_parse_file('tests/simple.json'), data)
+        c2: SimpleConfig = SimpleConfig.load_cfg()
+        self.assertEqual(c2.record.name, c1.record.name)
+        self.assertEqual(c2.record.number, c1.record.number)
+
+
+class ConfigWatcherTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_config_watcher(self):
+        with tempfile.TemporaryDirectory() as path:
+            filename = os.path.join(path, 'watched.json')
+            with open(filename, 'w') as f:
+                json.dump({'record': {'name': 'test', 'number': 1}}, f)
+
+            class WatchedConfig(ConfigReader):
+                __filename__ = filename
+                record: Record = makeField(Record, required=True)
+
+            changes = []
+            watcher = ConfigWatcher(WatchedConfig, poll_interval=0.05, use_inotify=False)
+            watcher.add_callback(lambda diff, config: changes.append(diff))
+            await watcher.start()
+            run_future = watcher.run()
+            self.assertEqual(watcher.config.record.number, 1)
+            with open(filename, 'w') as f:
+                json.dump({'record': {'name': 'test', 'number': 22}}, f)
+            await asyncio.sleep(0.3)
+            self.assertEqual(watcher.config.record.number, 22)
+            self.assertEqual(changes, [{'record': {'number': '1'}}])
+            await watcher.stop()
+            await run_future
+
+    async def test_lazy_table_watcher(self):
+        with tempfile.TemporaryDirectory() as path:
+            filename = os.path.join(path, 'lazy.json')
+            with open(filename, 'w') as f:
+                json.dump({'additional': True, 'r1': {'name': 'a', 'number': 1}, 'r2': {'name': 'b', 'number': 2}}, f)
+
+            class WatchedLazyConfig(TableConfigReader[Record]):
+                __filename__ = filename
+                __default_field__ = makeField(Record, required=True)
+                __lazy__ = True
+                additional: bool = makeField(bool_t, required=True)
+
+            class WatchedRootConfig(ConfigReader):
+                __filename__ = 'tests/dummy.json'
+                table = configReader(WatchedLazyConfig)
+
+            changes = []
+            watcher = ConfigWatcher(WatchedRootConfig, poll_interval=0.05, use_inotify=False)
+            watcher.add_callback(lambda diff, config: changes.append(diff), 'table')
+            await watcher.start()
+            run_future = watcher.run()
+            self.assertEqual(watcher.config.table.r2.number, 2)
+            with open(filename, 'w') as f:
+                json.dump({'additional': True, 'r2': {'name': 'b', 'number': 22}, 'r3': {'name': 'c', 'number': 3}}, f)
+            await asyncio.sleep(0.3)
+            self.assertEqual(watcher.config.table.r2.number, 22)
+            self.assertEqual(changes, [{'r1': '1', 'r2': {'number': '1'}, 'r3': '1'}])
+            await watcher.stop()
+            await run_future
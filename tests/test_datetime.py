@@ -0,0 +1,101 @@
+import os
+import time
+import unittest
+from datetime import datetime as _datetime, timedelta
+from asyncframework.util.datetime import datetime, buckets
+
+
+FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class TestDatetime(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(datetime.parse('2024-03-05 07:08:09'), _datetime(2024, 3, 5, 7, 8, 9))
+        self.assertEqual(datetime.parse('2024-3-5 7:8:9'), _datetime(2024, 3, 5, 7, 8, 9))
+        self.assertEqual(datetime.parse_date('2024-03-05'), _datetime(2024, 3, 5))
+        self.assertEqual(datetime.parse_time('07:08:09'), _datetime(1900, 1, 1, 7, 8, 9))
+        for wrong in ('2024-13-05 07:08:09', '2024-03-05T07:08:09', '2024-03-05 24:08:09'):
+            with self.assertRaises(ValueError):
+                datetime.parse(wrong)
+
+    def test_to_text(self):
+        dt = _datetime(2024, 3, 5, 7, 8, 9)
+        self.assertEqual(datetime.to_text(dt), dt.strftime(FORMAT))
+        self.assertEqual(datetime.to_date_text(dt), '2024-03-05')
+        self.assertEqual(datetime.to_time_text(dt.time()), '07:08:09')
+
+    @unittest.skipUnless(hasattr(time, 'tzset'), 'tzset is required')
+    def test_unixtime_dst(self):
+        tz = os.environ.get('TZ')
+        os.environ['TZ'] = 'Europe/Berlin'
+        time.tzset()
+        datetime.clear_cache()
+        try:
+            # DST switch days and the regular ones around
+            for ts in range(1711846800 - 86400 * 2, 1711846800 + 86400 * 2, 1800):
+                text = _datetime.fromtimestamp(ts).strftime(FORMAT)
+                self.assertEqual(datetime.unixtime_to_str(ts), text)
+                self.assertEqual(datetime.str_to_unixtime(text), int(time.mktime(_datetime.strptime(text, FORMAT).timetuple())))
+            texts = datetime.unixtimes_to_strs([0, 86400])
+            self.assertEqual(datetime.strs_to_unixtimes(texts), [0, 86400])
+        finally:
+            if tz is None:
+                del os.environ['TZ']
+            else:
+                os.environ['TZ'] = tz
+            time.tzset()
+            datetime.clear_cache()
+
+
+@unittest.skipUnless(hasattr(time, 'tzset'), 'tzset is required')
+class TestBuckets(unittest.TestCase):
+    def setUp(self):
+        self.tz = os.environ.get('TZ')
+        os.environ['TZ'] = 'Europe/Berlin'
+        time.tzset()
+        buckets.clear_cache()
+
+    def tearDown(self):
+        if self.tz is None:
+            del os.environ['TZ']
+        else:
+            os.environ['TZ'] = self.tz
+        time.tzset()
+        buckets.clear_cache()
+
+    def test_buckets(self):
+        # the DST switches of 2024 and the year end
+        timestamps = list(range(1711846800 - 86400 * 3, 1711846800 + 86400 * 3, 1799))
+        timestamps += list(range(1729990800 - 86400 * 3, 1729990800 + 86400 * 3, 1799))
+        timestamps += list(range(1735686000 - 86400 * 40, 1735686000 + 86400 * 3, 7777))
+        midnights = buckets.midnights(timestamps)
+        yesterdays = buckets.midnights(timestamps, -1)
+        week_starts = buckets.week_starts(timestamps)
+        month_starts = buckets.month_starts(timestamps)
+        month_ends = buckets.month_ends(timestamps)
+        for i, ts in enumerate(timestamps):
+            dt = _datetime.fromtimestamp(ts)
+            self.assertEqual(midnights[i], datetime.to_unixtime(datetime.midnight(ts)))
+            self.assertEqual(yesterdays[i], datetime.to_unixtime(datetime.midnight(ts, -1)))
+            self.assertEqual(week_starts[i], datetime.to_unixtime(datetime.week_start(dt)))
+            self.assertEqual(month_starts[i], datetime.to_unixtime(datetime.midnight(ts).replace(day=1)))
+            next_month = (dt.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0, second=0)
+            self.assertEqual(month_ends[i], datetime.to_unixtime(next_month) - 1)
+        self.assertEqual(buckets.midnights([]), [])
+
+    def test_transition_inside_step(self):
+        # 2001-10-28 00:01 the clocks went back to 2001-10-27 23:01, off the quarter hour
+        os.environ['TZ'] = 'America/St_Johns'
+        time.tzset()
+        buckets.clear_cache()
+        timestamps = [1004236260 + delta for delta in (-61, -1, 0, 60, 599, 3599, 3600)]
+        midnights = buckets.midnights(timestamps)
+        for i, ts in enumerate(timestamps):
+            self.assertEqual(midnights[i], datetime.to_unixtime(datetime.midnight(ts)))
+
+    def test_ambiguous_midnight(self):
+        # 2018-11-04 01:00 the clocks went back to 00:00, the midnight is the first one
+        os.environ['TZ'] = 'America/Havana'
+        time.tzset()
+        buckets.clear_cache()
+        self.assertEqual(buckets.midnights([1541304000, 1541307599, 1541311200, 1541340000]), [1541304000] * 4)
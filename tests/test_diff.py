@@ -1,4 +1,5 @@
 from typing import Optional, List
+import time
 import unittest
 from copy import deepcopy
 from packets import Packet, makeField
@@ -6,7 +7,7 @@ from packets.processors import Array
 from packets.typedef.int_t import int_t
 from packets.typedef.string_t import string_t
 from packets.typedef.float_t import float_t 
-from asyncframework.util.diff import diff
+from asyncframework.util.diff import diff, make_patch, apply_patch, compose_patches, PatchOp
 
 
 class Internal(Packet):
@@ -39,3 +40,54 @@ class TestPacketDiff(unittest.TestCase):
             pkt_diff = diff(pkt_snapshot, pkt)
             self.assertIsInstance(pkt_diff, dict)
             self.assertDictEqual(pkt_diff, {'a': 0, 'c': {'d': 8, 'e': 'test2', 'f': ['6']}}) # type: ignore
+
+    def test_packet_patch(self):
+        pkt = Front(a=10, b=4.0, c=Internal(e='test', f=['1', '2', '3', '4']))
+        pkt_snapshot = deepcopy(pkt)
+        pkt.a = 0
+        pkt.c.d = 8
+        pkt.c.f = ['1', '5', '3']
+        patch = make_patch(pkt_snapshot, pkt)
+        self.assertIn((PatchOp.SET, ('a', ), 0), patch)
+        self.assertIn((PatchOp.SEQ, ('c', 'f'), [(1, 2, ['5']), (3, 4, [])]), patch)
+        patched = apply_patch(deepcopy(pkt_snapshot), patch)
+        self.assertEqual(patched.a, 0)
+        self.assertEqual(patched.c.d, 8)
+        self.assertEqual(patched.c.f, ['1', '5', '3'])
+        self.assertIsNone(diff(pkt, patched))
+
+
+class TestDictPatch(unittest.TestCase):
+    def test_patch(self):
+        a = {'a': [1, 2, 3], 'b': {'c': 1, 'd': 2}}
+        b = {'a': [0, 1, 3], 'b': {'c': 1}, 'e': 5}
+        patch = make_patch(a, b)
+        self.assertEqual(apply_patch(deepcopy(a), patch), b)
+        self.assertEqual(make_patch(a, deepcopy(a)), [])
+        self.assertEqual(make_patch(a, b, max_depth=1), [(PatchOp.SET, ('e', ), 5), (PatchOp.SET, ('a', ), b['a']), (PatchOp.SET, ('b', ), b['b'])])
+
+    def test_compose(self):
+        a = {'a': [1, 2, 3], 'b': {'c': 1}}
+        b = {'a': [1, 3], 'b': {'c': 2}, 'd': 1}
+        c = {'a': [1, 3, 4], 'b': {'c': 3}}
+        patch = compose_patches(make_patch(a, b), make_patch(b, c))
+        self.assertEqual(apply_patch(deepcopy(a), patch), c)
+        self.assertEqual(len([op for op in patch if op[1] == ('b', 'c')]), 1)
+
+    def test_compose_many(self):
+        def state(n: int, tick: int) -> dict:
+            return {f'p{i}': {'level': tick + i % 3, 'items': [{'count': tick}] * (4 + (tick + i) % 2)} for i in range(n)}
+
+        for n in (100, 4000):
+            states = [state(n, tick) for tick in range(3)]
+            patches = [make_patch(a, b) for a, b in zip(states, states[1:])]
+            started = time.perf_counter()
+            patch = compose_patches(*patches)
+            elapsed = time.perf_counter() - started
+            self.assertEqual(apply_patch(deepcopy(states[0]), patch), states[-1])
+        # the quadratic composing took seconds here
+        self.assertLess(elapsed, 1.0)
+
+    def test_diff_depth(self):
+        self.assertEqual(diff({'a': {'b': 1, 'c': 2}}, {'a': {'b': 1, 'c': 3}}), {'a': {'c': 3}})
+        self.assertEqual(diff({'a': {'b': 1, 'c': 2}}, {'a': {'b': 1, 'c': 3}}, max_depth=1), {'a': {'b': 1, 'c': 3}})
@@ -0,0 +1,50 @@
+# -*- coding:utf-8 -*-
+import unittest
+from asyncframework.net import LineProtocol, LineFormat, LineOverflow
+
+
+class Transport():
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class Lines(LineProtocol):
+    delimiter = b'\r\n'
+
+    def __init__(self) -> None:
+        self.lines = []
+        self.connection_made(Transport())  # type: ignore
+
+    def on_line_received(self, line):
+        self.lines.append(bytes(line) if isinstance(line, memoryview) else line)
+
+
+class LineProtocolTestCase(unittest.TestCase):
+    def test_split(self):
+        proto = Lines()
+        for chunk in (b'ab', b'c\r', b'\nde\r\nf', b'\r', b'\n', b'\r\n'):
+            proto.data_received(chunk)
+        self.assertEqual(proto.lines, ['abc', 'de', 'f', ''])
+        proto.line_format = LineFormat.BYTES
+        proto.data_received('ж\r\n'.encode())
+        proto.line_format = LineFormat.MEMORYVIEW
+        proto.data_received(b'x\r\ny')
+        self.assertEqual(proto.lines[4:], ['ж'.encode(), b'x'])
+        self.assertEqual(proto._pending, [b'y'])
+
+    def test_overflow(self):
+        proto = Lines()
+        proto.max_line_length = 3
+        proto.line_overflow = LineOverflow.DISCARD
+        for chunk in (b'ok\r\n', b'too long', b' line\r', b'\nabc\r\nabcd\r\n', b'x\r', b'\n'):
+            proto.data_received(chunk)
+        self.assertEqual(proto.lines, ['ok', 'abc', 'x'])
+        self.assertFalse(proto.transport.closed)  # type: ignore
+        proto.line_overflow = LineOverflow.CLOSE
+        proto.data_received(b'abcd')
+        self.assertFalse(proto.transport.closed)  # type: ignore
+        # the incomplete line is too long even if it ends with the beginning of the delimiter
+        proto.data_received(b'e')
+        self.assertTrue(proto.transport.closed)  # type: ignore
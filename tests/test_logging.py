@@ -1,7 +1,10 @@
 from typing import Optional, List
 import unittest
+import logging
+import time
 from copy import deepcopy
-from asyncframework.log import LoggerTaggingAdapter, get_logger, LogFormatter, init_logging
+from decimal import Decimal
+from asyncframework.log import LoggerTaggingAdapter, get_logger, LogFormatter, init_logging, FloodFilter, LogAggregator, LogForwarder
 
 class TestLogging(unittest.TestCase):
     def test_logging(self):
@@ -20,3 +23,86 @@ class TestLogging(unittest.TestCase):
         log_adapted_adapted.tags['SomeString'] = 'text'
         log_adapted_adapted.info('Tagged tagged log')
         log_adapted.info('Should be no SomeString')
+
+
+class TestFloodFilter(unittest.TestCase):
+    def test_flood_filter(self):
+        flt = FloodFilter({None: 3}, period=60)
+        def record(msg, *args):
+            return logging.LogRecord('flood', logging.ERROR, __file__, 1, msg, args, None)
+        passed = [flt.filter(record('Error in request %s', i)) for i in range(10)]
+        self.assertEqual(passed, [True] * 3 + [False] * 7)
+        self.assertTrue(flt.filter(record('Another error %s', 1)))
+        flt.period = 0
+        rec = record('Error in request %s', 11)
+        passed = flt.filter(rec)
+        self.assertTrue(passed)
+        if isinstance(passed, logging.LogRecord):
+            rec = passed
+        # the message itself is not changed for the other handlers
+        self.assertEqual(rec.getMessage(), 'Error in request 11')
+        self.assertEqual(LogFormatter('%(message)s').format(rec), 'Error in request 11 [7 similar messages suppressed]')
+        flt.close()
+
+    def test_flood_summary(self):
+        class ListHandler(logging.Handler):
+            def __init__(self):
+                super().__init__()
+                self.messages = []
+
+            def emit(self, record):
+                self.messages.append(self.format(record))
+
+        handler = ListHandler()
+        handler.setFormatter(LogFormatter('%(message)s'))
+        flt = FloodFilter({None: 1}, period=0.05, handler=handler)
+        handler.addFilter(flt)
+        logger = logging.Logger('flood')
+        logger.addHandler(handler)
+        for i in range(5):
+            logger.error('Burst %s', i)
+        self.assertEqual(handler.messages, ['Burst 0'])
+        # the burst stops, the summary is written by the timer
+        for _ in range(50):
+            if len(handler.messages) > 1:
+                break
+            time.sleep(0.01)
+        self.assertEqual(handler.messages, ['Burst 0', 'Burst 4 [3 similar messages suppressed]'])
+        flt.close()
+
+    def test_flood_filter_per_logger(self):
+        flt = FloodFilter({'limited': 1, 'limited.unlimited': 0}, period=60)
+        def record(name):
+            return logging.LogRecord(name, logging.ERROR, __file__, 1, 'Error', None, None)
+        self.assertEqual([flt.filter(record('limited.child')) for _ in range(3)], [True, False, False])
+        self.assertEqual([flt.filter(record('limited.unlimited')) for _ in range(3)], [True, True, True])
+        self.assertEqual([flt.filter(record('other')) for _ in range(3)], [True, True, True])
+
+
+class TestLogAggregator(unittest.TestCase):
+    def test_aggregator(self):
+        class ListHandler(logging.Handler):
+            def __init__(self):
+                super().__init__()
+                self.messages = []
+
+            def emit(self, record):
+                self.messages.append(self.format(record))
+
+        handler = ListHandler()
+        aggregator = LogAggregator([handler])
+        aggregator.start()
+        forwarder = LogForwarder(aggregator.queue)
+        logger = logging.Logger('aggregated')
+        logger.addHandler(forwarder)
+        logger.info('Record %s', 1)
+        logger.info('Price %.2f of %d', Decimal('1.5'), Decimal(3))
+        try:
+            raise RuntimeError('fail')
+        except RuntimeError:
+            logger.exception('Failed %s', 'request')
+        aggregator.stop()
+        self.assertEqual(handler.messages[0], 'Record 1')
+        self.assertEqual(handler.messages[1], 'Price 1.50 of 3')
+        self.assertTrue(handler.messages[2].startswith('Failed request\nTraceback'))
+        self.assertIn('RuntimeError: fail', handler.messages[2])
@@ -0,0 +1,95 @@
+# -*- coding:utf-8 -*-
+import unittest
+import asyncio
+from asyncframework.net import LoopbackConnection, LoopbackServer, ConnectionLimitPolicy
+
+
+class LoopbackTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_pair(self):
+        received = []
+        lost = asyncio.Future()
+
+        async def on_msg(src, msg, **kwargs):
+            received.append((msg, kwargs))
+
+        async def on_lost(exc):
+            lost.set_result(exc)
+
+        a, b = await LoopbackConnection.open_pair()
+        b.add_callbacks(on_message_received=on_msg, on_connection_lost=on_lost)
+        self.assertTrue(a.is_connected and b.is_connected)
+        self.assertIs(a.peer, b)
+        await a.write('hello', type='request', correlation_id='1')
+        with self.assertRaises(TypeError):
+            await a.write({'not': 'str'})
+        await a.close()
+        # the written messages are received before the connection is lost
+        self.assertIsInstance(await lost, ConnectionResetError)
+        self.assertEqual(received, [('hello', {'msg_type': 'request', 'correlation_id': '1'})])
+        await asyncio.sleep(0)
+        self.assertFalse(b.is_connected)
+        with self.assertRaises(ConnectionError):
+            await b.write('late')
+
+    async def test_objects_and_backpressure(self):
+        received = []
+        a, b = await LoopbackConnection.open_pair(transfers_objects=True, queue_size=1)
+        b.add_callbacks(on_message_received=lambda src, msg: received.append(msg))
+        obj = {'key': [1, 2]}
+        self.assertIsNone(a.write_nowait(b'first'))
+        pending = a.write_nowait(b'second')
+        self.assertIsNotNone(pending)
+        await pending
+        await a.write(obj)
+        await asyncio.sleep(0.05)
+        self.assertEqual(received[:2], ['first', 'second'])
+        self.assertIs(received[2], obj)
+        await a.close()
+
+    async def test_server(self):
+        server_side = []
+
+        def fabric():
+            conn = LoopbackConnection()
+            server_side.append(conn)
+            return conn
+
+        srv = LoopbackServer(fabric, max_connections=1)
+        srv.connection_limit_policy = ConnectionLimitPolicy.REJECT
+        client = LoopbackConnection()
+        with self.assertRaises(ConnectionRefusedError):
+            await client.connect_to(srv)
+        await srv.start()
+        serv_future = srv.run()
+        await asyncio.sleep(0)
+        await client.connect_to(srv)
+        self.assertIs(client.peer, server_side[0])
+        self.assertEqual(len(srv.client_pool), 1)
+        with self.assertRaises(ConnectionRefusedError):
+            await LoopbackConnection().connect_to(srv)
+        self.assertEqual(await srv.broadcast('ping'), 1)
+        await srv.stop()
+        await serv_future
+        await asyncio.sleep(0)
+        self.assertFalse(client.is_connected)
+        self.assertEqual(len(srv.client_pool), 0)
+
+    async def test_stop_rejects_waiting(self):
+        srv = LoopbackServer(lambda: LoopbackConnection(), max_connections=1)
+        await srv.start()
+        serv_future = srv.run()
+        await asyncio.sleep(0)
+        first = LoopbackConnection()
+        await first.connect_to(srv)
+        # waits for the slot taken by the first one
+        second = LoopbackConnection()
+        waiting = asyncio.ensure_future(second.connect_to(srv))
+        await asyncio.sleep(0.01)
+        self.assertFalse(waiting.done())
+        await srv.stop()
+        await serv_future
+        with self.assertRaises(ConnectionRefusedError):
+            await waiting
+        await asyncio.sleep(0)
+        self.assertFalse(second.is_connected)
+        self.assertEqual(len(srv.client_pool), 0)
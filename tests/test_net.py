@@ -1,8 +1,15 @@
 # -*- coding:utf-8 -*-
+import os
+import sys
+import socket
+import tempfile
 import unittest
 import asyncio
 from asyncframework.net import SocketConnection
 from asyncframework.net import SocketServer
+from asyncframework.net import ReconnectingStream
+from asyncframework.net import IdleSweeper
+from asyncframework.net import ConnectionLimitPolicy
 
 
 class NetTestCase(unittest.IsolatedAsyncioTestCase):
@@ -47,3 +54,225 @@ class NetTestCase(unittest.IsolatedAsyncioTestCase):
         await serv_future
 
 
+
+
+
+class ReconnectingStreamTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_buffering(self):
+        received = asyncio.Queue()
+
+        async def on_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            received.put_nowait(await reader.readexactly(5))
+            writer.close()
+
+        class Stream(ReconnectingStream):
+            reconnect_timeout = 0.01
+            buffer_max_bytes = 6
+
+        stream = Stream(host='127.0.0.1', port=56790, loop=asyncio.get_running_loop())
+        # buffered before the connection, the oldest data is dropped
+        await stream.write(b'ab')
+        await stream.write(b'cd')
+        await stream.write(b'efg')
+        self.assertEqual((stream.buffered, stream.buffer_dropped), (5, 2))
+        srv = await asyncio.start_server(on_client, '127.0.0.1', 56790)
+        await stream.connect()
+        self.assertEqual(await received.get(), b'cdefg')
+        # the server closed the connection, the writes are buffered until reconnected
+        while not stream._connection_lost:
+            await asyncio.sleep(0.001)
+        await stream.write(b'hello')
+        self.assertEqual(await asyncio.wait_for(received.get(), 1), b'hello')
+        self.assertEqual(stream.buffered, 0)
+        await stream.close()
+        srv.close()
+        await srv.wait_closed()
+
+    async def test_deferred_ready(self):
+        received = asyncio.Queue()
+
+        async def on_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            received.put_nowait(await reader.readexactly(10))
+            writer.close()
+
+        class Stream(ReconnectingStream):
+            reconnect_timeout = 0.01
+            defer_ready = True
+            readied = 0
+
+            def connection_made(self, transport):
+                super().connection_made(transport)
+                transport.write(b'auth:')  # type: ignore
+                self.loop.call_soon(self.ready)
+
+            def on_ready(self):
+                self.readied += 1
+
+        stream = Stream(host='127.0.0.1', port=56792, loop=asyncio.get_running_loop())
+        await stream.write(b'da')
+        srv = await asyncio.start_server(on_client, '127.0.0.1', 56792)
+        await stream.connect()
+        # written during the handshake, buffered too
+        await stream.write(b'ta')
+        await asyncio.sleep(0.01)
+        await stream.write(b'!')
+        self.assertEqual(await asyncio.wait_for(received.get(), 1), b'auth:data!')
+        self.assertEqual(stream.readied, 1)
+        await stream.close()
+        srv.close()
+        await srv.wait_closed()
+
+
+class IdleTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_idle_timeout(self):
+        lost = asyncio.Future()
+
+        class ServerConnection(SocketConnection):
+            idle_timeout = 0.2
+            heartbeat_message = 'hb'  # the delimiter is appended
+
+        class ClientConnection(SocketConnection):
+            heartbeat_interval = 0.05
+            heartbeat_message = 'hb\n'
+
+        def fabric():
+            return ServerConnection(delimiter=b'\n')
+
+        class Server(SocketServer):
+            sweep_interval = 0.02
+
+        srv = Server(fabric, host='127.0.0.1', port=56791)
+        await srv.start()
+        serv_future = srv.run()
+        await asyncio.sleep(.1)
+        async def on_lost(exc: Exception):
+            if not lost.done():
+                lost.set_result(exc)
+
+        client = ClientConnection(delimiter=b'\n')
+        client.add_callbacks(on_connection_lost=on_lost)
+        sweeper = IdleSweeper(0.02)
+        sweeper.add(client)
+        await client.connect_to('127.0.0.1', 56791)
+        # the heartbeats keep the connection alive
+        await asyncio.sleep(0.4)
+        self.assertEqual(len(srv.client_pool), 1)
+        self.assertFalse(lost.done())
+        await sweeper.stop()
+        # the silent client is dropped by the server
+        await asyncio.wait_for(lost, 1)
+        await asyncio.sleep(0.01)
+        self.assertEqual(len(srv.client_pool), 0)
+        await client.close()
+        await srv.stop()
+        await serv_future
+
+    async def test_heartbeat_with_mixin_write(self):
+        received = asyncio.Queue()
+
+        async def on_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            received.put_nowait(await reader.readline())
+            writer.close()
+
+        class TypedWriteMixin:
+            # the same signature as `RPCConnectionMixin.write`
+            async def write(self, msg: str, type: str, **kwargs):
+                await super().write(f'{type}:{msg}')  # type: ignore
+
+        class ClientConnection(TypedWriteMixin, SocketConnection):
+            heartbeat_message = 'hb'
+
+        srv = await asyncio.start_server(on_client, '127.0.0.1', 56794)
+        client = ClientConnection(delimiter=b'\n')
+        await client.connect_to('127.0.0.1', 56794)
+        await client.send_heartbeat()
+        self.assertEqual(await asyncio.wait_for(received.get(), 1), b'hb\n')
+        await client.close()
+        srv.close()
+        await srv.wait_closed()
+
+
+class ServerLimitsTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_limits_and_broadcast(self):
+        received = asyncio.Queue()
+
+        async def on_msg(src, msg: str, **kwargs):
+            received.put_nowait(msg)
+
+        srv = SocketServer(lambda: SocketConnection(), host='127.0.0.1', port=56793, max_connections=2)
+        srv.connection_limit_policy = ConnectionLimitPolicy.REJECT
+        await srv.start()
+        serv_future = srv.run()
+        await asyncio.sleep(.1)
+        clients = []
+        for _ in range(3):
+            client = SocketConnection()
+            client.add_callbacks(on_message_received=on_msg)
+            await client.connect_to('127.0.0.1', 56793)
+            clients.append(client)
+        await asyncio.sleep(.1)
+        # the third one is rejected
+        self.assertEqual(len(srv.client_pool), 2)
+        self.assertEqual(await srv.broadcast('hello'), 2)
+        self.assertEqual([await received.get(), await received.get()], ['hello', 'hello'])
+        await clients[0].close()
+        await asyncio.sleep(.1)
+        self.assertEqual(len(srv.client_pool), 1)
+        for client in clients[1:]:
+            await client.close()
+        await srv.stop()
+        await serv_future
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'Unix domain sockets are required')
+class UnixSocketTestCase(unittest.IsolatedAsyncioTestCase):
+    async def _echo(self, path: str, **kwargs):
+        received = asyncio.Future()
+
+        async def on_msg(src, msg: str, **kwargs):
+            await src.write(msg)
+
+        async def on_client_msg(src, msg: str, **kwargs):
+            received.set_result(msg)
+
+        def fabric():
+            sc = SocketConnection()
+            sc.add_callbacks(on_message_received=on_msg)
+            return sc
+
+        srv = SocketServer(fabric, path=path, **kwargs)
+        await srv.start()
+        serv_future = srv.run()
+        await asyncio.sleep(.1)
+        client = SocketConnection()
+        client.add_callbacks(on_message_received=on_client_msg)
+        await client.connect_to(path=path)
+        self.assertEqual(client.host, path)
+        await client.write('test')
+        self.assertEqual(await asyncio.wait_for(received, 1), 'test')
+        await client.close()
+        await srv.stop()
+        await serv_future
+
+    async def test_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'test.sock')
+            await self._echo(path, permissions=0o600)
+            self.assertFalse(os.path.exists(path))
+
+    async def test_permissions_before_listen(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'test.sock')
+            # the stale socket file is replaced
+            stale = socket.socket(socket.AF_UNIX)
+            stale.bind(path)
+            stale.close()
+            srv = SocketServer(lambda: SocketConnection(), path=path, permissions=0o600)
+            await srv.start()
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+            await srv.stop()
+            self.assertFalse(os.path.exists(path))
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'abstract namespace is Linux only')
+    async def test_abstract(self):
+        await self._echo(f'\0asyncframework-test-{os.getpid()}')
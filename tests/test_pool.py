@@ -0,0 +1,198 @@
+# -*- coding:utf-8 -*-
+import unittest
+import asyncio
+from asyncframework.net import DynamicPool, StaticPool
+
+
+class Conn():
+    def __init__(self, num: int) -> None:
+        self.num = num
+        self.closed = False
+
+
+class ConnPool(DynamicPool[Conn]):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.counter = 0
+
+    async def create(self) -> Conn:
+        self.counter += 1
+        await asyncio.sleep(0)
+        return Conn(self.counter)
+
+    async def destroy(self, elem: Conn) -> None:
+        elem.closed = True
+
+
+class DynamicPoolTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_exclusive(self):
+        pool = ConnPool(max_size=2)
+        async with pool.acquire() as a:
+            b = await pool.acquire()
+            self.assertIsNot(a, b)
+            with self.assertRaises(TimeoutError):
+                await pool.acquire(timeout=0.01)
+            await pool.release(b)
+            async with pool.acquire() as c:
+                self.assertIs(c, b)
+        stats = pool.stats()
+        self.assertEqual((stats.size, stats.in_use, stats.idle, stats.waiters), (2, 0, 2, 0))
+        self.assertEqual((stats.acquired, stats.timeouts, stats.created), (3, 1, 2))
+        self.assertEqual(sum(stats.wait_histogram), 3)
+        await pool.stop()
+        self.assertTrue(a.closed and b.closed)
+
+    async def test_fair_queue(self):
+        pool = ConnPool(max_size=1)
+        first = await pool.acquire()
+        order = []
+
+        async def user(num: int):
+            async with pool.acquire() as conn:
+                order.append(num)
+                await asyncio.sleep(0)
+                self.assertIs(conn, first)
+
+        users = [asyncio.create_task(user(i)) for i in range(5)]
+        await asyncio.sleep(0.01)
+        self.assertEqual(pool.stats().waiters, 5)
+        await pool.release(first)
+        await asyncio.gather(*users)
+        self.assertEqual(order, list(range(5)))
+        await pool.stop()
+
+    async def test_discard_and_eviction(self):
+        pool = ConnPool(min_size=1, max_size=3, max_idle_time=0.01, max_lifetime=10)
+        await pool.start()
+        self.assertEqual(pool.size, 1)
+        conns = [await pool.acquire() for _ in range(3)]
+        waiter = asyncio.ensure_future(pool.acquire())
+        await asyncio.sleep(0)
+        # the discarded element makes room for the waiter
+        await pool.release(conns[0], discard=True)
+        self.assertTrue(conns[0].closed)
+        conn = await waiter
+        self.assertEqual(conn.num, 4)
+        for conn in (conn, *conns[1:]):
+            await pool.release(conn)
+        await asyncio.sleep(0.02)
+        await pool.evict()
+        self.assertEqual(pool.stats().idle, 1)
+        with self.assertRaises(ValueError):
+            await pool.release(conns[1])
+        await pool.stop()
+        with self.assertRaises(RuntimeError):
+            await pool.acquire()
+
+    async def test_expired_wakes_waiters(self):
+        pool = SlowDestroyPool(max_size=1, max_lifetime=0.01)
+        first = await pool.acquire()
+        await pool.release(first)
+        await asyncio.sleep(0.02)
+        # the expired element is destroyed slowly, the second user queues meanwhile
+        taking = asyncio.ensure_future(pool.acquire(timeout=1))
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(pool.acquire(timeout=1))
+        # the freed slot goes to the queued user first
+        conn = await waiting
+        self.assertTrue(first.closed)
+        self.assertFalse(taking.done())
+        await pool.release(conn)
+        self.assertIs(await taking, conn)
+        self.assertEqual(pool.size, 1)
+        await pool.stop()
+
+    async def test_evict_wakes_waiters(self):
+        pool = SlowDestroyPool(max_size=1, max_lifetime=0.01)
+        first = await pool.acquire()
+        await pool.release(first)
+        await asyncio.sleep(0.02)
+        evicting = asyncio.ensure_future(pool.evict())
+        await asyncio.sleep(0)
+        conn = await pool.acquire(timeout=1)
+        await evicting
+        self.assertIsNot(conn, first)
+        self.assertEqual(pool.size, 1)
+        await pool.release(conn)
+        await pool.stop()
+
+    async def test_cancel_during_destroy(self):
+        pool = SlowDestroyPool(max_size=1, max_lifetime=0.01)
+        first = await pool.acquire()
+        await pool.release(first)
+        await asyncio.sleep(0.02)
+        # cancelled while the expired element is destroyed, the slot is still returned
+        taking = asyncio.ensure_future(pool.acquire(timeout=1))
+        await asyncio.sleep(0)
+        taking.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await taking
+        self.assertEqual(pool.size, 0)
+        conn = await pool.acquire(timeout=0.1)
+        self.assertIsNot(conn, first)
+        await pool.release(conn)
+        await pool.stop()
+
+    async def test_cancel_evict(self):
+        pool = SlowDestroyPool(max_size=2, max_lifetime=0.01)
+        first, second = await pool.acquire(), await pool.acquire()
+        await pool.release(first)
+        await pool.release(second)
+        await asyncio.sleep(0.02)
+        evicting = asyncio.ensure_future(pool.evict())
+        await asyncio.sleep(0)
+        evicting.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await evicting
+        # the slot of the interrupted destroy is freed, the other element is evicted later
+        self.assertEqual(pool.size, 1)
+        await pool.evict()
+        self.assertEqual(pool.size, 0)
+        self.assertTrue(second.closed)
+        await pool.stop()
+
+class SlowDestroyPool(ConnPool):
+    async def destroy(self, elem: Conn) -> None:
+        await asyncio.sleep(0.01)
+        elem.closed = True
+
+
+class Static(StaticPool[Conn]):
+    health_check_interval = 0.01
+
+    def __init__(self, pool_size: int):
+        super().__init__(pool_size)
+        self.counter = 0
+
+    async def create(self) -> Conn:
+        self.counter += 1
+        conn = Conn(self.counter)
+        await asyncio.sleep(0.01)
+        return conn
+
+    async def is_alive(self, elem: Conn) -> bool:
+        return not elem.closed
+
+    async def destroy(self, elem: Conn) -> None:
+        elem.closed = True
+
+
+class StaticPoolTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_single_flight(self):
+        pool = Static(2)
+        conns = await asyncio.gather(*(pool.acquire() for _ in range(10)))
+        self.assertEqual(pool.counter, 2)
+        self.assertEqual({conn.num for conn in conns}, {1, 2})
+        await pool.stop()
+
+    async def test_health_check(self):
+        pool = Static(3)
+        await pool.warm_up()
+        self.assertEqual(pool.counter, 3)
+        dead = pool.queue[1]
+        dead.closed = True
+        await asyncio.sleep(0.05)
+        self.assertEqual(pool.counter, 4)
+        self.assertEqual([conn.num for conn in pool.queue], [1, 4, 3])
+        await pool.stop()
+        self.assertEqual(pool.queue, [None] * 3)
@@ -0,0 +1,77 @@
+import os
+import unittest
+from asyncframework.util import random
+
+
+class TestRandom(unittest.TestCase):
+    def tearDown(self) -> None:
+        random.use_system_random()
+
+    def test_fast_random(self):
+        random.use_fast_random(42)
+        first = [random.rand32() for _ in range(10)]
+        random.reseed(42)
+        self.assertEqual([random.rand32() for _ in range(10)], first)
+        self.assertTrue(all(-2 ** 31 <= v < 2 ** 31 for v in first))
+        self.assertIn(random.choice([1, 2, 3]), [1, 2, 3])
+        self.assertIs(random.roll(1.0), True)
+        self.assertIs(random.roll(0.0), False)
+        self.assertIsInstance(random.secure_random, random.SystemRandom)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'fork is required')
+    def test_reseed_after_fork(self):
+        random.use_fast_random(42)
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            os.write(write_fd, str(random.rand32()).encode())
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as f:
+            child_value = int(f.read())
+        os.waitpid(pid, 0)
+        self.assertNotEqual(child_value, random.rand32())
+
+    def test_fast_random_enabled(self):
+        self.assertFalse(random.fast_random_enabled())
+        random.use_fast_random()
+        self.assertTrue(random.fast_random_enabled())
+        random.use_system_random()
+        self.assertFalse(random.fast_random_enabled())
+
+    def test_distribution(self):
+        self.assertEqual(random.get_distribution([0.5, 0.25, 0.25]), [0.5, 0.75, 1.0])
+        with self.assertRaises(ValueError):
+            random.get_distribution([0.5, 0.6])
+
+
+class TestWeightedSampler(unittest.TestCase):
+    def setUp(self) -> None:
+        random.use_fast_random(1)
+
+    def tearDown(self) -> None:
+        random.use_system_random()
+
+    def test_roll(self):
+        sampler = random.WeightedSampler(['a', 'b', 'c', 'd'], [6, 3, 1, 0])
+        counts = {'a': 0, 'b': 0, 'c': 0, 'd': 0}
+        for event in sampler.sample(20000):
+            counts[event] += 1
+        self.assertEqual(counts['d'], 0)
+        self.assertAlmostEqual(counts['a'] / 20000, 0.6, delta=0.02)
+        self.assertAlmostEqual(counts['b'] / 20000, 0.3, delta=0.02)
+        self.assertIn(sampler.roll(), ['a', 'b', 'c'])
+
+    def test_sample_unique(self):
+        sampler = random.WeightedSampler(['a', 'b', 'c', 'd'], [6, 3, 1, 0])
+        drawn = sampler.sample_unique(3)
+        self.assertEqual(sorted(drawn), ['a', 'b', 'c'])
+        with self.assertRaises(ValueError):
+            sampler.sample_unique(4)
+
+    def test_wrong_weights(self):
+        with self.assertRaises(ValueError):
+            random.WeightedSampler(['a'], [-1])
+        with self.assertRaises(ValueError):
+            random.WeightedSampler(['a', 'b'], [1])
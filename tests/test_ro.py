@@ -1,5 +1,6 @@
+import pickle
 import unittest
-from asyncframework.util.ro import ReadOnly
+from asyncframework.util.ro import ReadOnly, FrozenDict, FrozenList, freeze
 
 class InternalToReadonly():
     d: int = 2
@@ -29,3 +30,112 @@ class TestROClass(unittest.TestCase):
         a = 5
         self.assertEqual(a, 5)
         self.assertEqual(readonlyclass.a, 0)
+
+
+class TestFreeze(unittest.TestCase):
+    def test_freeze_object(self):
+        frozen = freeze(ToBeReadonly())
+        self.assertIsInstance(frozen, ToBeReadonly)
+        self.assertEqual(frozen.a, 0)
+        self.assertEqual(frozen.c.d, 2)
+        self.assertIs(frozen.c, frozen.c)
+        with self.assertRaises(RuntimeError):
+            frozen.a = 10
+        with self.assertRaises(RuntimeError):
+            frozen.c.d = 2
+        with self.assertRaises(AttributeError):
+            frozen.c.g # type: ignore # Showcase for undefined members
+
+    def test_freeze_containers(self):
+        shared = {'x': 1}
+        frozen = freeze({'a': [1, 2, shared], 'b': shared, 'c': {3}})
+        self.assertIsInstance(frozen, FrozenDict)
+        self.assertEqual(frozen['a'], (1, 2, {'x': 1}))
+        self.assertIs(frozen['a'][2], frozen['b'])
+        self.assertEqual(frozen['c'], frozenset({3}))
+        self.assertEqual(frozen.get('d', 4), 4)
+        with self.assertRaises(RuntimeError):
+            frozen['b']['x'] = 2
+        with self.assertRaises(RuntimeError):
+            frozen.setdefault('d', 4)
+        self.assertIs(freeze(frozen), frozen)
+
+    def test_freeze_view_protocol(self):
+        class Container():
+            n: int = 1
+
+            def __init__(self):
+                self.items = {'a': [1, 2]}
+
+            def get(self, name):
+                return getattr(self, name)
+
+            def __getitem__(self, name):
+                return getattr(self, name)
+
+            def __iter__(self):
+                return iter(('n', 'items'))
+
+            def __len__(self):
+                return 2
+
+            def __contains__(self, name):
+                return name in ('n', 'items')
+
+        origin = Container()
+        frozen = freeze(origin)
+        self.assertEqual(frozen['n'], 1)
+        self.assertIs(frozen['items'], frozen.items)
+        self.assertEqual(len(frozen), 2)
+        self.assertEqual(list(frozen), ['n', 'items'])
+        self.assertIn('items', frozen)
+        with self.assertRaises(AttributeError):
+            frozen.get('items')['a'].append(3)
+        self.assertEqual(origin.items, {'a': [1, 2]})
+        with self.assertRaises(RuntimeError):
+            frozen['n'] = 2
+
+    def test_freeze_view_snapshot(self):
+        class Bag():
+            def __init__(self):
+                self.items = [1, 2]
+
+            def __iter__(self):
+                return iter(self.items)
+
+            def __len__(self):
+                return len(self.items)
+
+        origin = Bag()
+        frozen = freeze(origin)
+        origin.items.append(3)
+        # every accessor shows the state of the freeze
+        self.assertEqual(frozen.items, (1, 2))
+        self.assertEqual(len(frozen), 2)
+        self.assertEqual(list(frozen), [1, 2])
+        self.assertNotIn(3, frozen)
+        with self.assertRaises(KeyError):
+            frozen[0]
+
+    def test_frozen_reinit(self):
+        frozen = freeze({'a': 1, 'l': [[1]]})
+        with self.assertRaises(RuntimeError):
+            frozen.__init__({'b': 2})
+        self.assertEqual(frozen, {'a': 1, 'l': ((1, ), )})
+        looped = [1]
+        looped.append(looped)
+        frozen_list = freeze(looped)
+        with self.assertRaises(RuntimeError):
+            frozen_list.__init__([2])
+        self.assertEqual(frozen_list[0], 1)
+        self.assertEqual(pickle.loads(pickle.dumps(frozen)), frozen)
+
+    def test_freeze_recursive(self):
+        looped = [1]
+        looped.append(looped)
+        frozen = freeze({'looped': looped, 'plain': [1, [2]]})
+        self.assertIsInstance(frozen['looped'], FrozenList)
+        self.assertIs(frozen['looped'][1], frozen['looped'])
+        self.assertEqual(frozen['plain'], (1, (2, )))
+        with self.assertRaises(RuntimeError):
+            frozen['looped'].append(2)
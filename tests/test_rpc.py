@@ -1,11 +1,13 @@
 # -*- coding:utf-8 -*-
 import unittest
 import asyncio
+from base64 import b64encode
 from asyncframework.net import SocketConnection
-from asyncframework.net import SocketServer
-from asyncframework.rpc import RPC, rpc_method, RPCConnectionMixin
+from asyncframework.net import SocketServer, LoopbackConnection
+from asyncframework.rpc import RPC, rpc_method, RPCConnectionMixin, ZlibCodec
 from asyncframework.rpc.types import RPCException
 from asyncframework.rpc.packets import RPCPackets, rpc_packet
+from asyncframework.rpc.rpc_connection import RPCMessage
 from packets import Packet, makeField
 from packets.typedef.int_t import int_t
 from packets.typedef.string_t import string_t
@@ -26,6 +28,11 @@ def test_fail(app, msg, **kwargs):
     raise RuntimeError('Exception!!!')
 
 
+@rpc_method()
+def test_big(app, size, **kwargs):
+    return [{'index': i, 'name': f'item {i}'} for i in range(size)]
+
+
 class RPCPacketTestRequest(Packet):
     packet_id: int = makeField(int32_t, '_', default=1, override=True)
     query: str = makeField(string_t, required=True)
@@ -47,6 +54,10 @@ class MySocketConnection(RPCConnectionMixin, SocketConnection):
     pass
 
 
+class CompressedConnection(RPCConnectionMixin, LoopbackConnection):
+    compression = ('zlib',)
+
+
 class RPCTestCase(unittest.IsolatedAsyncioTestCase):
     test_complete: asyncio.Future
 
@@ -104,3 +115,50 @@ class RPCTestCase(unittest.IsolatedAsyncioTestCase):
         with self.assertRaises(RPCException) as cm:
             res = await src_rpc.call('test_fail', 'complete')
         self.assertEqual(cm.exception.type, 'RuntimeError')
+
+    async def test_compression(self):
+        server, client = await CompressedConnection.open_pair()
+        RPC(self, server)
+        client_rpc = RPC(self, client)
+        res = await client_rpc.call('test_big', 1000)
+        self.assertEqual(len(res), 1000)
+        self.assertEqual(res[-1], {'index': 999, 'name': 'item 999'})
+        # the request is sent before the server codecs are known and is short anyway
+        self.assertEqual((server.compression_stats.received, server.compression_stats.decompressed), (1, 0))
+        self.assertEqual(server.peer_encodings, {'zlib'})
+        stats = server.compression_stats
+        self.assertEqual((stats.sent, stats.compressed), (1, 1))
+        self.assertLess(stats.ratio, 0.5)
+        self.assertEqual(client.compression_stats.decompressed, 1)
+        # the short messages are not compressed
+        self.assertEqual(await client_rpc.call('test_big', 1), [{'index': 0, 'name': 'item 0'}])
+        self.assertEqual(server.compression_stats.compressed, 1)
+        await client.close()
+
+    def test_codec_limit(self):
+        codec = ZlibCodec(level=1)
+        data = b'x' * 10000
+        packed = codec.compress(data)
+        self.assertEqual(codec.decompress(packed, 10000), data)
+        with self.assertRaises(ValueError):
+            codec.decompress(packed, 1000)
+        with self.assertRaises(ValueError):
+            codec.decompress(packed[:len(packed) // 2], 10000)
+        with self.assertRaises(ValueError):
+            codec.decompress(packed + b'tail', 10000)
+        with self.assertRaises(ValueError):
+            codec.decompress(b'not compressed', 10000)
+
+    async def test_truncated_message_dropped(self):
+        server, client = await CompressedConnection.open_pair()
+        RPC(self, server)
+        client_rpc = RPC(self, client)
+        packed = ZlibCodec().compress(b'x' * 10000)
+        broken = RPCMessage(msg=b64encode(packed[:len(packed) // 2]).decode('ascii'), msg_type='test_big', content_encoding='zlib')
+        # written past the mixin, as a broken peer would
+        await LoopbackConnection.write(client, broken.dumps())
+        await asyncio.sleep(0.01)
+        self.assertEqual(server.compression_stats.decompressed, 1)
+        # the connection still works
+        self.assertEqual(await client_rpc.call('test_big', 1), [{'index': 0, 'name': 'item 0'}])
+        await client.close()
@@ -0,0 +1,29 @@
+import unittest
+from asyncframework.util.shared_snapshot import SharedSnapshot, active_snapshot
+
+
+class TestSharedSnapshot(unittest.TestCase):
+    def test_attach(self):
+        published = SharedSnapshot.create({
+            'a': (('a.json', 1, 2), {'x': [1, 2, 3], 'y': {'z': 'q'}}),
+            'b': (None, {}),
+        })
+        try:
+            attached = SharedSnapshot.attach(published.name)
+            entry = attached.get('a')
+            assert entry is not None
+            meta, mapping = entry
+            self.assertEqual(meta, ('a.json', 1, 2))
+            self.assertEqual(len(mapping), 2)
+            self.assertIn('x', mapping)
+            self.assertEqual(dict(mapping), {'x': [1, 2, 3], 'y': {'z': 'q'}})
+            # the values are not memoized by the mapping
+            self.assertEqual(mapping['y'], mapping['y'])
+            self.assertIsNot(mapping['y'], mapping['y'])
+            self.assertIsNone(attached.get('c'))
+            attached.activate()
+            self.assertIs(active_snapshot(), attached)
+            attached.close()
+            self.assertIsNone(active_snapshot())
+        finally:
+            published.unlink()
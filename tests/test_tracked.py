@@ -0,0 +1,101 @@
+import unittest
+from typing import Dict, List, Optional
+from packets import Packet, makeField
+from packets.processors import Array, Hash
+from packets.typedef.int_t import int_t
+from packets.typedef.string_t import string_t
+from asyncframework.util.tracked import TrackedMixin, TrackedDict, TrackedList
+
+
+class State():
+    @classmethod
+    def field_names(cls):
+        return ['level', 'stats', 'items', 'guild']
+
+    def __init__(self) -> None:
+        self.level = 1
+        self.stats = {'hp': 10, 'buffs': [1, 2]}
+        self.items = [1, 2, 3]
+        self.guild = None
+
+
+class TrackedState(TrackedMixin, State):
+    pass
+
+
+class TestTracked(unittest.TestCase):
+    def test_fields(self):
+        state = TrackedState()
+        state.track_changes()
+        self.assertIsInstance(state.stats, TrackedDict)
+        self.assertIsInstance(state.stats['buffs'], TrackedList)
+        state.level = 1
+        self.assertEqual(state.changes(), {})
+        state.level = 2
+        state.guild = 'guild'
+        self.assertEqual(state.changes(), {'level': 2, 'guild': 'guild'})
+        self.assertEqual(state.changed_keys(), {'level': '1', 'guild': '1'})
+        state.reset_changes()
+        self.assertEqual(state.changes(), {})
+
+    def test_nested(self):
+        state = TrackedState()
+        state.track_changes()
+        state.stats['hp'] = 5
+        state.stats['buffs'][1] = 3
+        state.items.append(4)
+        self.assertEqual(state.changes(), {'stats': {'hp': 5, 'buffs': [3]}, 'items': [4]})
+        self.assertEqual(state.changed_keys(), {'stats': {'hp': '1', 'buffs': '1'}, 'items': '1'})
+        state.reset_changes()
+        self.assertEqual(state.changed_keys(), {})
+        del state.stats['hp']
+        state.items.insert(0, 0)
+        self.assertEqual(state.changes(), {'stats': {'hp': None}, 'items': [0, 1, 2, 3, 4]})
+
+    def test_replaced(self):
+        state = TrackedState()
+        state.track_changes()
+        state.stats = {'hp': 1}
+        self.assertIsInstance(state.stats, TrackedDict)
+        state.reset_changes()
+        state.stats['mp'] = 2
+        self.assertEqual(state.changes(), {'stats': {'mp': 2}})
+
+
+class Guild(TrackedMixin, Packet):
+    name: str = makeField(string_t, required=True)
+    ranks: Dict[str, int] = makeField(Hash(string_t, int_t), default={})
+
+
+class Player(TrackedMixin, Packet):
+    level: int = makeField(int_t, required=True)
+    stats: Dict[str, int] = makeField(Hash(string_t, int_t), default={})
+    items: List[int] = makeField(Array(int_t), default=[])
+    guild: Optional[Guild] = makeField(Guild)
+
+
+class TestTrackedPacket(unittest.TestCase):
+    def test_packet_fields(self):
+        player = Player.load({'level': 1, 'stats': {'hp': 10}, 'items': [1, 2], 'guild': {'name': 'g', 'ranks': {'a': 1}}})
+        player.track_changes()
+        self.assertIsInstance(player.stats, TrackedDict)
+        self.assertIsInstance(player.items, TrackedList)
+        player.level = 2
+        player.stats['hp'] = 5
+        player.items.append(3)
+        self.assertEqual(player.changes(), {'level': 2, 'stats': {'hp': 5}, 'items': [3]})
+        self.assertEqual(player.changed_keys(), {'level': '1', 'stats': {'hp': '1'}, 'items': '1'})
+
+    def test_packet_nested(self):
+        player = Player.load({'level': 1, 'guild': {'name': 'g', 'ranks': {'a': 1}}})
+        player.track_changes()
+        assert player.guild is not None
+        player.guild.ranks['b'] = 2
+        self.assertEqual(player.changes(), {'guild': {'ranks': {'b': 2}}})
+        player.reset_changes()
+        player.stats = {'mp': 1}
+        self.assertIsInstance(player.stats, TrackedDict)
+        player.reset_changes()
+        player.stats['mp'] = 3
+        player.guild.name = 'h'
+        self.assertEqual(player.changed_keys(), {'stats': {'mp': '1'}, 'guild': {'name': '1'}})
@@ -2,6 +2,7 @@
 import unittest
 import asyncio
 from asyncframework.app import Worker, Manager
+from asyncframework.util import random
 
 
 class TestWorker(Worker):
@@ -46,4 +47,24 @@ class WorkersTestCase(unittest.IsolatedAsyncioTestCase):
         await asyncio.sleep(.5)
         await mgr.stop()
         self.assertEqual(len(mgr._workers_list), 0)
-        
\ No newline at end of file
+        
+
+    async def test_fast_random_passed(self):
+        created = []
+
+        class RecordingManager(TestManager):
+            def __new_worker__(self):
+                worker = super().__new_worker__()
+                created.append(worker)
+                return worker
+
+        random.use_fast_random()
+        try:
+            mgr = RecordingManager(self)
+            await mgr.start()
+            await asyncio.sleep(.5)
+            await mgr.stop()
+        finally:
+            random.use_system_random()
+        self.assertTrue(created)
+        self.assertTrue(all(worker.fast_random for worker in created))